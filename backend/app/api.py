@@ -6,16 +6,42 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, UploadFile
-from fastapi.responses import ORJSONResponse
+import orjson
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 from app.db import get_session
-from app.models import AuditEvent, InputType, Report, ReportStatus
-from app.schemas import AuditResponse, ReportResponse, UploadResponse
+from app.limits import text_body_limit, too_large, upload_limit
+from app.models import AuditEvent, InputType, Report, ReportBatch, ReportDocument, ReportStatus
+from app.schemas import (
+    AuditResponse,
+    BatchAuditResponse,
+    BatchReportStatus,
+    BatchStatusResponse,
+    BatchUploadResponse,
+    ReportResponse,
+    UploadResponse,
+)
 from app.services.audit import audit
-from app.services.pipeline import run_pipeline
-from app.services.queue import enqueue_report
+from app.services.cache import cache_stats
+from app.services.content_store import (
+    duplicate_report,
+    file_content_hash,
+    find_fresh_report,
+    find_fresh_reports,
+    link_duplicate,
+    store_upload,
+    text_content_hash,
+)
+from app.services.events import format_sse, stream_events
+from app.services.http_client import pool_stats
+from app.services.local_executor import executor_stats, get_executor, runs_locally, submit_batch, submit_report
+from app.services.queue import enqueue_batch, enqueue_report
+from app.services.rate_limit import inbound_stats, rate_limit_stats
+from app.services.reports import materialize_reports
 
 
 router = APIRouter(default_response_class=ORJSONResponse)
@@ -26,10 +52,109 @@ def health() -> dict:
     return {"ok": True, "service": "truecheck-api", "time": datetime.utcnow().isoformat()}
 
 
-@router.post("/upload/text", response_model=UploadResponse)
-async def upload_text(payload_text: str = Form(...), background: BackgroundTasks = None):
-    if background is None:
-        background = BackgroundTasks()
+@router.get("/metrics/http")
+def http_metrics() -> dict:
+    return {"pools": pool_stats()}
+
+
+@router.get("/metrics/cache")
+def cache_metrics() -> dict:
+    return {"search_cache": cache_stats()}
+
+
+@router.get("/metrics/ratelimit")
+def ratelimit_metrics() -> dict:
+    return {"providers": rate_limit_stats(), "inbound": inbound_stats()}
+
+
+@router.get("/metrics/executor")
+def executor_metrics() -> dict:
+    return {"local_executor": executor_stats()}
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="server busy, retry later",
+        headers={"Retry-After": str(get_executor().retry_after())},
+    )
+
+
+def _check_capacity() -> None:
+    # Shed before storing anything when new work would land on a full local executor.
+    if runs_locally() and not get_executor().admit():
+        raise _busy()
+
+
+def _discard_reports(report_ids: list[str], batch_id: str | None = None) -> None:
+    with get_session() as session:
+        session.query(ReportDocument).filter(ReportDocument.report_id.in_(report_ids)).delete(synchronize_session=False)
+        session.query(Report).filter(Report.id.in_(report_ids)).delete(synchronize_session=False)
+        if batch_id:
+            session.query(ReportBatch).filter(ReportBatch.id == batch_id).delete(synchronize_session=False)
+        session.commit()
+
+
+def _dispatch_report(report_id: str) -> None:
+    if settings.truecheck_use_queue and enqueue_report(report_id):
+        return
+    if not submit_report(report_id):
+        # Lost the race for the last slot: drop the row so the client's retry starts clean.
+        _discard_reports([report_id])
+        raise _busy()
+
+
+# Upload handlers are plain `def` (run in the threadpool) or hand their DB/Redis work to it:
+# sessions, enqueues and materializing are blocking and must not stall the event loop.
+
+
+async def _payload_text(request: Request) -> str:
+    """The `payload_text` form field, held to `truecheck_upload_max_bytes_text` (413).
+
+    Parsed here rather than with `Form(...)`, whose parser stops at Starlette's 1 MB field
+    cap with a 400 before the configured limit applies.
+    """
+    form = await request.form(max_part_size=text_body_limit())
+    text = form.get("payload_text")
+    if not isinstance(text, str):
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body", "payload_text"), "msg": "Field required", "input": None}]
+        )
+    limit = upload_limit("text")
+    if len(text.encode("utf-8")) > limit:
+        raise too_large(limit)
+    return text
+
+
+_TEXT_FORM_SCHEMA = {
+    "type": "object",
+    "required": ["payload_text"],
+    "properties": {"payload_text": {"type": "string"}},
+}
+
+
+@router.post(
+    "/upload/text",
+    response_model=UploadResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-www-form-urlencoded": {"schema": _TEXT_FORM_SCHEMA},
+                "multipart/form-data": {"schema": _TEXT_FORM_SCHEMA},
+            },
+        }
+    },
+)
+def upload_text(payload_text: str = Depends(_payload_text)):
+    _check_capacity()
+
+    content_hash = text_content_hash(payload_text)
+    source_id = find_fresh_report(content_hash)
+    if source_id:
+        report_id = link_duplicate(source_id, input_type=InputType.text, content_hash=content_hash, input_text=payload_text)
+        if report_id:
+            return UploadResponse(report_id=report_id, status=ReportStatus.complete.value)
 
     report_id = str(uuid.uuid4())
 
@@ -39,18 +164,13 @@ async def upload_text(payload_text: str = Form(...), background: BackgroundTasks
             input_type=InputType.text,
             input_text=payload_text,
             status=ReportStatus.queued,
+            content_hash=content_hash,
         )
         session.add(report)
         session.commit()
 
     audit(report_id, "upload", {"input_type": "text"})
-
-    if settings.truecheck_use_queue:
-        enqueued = enqueue_report(report_id)
-        if not enqueued:
-            background.add_task(run_pipeline, report_id)
-    else:
-        background.add_task(run_pipeline, report_id)
+    _dispatch_report(report_id)
 
     return UploadResponse(report_id=report_id, status="queued")
 
@@ -59,23 +179,32 @@ async def upload_text(payload_text: str = Form(...), background: BackgroundTasks
 async def upload_file(
     input_type: str = Form(...),
     file: UploadFile = File(...),
-    background: BackgroundTasks = None,
 ):
-    if background is None:
-        background = BackgroundTasks()
-
     if input_type not in ("image", "audio", "text"):
         raise HTTPException(status_code=400, detail="input_type must be text|image|audio")
-
-    report_id = str(uuid.uuid4())
-    storage_dir = Path(settings.truecheck_storage_dir) / report_id
-    storage_dir.mkdir(parents=True, exist_ok=True)
+    await run_in_threadpool(_check_capacity)
 
     filename = file.filename or "upload"
-    dest = storage_dir / filename
+    digest, dest = await store_upload(file, upload_limit(input_type))
+    return await run_in_threadpool(_register_file_upload, input_type, filename, digest, dest)
+
+
+def _register_file_upload(input_type: str, filename: str, digest: str, dest: Path) -> UploadResponse:
+    content_hash = file_content_hash(input_type, digest)
 
-    with dest.open("wb") as f:
-        f.write(await file.read())
+    source_id = find_fresh_report(content_hash)
+    if source_id:
+        report_id = link_duplicate(
+            source_id,
+            input_type=InputType(input_type),
+            content_hash=content_hash,
+            original_filename=filename,
+            storage_path=str(dest),
+        )
+        if report_id:
+            return UploadResponse(report_id=report_id, status=ReportStatus.complete.value)
+
+    report_id = str(uuid.uuid4())
 
     with get_session() as session:
         report = Report(
@@ -84,27 +213,241 @@ async def upload_file(
             original_filename=filename,
             storage_path=str(dest),
             status=ReportStatus.queued,
+            content_hash=content_hash,
         )
         session.add(report)
         session.commit()
 
-    audit(report_id, "upload", {"input_type": input_type, "filename": filename})
-
-    if settings.truecheck_use_queue:
-        enqueued = enqueue_report(report_id)
-        if not enqueued:
-            background.add_task(run_pipeline, report_id)
-    else:
-        background.add_task(run_pipeline, report_id)
+    audit(report_id, "upload", {"input_type": input_type, "filename": filename, "sha256": digest})
+    _dispatch_report(report_id)
 
     return UploadResponse(report_id=report_id, status="queued")
 
 
+def _parse_batch_items(body: bytes, content_type: str) -> list[str]:
+    """Texts from a JSON array / `{"items": [...]}` or NDJSON body; items are strings or `{"text": ...}`."""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            raw = [orjson.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            raw = orjson.loads(body)
+            if isinstance(raw, dict):
+                raw = raw.get("items")
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"invalid JSON: {e}")
+    if not isinstance(raw, list):
+        raise HTTPException(status_code=400, detail="expected a JSON array of items")
+
+    limit = upload_limit("text")
+    texts: list[str] = []
+    for i, item in enumerate(raw):
+        text = item.get("text") or item.get("payload_text") if isinstance(item, dict) else item
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPException(status_code=400, detail=f"item {i}: expected a string or an object with 'text'")
+        if len(text.encode("utf-8")) > limit:
+            raise HTTPException(status_code=413, detail=f"item {i}: text exceeds {limit} bytes")
+        texts.append(text)
+    return texts
+
+
+def _batch_status(counts: dict[str, int], total: int) -> str:
+    pending = counts.get(ReportStatus.queued.value, 0) + counts.get(ReportStatus.running.value, 0)
+    if pending:
+        return ReportStatus.queued.value if counts.get(ReportStatus.queued.value, 0) == total else ReportStatus.running.value
+    failed = counts.get(ReportStatus.failed.value, 0)
+    if not failed:
+        return ReportStatus.complete.value
+    return ReportStatus.failed.value if failed == total else "partial"
+
+
+async def _request_body(request: Request) -> bytes:
+    return await request.body()
+
+
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+def upload_batch(request: Request, body: bytes = Depends(_request_body)):
+    """Submit many texts at once (JSON array or NDJSON); all reports are created in one transaction."""
+    _check_capacity()
+
+    texts = _parse_batch_items(body, request.headers.get("content-type", ""))
+    if not texts:
+        raise HTTPException(status_code=400, detail="batch is empty")
+    max_items = int(settings.truecheck_batch_max_items)
+    if len(texts) > max_items:
+        raise HTTPException(status_code=413, detail=f"batch exceeds {max_items} items")
+
+    batch_id = str(uuid.uuid4())
+    hashes = [text_content_hash(t) for t in texts]
+    fresh = find_fresh_reports(hashes)
+
+    report_ids: list[str] = []
+    queued: list[str] = []
+    duplicates: list[tuple[str, str, str]] = []
+    with get_session() as session:
+        sources = {}
+        if fresh:
+            sources = {
+                r.id: r
+                for r in session.query(Report).filter(
+                    Report.id.in_(set(fresh.values())), Report.status == ReportStatus.complete
+                )
+            }
+        session.add(ReportBatch(id=batch_id, size=len(texts)))
+        for text, content_hash in zip(texts, hashes):
+            report_id = str(uuid.uuid4())
+            report_ids.append(report_id)
+            source = sources.get(fresh.get(content_hash))
+            if source:
+                session.add(
+                    duplicate_report(
+                        source,
+                        report_id,
+                        input_type=InputType.text,
+                        content_hash=content_hash,
+                        input_text=text,
+                        batch_id=batch_id,
+                    )
+                )
+                duplicates.append((report_id, source.id, content_hash))
+            else:
+                session.add(
+                    Report(
+                        id=report_id,
+                        input_type=InputType.text,
+                        input_text=text,
+                        status=ReportStatus.queued,
+                        content_hash=content_hash,
+                        batch_id=batch_id,
+                    )
+                )
+                queued.append(report_id)
+        session.commit()
+
+    for report_id in queued:
+        audit(report_id, "upload", {"input_type": "text", "batch_id": batch_id})
+    for report_id, source_id, content_hash in duplicates:
+        audit(report_id, "duplicate_of", {"report_id": source_id, "content_hash": content_hash})
+    materialize_reports([report_id for report_id, _, _ in duplicates])
+
+    if queued:
+        if not (settings.truecheck_use_queue and enqueue_batch(batch_id, queued)):
+            if not submit_batch(batch_id, queued):
+                _discard_reports(report_ids, batch_id)
+                raise _busy()
+
+    counts = {ReportStatus.queued.value: len(queued), ReportStatus.complete.value: len(duplicates)}
+    return BatchUploadResponse(
+        batch_id=batch_id,
+        status=_batch_status(counts, len(texts)),
+        total=len(texts),
+        duplicates=len(duplicates),
+        report_ids=report_ids,
+    )
+
+
+@router.get("/batches/{batch_id}", response_model=BatchStatusResponse)
+def get_batch(batch_id: str):
+    with get_session() as session:
+        batch = session.get(ReportBatch, batch_id)
+        if not batch:
+            raise HTTPException(status_code=404, detail="batch not found")
+        rows = (
+            session.query(Report.id, Report.status, Report.verdict, Report.confidence)
+            .filter(Report.batch_id == batch_id)
+            .order_by(Report.created_at)
+            .all()
+        )
+
+    counts: dict[str, int] = {}
+    for _, status, _, _ in rows:
+        counts[status.value] = counts.get(status.value, 0) + 1
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        created_at=batch.created_at,
+        status=_batch_status(counts, len(rows)),
+        total=len(rows),
+        counts=counts,
+        reports=[
+            BatchReportStatus(
+                report_id=report_id,
+                status=status.value,
+                verdict=(verdict.value if verdict else None),
+                confidence=confidence,
+            )
+            for report_id, status, verdict, confidence in rows
+        ],
+    )
+
+
+@router.get("/batches/{batch_id}/audit", response_model=BatchAuditResponse)
+def get_batch_audit(batch_id: str):
+    from app.services.reports import build_batch_audit_response
+
+    with get_session() as session:
+        if not session.get(ReportBatch, batch_id):
+            raise HTTPException(status_code=404, detail="batch not found")
+    return build_batch_audit_response(batch_id)
+
+
 @router.get("/reports/{report_id}", response_model=ReportResponse)
-def get_report(report_id: str):
-    from app.services.reports import build_report_response
+def get_report(report_id: str, request: Request):
+    from app.services.reports import build_report_response, etag_matches, load_report_document
+
+    doc = load_report_document(report_id)
+    if doc is None:
+        # Still queued/running (or missing -> 404): build it live.
+        return build_report_response(report_id)
+
+    body, etag = doc
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _report_status(report_id: str) -> ReportStatus | None:
+    with get_session() as session:
+        report = session.get(Report, report_id)
+        return report.status if report else None
+
+
+@router.get("/reports/{report_id}/events")
+async def report_events(report_id: str, request: Request):
+    """Server-Sent Events stream of pipeline progress, ending with `complete` or `failed`."""
+    status = await run_in_threadpool(_report_status, report_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="report not found")
+
+    try:
+        last_seq = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        last_seq = 0
+
+    async def _gen():
+        if status in (ReportStatus.complete, ReportStatus.failed):
+            yield format_sse({"seq": None, "type": status.value, "data": {"status": status.value}})
+            return
+
+        async for event in stream_events(report_id, last_seq):
+            if await request.is_disconnected():
+                return
+            if event is not None:
+                yield format_sse(event)
+                continue
+
+            # Idle tick: keep proxies from closing the connection, and make sure a
+            # terminal event lost to history expiry can't leave the client hanging.
+            yield ": keepalive\n\n"
+            current = await run_in_threadpool(_report_status, report_id)
+            if current in (ReportStatus.complete, ReportStatus.failed):
+                yield format_sse({"seq": None, "type": current.value, "data": {"status": current.value}})
+                return
 
-    return build_report_response(report_id)
+    return StreamingResponse(
+        _gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/reports/{report_id}/audit", response_model=AuditResponse)
@@ -26,16 +26,130 @@ class Settings(BaseSettings):
     truecheck_use_queue: int = 1
     truecheck_redis_url: str = "redis://localhost:6379/0"
     truecheck_queue_name: str = "truecheck"
+    # In-process fallback when the queue is off/unreachable: worker threads, pending jobs before 503,
+    # Retry-After before any job timing is known, and re-running jobs whose owning process died.
+    truecheck_local_workers: int = 2
+    truecheck_local_max_pending: int = 32
+    truecheck_local_retry_after_seconds: int = 10
+    truecheck_local_recover: int = 1
+    # A local job's lease is taken over once its owner has not heartbeated for this long.
+    truecheck_local_lease_seconds: int = 60
 
     google_cse_api_key: str | None = None
     google_cse_engine_id: str | None = None
 
     gemini_api_key: str | None = None
     gemini_model: str = "gemini-2.0-flash"
-
+    # Rate up to `batch_size` claims per generateContent request (falls back per-claim on bad output).
+    truecheck_gemini_batch: int = 1
+    truecheck_gemini_batch_size: int = 6
+    # Memoize verdicts by claim + evidence + model + prompt version (shares the search cache tiers).
+    truecheck_reasoning_cache: int = 1
+    truecheck_reasoning_cache_ttl_seconds: int = 60 * 60 * 24
+
+    # Inbound: uploads per minute per client (known API key, else IP), shared by API replicas via Redis; 0 = off.
     truecheck_rl_requests_per_minute: int = 60
+    truecheck_rl_client_burst: int = 10
+    # Comma-separated API keys that get their own bucket; any other X-API-Key is ignored.
+    truecheck_rl_api_keys: str = ""
+    # Number of trusted proxies in front of the API. The client IP is the X-Forwarded-For entry that
+    # many hops from the right (the one the outermost proxy appended); 0 = use the peer address.
+    truecheck_rl_trust_forwarded: int = 0
+    # Uploads get 503 while the RQ queue holds at least this many jobs (0 = off).
+    truecheck_shed_queue_depth: int = 1000
+    truecheck_shed_retry_after_seconds: int = 30
+
+    # Outbound request budgets shared by all workers via Redis (per process without it); 0 = unlimited.
+    # Calls queue for a token, backing off and queueing again while the wait would exceed max_wait;
+    # they fail only after queue_timeout seconds in total or when the day's quota is spent.
+    truecheck_rl_google_per_minute: int = 100
+    truecheck_rl_google_per_day: int = 0
+    truecheck_rl_gemini_per_minute: int = 15
+    truecheck_rl_gemini_per_day: int = 0
+    truecheck_rl_gdelt_per_minute: int = 60
+    truecheck_rl_burst: int = 5
+    truecheck_rl_max_wait_seconds: float = 30.0
+    truecheck_rl_queue_timeout_seconds: float = 120.0
+    truecheck_rl_retries_on_429: int = 2
+
+    # Uploads stream to disk in chunk_bytes pieces; bodies over the per-type limit get 413.
+    truecheck_upload_chunk_bytes: int = 1024 * 1024
+    truecheck_upload_max_bytes_image: int = 20 * 1024 * 1024
+    truecheck_upload_max_bytes_audio: int = 250 * 1024 * 1024
+    truecheck_upload_max_bytes_text: int = 2 * 1024 * 1024
+
+    # POST /upload/batch: max items and body bytes per request (each item is also held to the text
+    # upload limit); batch mode pools claims across up to chunk_size reports per job.
+    truecheck_batch_max_items: int = 5000
+    truecheck_batch_max_bytes: int = 32 * 1024 * 1024
+    truecheck_batch_pipeline: int = 1
+    truecheck_batch_chunk_size: int = 50
+
+    # Extra domain lists for evidence credibility (comma-separated paths, one domain per line), merged with
+    # the built-in lists and re-read when a file changes (checked every reload_seconds; 0 = load once).
+    truecheck_credibility_trusted_files: str = ""
+    truecheck_credibility_low_files: str = ""
+    truecheck_credibility_reload_seconds: float = 30.0
+
+    # Resubmitted content (same bytes / normalized text) reuses a report completed within this window (0 = off).
+    truecheck_dedupe_window_seconds: int = 60 * 60 * 24
+
+    # Worker: 1 = jobs run inside the long-lived worker process (models stay loaded),
+    # 0 = RQ forks a child per job (children inherit preloaded models copy-on-write).
+    truecheck_worker_warm: int = 1
+    truecheck_worker_preload: int = 1
+    # >1 runs that many jobs at once in one warm process (one RQ worker per thread).
+    truecheck_worker_concurrency: int = 1
+    truecheck_worker_idle_poll_seconds: int = 5
+
+    # Local transcription (faster-whisper).
+    truecheck_whisper_model: str = "base"
+    truecheck_whisper_device: str = "cpu"
+    truecheck_whisper_compute_type: str = "int8"
+    # Long audio is cut at silences into ~chunk_seconds pieces transcribed by this many processes (<=1: in-process).
+    truecheck_transcribe_workers: int = 2
+    truecheck_transcribe_chunk_seconds: float = 60.0
+
+    # OCR runs on a process pool (0 = inline) with per-image timeout; preprocessing = grayscale,
+    # resize (long side capped at max_side), binarize and crop to the text region.
+    truecheck_ocr_workers: int = 2
+    truecheck_ocr_timeout_seconds: float = 30.0
+    truecheck_ocr_preprocess: int = 1
+    truecheck_ocr_max_side: int = 2000
+
+    # Idle interval for SSE keepalive comments on GET /reports/{id}/events.
+    truecheck_sse_keepalive_seconds: float = 15.0
+
+    # Audit events are buffered and bulk-inserted; set to 0 for one commit per event.
+    truecheck_audit_buffered: int = 1
+    truecheck_audit_flush_size: int = 100
+    truecheck_audit_flush_interval_seconds: float = 2.0
 
     truecheck_search_cache_ttl_seconds: int = 60 * 60 * 12
+    # In-process LRU tier in front of the SearchCache table.
+    truecheck_cache_memory_max_entries: int = 2048
+    truecheck_cache_memory_ttl_seconds: int = 60 * 10
+    # Background sweeper: drops expired rows, then trims the table to max_rows (0 = unbounded).
+    truecheck_cache_sweep_interval_seconds: int = 60 * 5
+    truecheck_search_cache_max_rows: int = 100000
+    # Shared Redis tier + single-flight: one worker fetches a missing key, others wait for its result.
+    truecheck_cache_redis: int = 1
+    truecheck_single_flight_lock_seconds: float = 30.0
+    truecheck_single_flight_wait_seconds: float = 15.0
+    # Reuse cached evidence for close paraphrases (MinHash/LSH over claim word bigrams).
+    truecheck_cache_near_dup: int = 0
+    truecheck_cache_near_dup_threshold: float = 0.8
+
+    # Max concurrent outbound calls (search providers / Gemini) per report.
+    truecheck_retrieval_concurrency: int = 8
+
+    # Shared outbound HTTP clients (one keep-alive pool per provider host).
+    truecheck_http_timeout_seconds: float = 20.0
+    truecheck_gemini_timeout_seconds: float = 30.0
+    truecheck_http_max_connections: int = 20
+    truecheck_http_max_keepalive_connections: int = 10
+    truecheck_http_keepalive_expiry_seconds: float = 30.0
+    truecheck_http2: int = 0  # requires the optional `h2` package
 
     truecheck_max_image_matches_per_claim: int = 4
     truecheck_max_image_matches_total: int = 24
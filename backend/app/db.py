@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import text
+import logging
+
+from sqlalchemy import inspect, text
 from sqlmodel import SQLModel, Session, create_engine
 
 from app.config import settings
@@ -8,6 +10,8 @@ from app.config import settings
 
 engine = create_engine(settings.truecheck_db_url, echo=False)
 
+log = logging.getLogger("truecheck.db")
+
 
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
@@ -23,9 +27,49 @@ def init_db() -> None:
                     conn.execute(text("ALTER TABLE claim ADD COLUMN rationale TEXT"))
                 if "reasoning_json" not in existing:
                     conn.execute(text("ALTER TABLE claim ADD COLUMN reasoning_json TEXT"))
+
+                report_cols = {r[1] for r in conn.execute(text("PRAGMA table_info(report)"))}
+                if "content_hash" not in report_cols:
+                    conn.execute(text("ALTER TABLE report ADD COLUMN content_hash VARCHAR"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_report_content_hash ON report (content_hash)"))
+                if "duplicate_of" not in report_cols:
+                    conn.execute(text("ALTER TABLE report ADD COLUMN duplicate_of VARCHAR"))
+                if "batch_id" not in report_cols:
+                    conn.execute(text("ALTER TABLE report ADD COLUMN batch_id VARCHAR"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_report_batch_id ON report (batch_id)"))
             except Exception:
                 # If PRAGMA fails for any reason, don't block startup.
-                return
+                pass
+
+    ensure_searchcache_unique_key()
+
+
+def searchcache_has_unique_key() -> bool:
+    insp = inspect(engine)
+    if not insp.has_table("searchcache"):
+        return False
+    names = {ix["name"] for ix in insp.get_indexes("searchcache") if ix.get("unique")}
+    names |= {uc["name"] for uc in insp.get_unique_constraints("searchcache")}
+    return "uq_searchcache_kind_query" in names
+
+
+def ensure_searchcache_unique_key() -> None:
+    """Add the (kind, query) key `cache_put` upserts on to tables created before it existed (any backend)."""
+    try:
+        if not inspect(engine).has_table("searchcache") or searchcache_has_unique_key():
+            return
+        with engine.begin() as conn:
+            # Older DBs appended a row per cache_put; keep the newest per key, then enforce uniqueness.
+            conn.execute(
+                text(
+                    "DELETE FROM searchcache WHERE id NOT IN "
+                    "(SELECT MAX(id) FROM searchcache GROUP BY kind, query)"
+                )
+            )
+            conn.execute(text("CREATE UNIQUE INDEX uq_searchcache_kind_query ON searchcache (kind, query)"))
+    except Exception as e:
+        # cache_put falls back to update-then-insert without the key; don't block startup.
+        log.warning("could not add uq_searchcache_kind_query: %s", e)
 
 
 def get_session() -> Session:
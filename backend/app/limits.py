@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+# Upload size limits, shared by the size middleware, the upload handlers and the blob store.
+
+# Multipart boundaries and the small form fields that travel with the file.
+_MULTIPART_SLACK_BYTES = 64 * 1024
+
+
+def upload_limit(input_type: str) -> int:
+    return int(
+        {
+            "image": settings.truecheck_upload_max_bytes_image,
+            "audio": settings.truecheck_upload_max_bytes_audio,
+        }.get(input_type, settings.truecheck_upload_max_bytes_text)
+    )
+
+
+def too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"upload exceeds {limit} bytes")
+
+
+def file_body_limit() -> int:
+    """Body cap for /upload/file: the biggest per-type limit plus multipart overhead."""
+    return max(upload_limit(t) for t in ("image", "audio", "text")) + _MULTIPART_SLACK_BYTES
+
+
+def text_body_limit() -> int:
+    """Body cap for /upload/text: urlencoded forms spend up to 3 bytes per byte of text."""
+    return 3 * upload_limit("text") + _MULTIPART_SLACK_BYTES
+
+
+def batch_body_limit() -> int:
+    return int(settings.truecheck_batch_max_bytes)
@@ -6,6 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api import router as api_router
 from app.config import settings
 from app.db import init_db
+from app.services.local_executor import start_recovery
+from app.limits import batch_body_limit, file_body_limit, text_body_limit
+from app.middleware import AdmissionMiddleware, UploadSizeLimitMiddleware
 
 
 def create_app() -> FastAPI:
@@ -17,12 +20,27 @@ def create_app() -> FastAPI:
         for o in ("http://localhost:5173", "http://127.0.0.1:5173", "null"):
             if o not in origins:
                 origins.append(o)
+    # Middleware added later runs first: admission answers rejected clients before any body is
+    # read, and CORS wraps everything so browsers can read 413/429/503 responses.
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        limits={
+            "/api/v1/upload/text": text_body_limit,
+            "/api/v1/upload/file": file_body_limit,
+            "/api/v1/upload/batch": batch_body_limit,
+        },
+    )
+    app.add_middleware(
+        AdmissionMiddleware,
+        paths=("/api/v1/upload/text", "/api/v1/upload/file", "/api/v1/upload/batch"),
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=origins or ["*"],
         allow_credentials=True,
         allow_methods=["*"],
-        allow_headers=["*"]
+        allow_headers=["*"],
+        expose_headers=["Retry-After", "ETag"],
     )
 
     app.include_router(api_router, prefix="/api/v1")
@@ -30,6 +48,7 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     def _startup() -> None:
         init_db()
+        start_recovery()
 
     return app
 
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.limits import too_large
+from app.services.queue import queue_depth
+from app.services.rate_limit import record_inbound, try_acquire
+
+
+class UploadSizeLimitMiddleware:
+    """Reject upload bodies over the limit for their path before they are parsed.
+
+    `limits` maps each guarded path to a function returning its byte limit (read per request,
+    so settings changes apply). A declared Content-Length over the limit is refused without
+    reading the body; otherwise the body is counted as it streams in (covers chunked
+    requests). Handlers still enforce the exact per-type / per-item limits.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[str, Callable[[], int]]) -> None:
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit_for = self.limits.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit_for is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = limit_for()
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await _send_json(send, 413, f"upload exceeds {limit} bytes")
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+_known_keys: tuple[str, frozenset[str]] = ("", frozenset())
+
+
+def _known_key_digests() -> frozenset[str]:
+    global _known_keys
+    raw = settings.truecheck_rl_api_keys or ""
+    if raw != _known_keys[0]:
+        digests = frozenset(hashlib.sha256(k.strip().encode()).hexdigest() for k in raw.split(",") if k.strip())
+        _known_keys = (raw, digests)
+    return _known_keys[1]
+
+
+def client_ip(scope: Scope, headers: dict[bytes, bytes]) -> str:
+    """Peer address, or the X-Forwarded-For entry appended by the outermost trusted proxy.
+
+    Entries left of that one come from the client and are never trusted.
+    """
+    hops = int(settings.truecheck_rl_trust_forwarded)
+    forwarded = headers.get(b"x-forwarded-for")
+    if hops > 0 and forwarded:
+        entries = [e.strip() for e in forwarded.decode("latin-1").split(",")]
+        if len(entries) >= hops and entries[-hops]:
+            return entries[-hops]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def client_id(scope: Scope) -> str:
+    """Rate-limit identity: a configured API key, else the client IP.
+
+    Unknown keys are ignored so a client can't mint a fresh bucket per request.
+    """
+    headers = dict(scope["headers"])
+    api_key = headers.get(b"x-api-key")
+    if api_key:
+        digest = hashlib.sha256(api_key.strip()).hexdigest()
+        if digest in _known_key_digests():
+            return "key:" + digest[:16]
+    return "ip:" + client_ip(scope, headers)
+
+
+def admit(scope: Scope) -> tuple[int, int, str] | None:
+    """None to accept the upload, else (status, retry_after_seconds, detail)."""
+    max_depth = int(settings.truecheck_shed_queue_depth)
+    if max_depth > 0 and settings.truecheck_use_queue:
+        # Checked before the client's bucket so shed requests don't spend tokens.
+        depth = queue_depth()
+        if depth is not None and depth >= max_depth:
+            record_inbound("shed")
+            return 503, max(1, int(settings.truecheck_shed_retry_after_seconds)), "server busy, retry later"
+
+    wait = try_acquire(
+        f"client:{client_id(scope)}",
+        int(settings.truecheck_rl_requests_per_minute),
+        int(settings.truecheck_rl_client_burst),
+    )
+    if wait > 0:
+        record_inbound("limited")
+        return 429, max(1, math.ceil(wait)), "rate limit exceeded"
+    record_inbound("admitted")
+    return None
+
+
+class AdmissionMiddleware:
+    """Per-client rate limiting and queue-depth load shedding for upload endpoints.
+
+    Runs before the body is read, so a rejected client never gets to stream a file.
+    """
+
+    def __init__(self, app: ASGIApp, paths: tuple[str, ...]) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Redis round trips are blocking; keep them off the event loop.
+        rejected = await run_in_threadpool(admit, scope)
+        if rejected is not None:
+            status, retry_after, detail = rejected
+            await _send_json(send, status, detail, [(b"retry-after", str(retry_after).encode())])
+            return
+        await self.app(scope, receive, send)
+
+
+async def _send_json(send: Send, status: int, detail: str, headers: list[tuple[bytes, bytes]] | None = None) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *(headers or []),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
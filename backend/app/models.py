@@ -4,6 +4,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import SQLModel, Field
 
 
@@ -55,6 +56,19 @@ class Report(SQLModel, table=True):
 
     ai_likelihood: Optional[int] = None
 
+    # SHA-256 of the uploaded bytes / normalized text; `duplicate_of` links a short-circuited
+    # resubmission to the report whose claims/evidence it serves.
+    content_hash: Optional[str] = Field(default=None, index=True)
+    duplicate_of: Optional[str] = None
+
+    batch_id: Optional[str] = Field(default=None, index=True)
+
+
+class ReportBatch(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    size: int
+
 
 class Claim(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -108,6 +122,9 @@ class AuditEvent(SQLModel, table=True):
 
 
 class SearchCache(SQLModel, table=True):
+    # One row per (kind, query); cache_put upserts on this key.
+    __table_args__ = (UniqueConstraint("kind", "query", name="uq_searchcache_kind_query"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     expires_at: datetime = Field(index=True)
@@ -115,3 +132,28 @@ class SearchCache(SQLModel, table=True):
     kind: str = Field(index=True)  # web|image|gdelt
     query: str = Field(index=True)
     response_json: str
+
+
+class ReportDocument(SQLModel, table=True):
+    # Pre-serialized GET /reports/{id} body, written once a report is complete/failed.
+    report_id: str = Field(primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    etag: str
+    body: bytes
+
+
+class LocalJobLease(SQLModel, table=True):
+    # A report (or batch) running on some API process's in-process executor. The owner refreshes
+    # `heartbeat_at` while it is alive; a stale lease is claimed and re-run by another process.
+    job_id: str = Field(primary_key=True)
+    is_batch: bool = False
+    owner: str = Field(index=True)
+    heartbeat_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class ContentIndex(SQLModel, table=True):
+    # Latest report that actually ran the pipeline to completion for this content.
+    content_hash: str = Field(primary_key=True)
+    report_id: str
+    completed_at: datetime = Field(default_factory=datetime.utcnow)
@@ -16,6 +16,30 @@ class UploadResponse(BaseModel):
     status: str
 
 
+class BatchUploadResponse(BaseModel):
+    batch_id: str
+    status: str
+    total: int
+    duplicates: int = 0
+    report_ids: list[str] = Field(default_factory=list)
+
+
+class BatchReportStatus(BaseModel):
+    report_id: str
+    status: str
+    verdict: Optional[str] = None
+    confidence: Optional[int] = None
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    created_at: datetime
+    status: str  # queued/running/complete/failed/partial
+    total: int
+    counts: dict[str, int] = Field(default_factory=dict)
+    reports: list[BatchReportStatus] = Field(default_factory=list)
+
+
 class Citation(BaseModel):
     url: str
     publisher: Optional[str] = None
@@ -79,3 +103,8 @@ class ReportResponse(BaseModel):
 class AuditResponse(BaseModel):
     report_id: str
     events: list[dict[str, Any]]
+
+
+class BatchAuditResponse(BaseModel):
+    batch_id: str
+    events: list[dict[str, Any]]
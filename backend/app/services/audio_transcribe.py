@@ -1,23 +1,177 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Iterator
 
+from app.config import settings
 from app.services.audit import audit
 
 
+# Loaded once per process; the warm worker preloads it so jobs only pay transcription time.
+_model: Any = None
+_model_load_ms: float | None = None
+_model_lock = threading.Lock()
+
+
+def load_whisper_model(cpu_threads: int = 0) -> tuple[Any, float]:
+    """Return `(model, load_ms)`; `load_ms` is 0 when the model was already loaded.
+
+    Raises ImportError if `faster-whisper` isn't installed.
+    """
+    global _model, _model_load_ms
+    if _model is not None:
+        return _model, 0.0
+    with _model_lock:
+        if _model is not None:
+            return _model, 0.0
+        from faster_whisper import WhisperModel
+
+        started = time.perf_counter()
+        _model = WhisperModel(
+            settings.truecheck_whisper_model,
+            device=settings.truecheck_whisper_device,
+            compute_type=settings.truecheck_whisper_compute_type,
+            cpu_threads=cpu_threads,
+        )
+        _model_load_ms = (time.perf_counter() - started) * 1000
+        return _model, _model_load_ms
+
+
+def whisper_model_info() -> dict:
+    return {
+        "model": settings.truecheck_whisper_model,
+        "device": settings.truecheck_whisper_device,
+        "compute_type": settings.truecheck_whisper_compute_type,
+        "loaded": _model is not None,
+        "load_ms": (round(_model_load_ms, 1) if _model_load_ms is not None else None),
+    }
+
+
+_SAMPLE_RATE = 16000
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _init_chunk_worker(cpu_threads: int) -> None:
+    load_whisper_model(cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(audio: Any) -> str:
+    model, _ = load_whisper_model()
+    segments, _ = model.transcribe(audio, beam_size=1)
+    return " ".join(seg.text.strip() for seg in segments if seg.text)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    # Spawned (not forked) so each child loads its own CTranslate2 model; split the cores between them.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(cpu_threads,),
+            )
+        return _pool
+
+
+def _speech_chunks(audio: Any) -> list[tuple[int, int]]:
+    """Group VAD speech spans into ~`truecheck_transcribe_chunk_seconds` chunks cut at silences."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    target = max(1.0, float(settings.truecheck_transcribe_chunk_seconds)) * _SAMPLE_RATE
+    chunks: list[tuple[int, int]] = []
+    start = end = None
+    for span in get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500)):
+        if start is None:
+            start = span["start"]
+        elif span["end"] - start > target:
+            chunks.append((start, end))
+            start = span["start"]
+        end = span["end"]
+    if start is not None:
+        chunks.append((start, end))
+    return chunks
+
+
+def transcribe_audio_stream(report_id: str, path: str) -> Iterator[str]:
+    """Yield transcript text in order as it becomes available.
+
+    Long audio is split on silences and the chunks are transcribed across a process pool
+    (`truecheck_transcribe_workers`); otherwise segments stream from the in-process model.
+    On failure the text yielded so far stands and `transcribe_failed` is audited.
+    """
+    started = time.perf_counter()
+    chars = 0
+    n_chunks = 1
+    load_ms = 0.0
+    language = None
+    try:
+        workers = int(settings.truecheck_transcribe_workers)
+        chunks: list[tuple[int, int]] = []
+        if workers > 1:
+            from faster_whisper.audio import decode_audio
+
+            audio = decode_audio(str(Path(path)), sampling_rate=_SAMPLE_RATE)
+            chunks = _speech_chunks(audio)
+
+        if len(chunks) > 1:
+            n_chunks = len(chunks)
+            pool = _get_pool(workers)
+            futures = [pool.submit(_transcribe_chunk, audio[a:b]) for a, b in chunks]
+            for fut in futures:
+                text = fut.result()
+                if text:
+                    chars += len(text)
+                    yield text
+        else:
+            model, load_ms = load_whisper_model()
+            segments, info = model.transcribe(str(Path(path)), beam_size=1)
+            language = getattr(info, "language", None)
+            for seg in segments:
+                text = seg.text.strip() if seg.text else ""
+                if text:
+                    chars += len(text)
+                    yield text
+
+        audit(
+            report_id,
+            "transcribe",
+            {
+                "language": language,
+                "chars": chars,
+                "chunks": n_chunks,
+                "model": settings.truecheck_whisper_model,
+                "compute_type": settings.truecheck_whisper_compute_type,
+                "model_load_ms": round(load_ms, 1),
+                "transcribe_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+    except Exception as e:
+        audit(report_id, "transcribe_failed", {"error": str(e), "chars_before_failure": chars})
+
+
 def transcribe_audio(report_id: str, path: str) -> str:
     """Optional transcription.
 
     By default this is a stub. If you install `faster-whisper`, it will run locally.
     """
-    try:
-        from faster_whisper import WhisperModel
+    return " ".join(transcribe_audio_stream(report_id, path))
 
-        model = WhisperModel("base", device="cpu", compute_type="int8")
-        segments, info = model.transcribe(str(Path(path)), beam_size=1)
-        text = " ".join(seg.text.strip() for seg in segments if seg.text)
-        audit(report_id, "transcribe", {"language": getattr(info, "language", None), "chars": len(text)})
-        return text
-    except Exception as e:
-        audit(report_id, "transcribe_failed", {"error": str(e)})
-        return ""
+
+def _reset_after_fork() -> None:
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,14 +1,138 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
 
-from app.db import get_session
+from sqlalchemy import insert
+
+from app.config import settings
+from app.db import engine, get_session
 from app.models import AuditEvent
 
 
+# Process-wide buffer of pending rows for a single bulk INSERT per flush.
+# Events are timestamped when recorded, not when flushed, so ordering is preserved.
+# Rows from a failed flush go back to the front of the buffer, up to this many in total.
+_MAX_BUFFERED = 10_000
+
+log = logging.getLogger("truecheck.audit")
+
+_buffer: list[dict] = []
+_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+_last_flush = time.monotonic()
+
+
 def audit(report_id: str, event_type: str, details: dict) -> None:
-    with get_session() as session:
-        session.add(
-            AuditEvent(report_id=report_id, event_type=event_type, details_json=json.dumps(details))
-        )
-        session.commit()
+    if not settings.truecheck_audit_buffered:
+        with get_session() as session:
+            session.add(
+                AuditEvent(report_id=report_id, event_type=event_type, details_json=json.dumps(details))
+            )
+            session.commit()
+        return
+
+    row = {
+        "report_id": report_id,
+        "event_type": event_type,
+        "details_json": json.dumps(details),
+        "created_at": datetime.utcnow(),
+    }
+    with _lock:
+        _buffer.append(row)
+        full = len(_buffer) >= max(1, int(settings.truecheck_audit_flush_size))
+    _ensure_flusher()
+    if full:
+        flush_audit_quietly()
+
+
+def flush_audit() -> int:
+    """Write all buffered events in one transaction. Returns the number of rows written.
+
+    Called by the pipeline at the end of every run (success or failure) and by the
+    background flusher on the time threshold.
+    """
+    global _last_flush
+    with _lock:
+        rows = list(_buffer)
+        _buffer.clear()
+        _last_flush = time.monotonic()
+    if not rows:
+        return 0
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(AuditEvent), rows)
+    except Exception:
+        # Keep the rows for the next flush instead of losing every report's pending events.
+        with _lock:
+            _buffer[:0] = rows
+            dropped = len(_buffer) - _MAX_BUFFERED
+            if dropped > 0:
+                del _buffer[:dropped]
+        if dropped > 0:
+            log.warning("audit buffer full while the database is failing; dropped %d oldest events", dropped)
+        raise
+    return len(rows)
+
+
+def flush_audit_quietly() -> bool:
+    """`flush_audit` for callers that must not fail on it; returns False if rows stayed buffered."""
+    try:
+        flush_audit()
+    except Exception:
+        log.exception("audit flush failed; %d events stay buffered", pending_audit_count())
+        return False
+    return True
+
+
+def pending_audit_count() -> int:
+    with _lock:
+        return len(_buffer)
+
+
+def _flush_loop() -> None:
+    while True:
+        interval = max(0.05, float(settings.truecheck_audit_flush_interval_seconds))
+        time.sleep(interval)
+        if time.monotonic() - _last_flush < interval:
+            continue
+        try:
+            flush_audit()
+        except Exception:
+            # Rows stay buffered; the next flush retries and explicit flushes surface the error.
+            pass
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, name="audit-flusher", daemon=True)
+            _flusher.start()
+
+
+def _reset_after_fork() -> None:
+    # The parent owns whatever it buffered; a forked child must not write those rows again.
+    global _lock, _flusher
+    _buffer.clear()
+    _lock = threading.Lock()
+    _flusher = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    try:
+        flush_audit()
+    except Exception:
+        pass
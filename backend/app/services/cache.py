@@ -1,16 +1,154 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Any, Callable
 
+from sqlalchemy import delete, func, insert, select as sa_select, update
 from sqlmodel import select
 
 from app.config import settings
-from app.db import get_session
+from app.db import engine, get_session, searchcache_has_unique_key
 from app.models import SearchCache
+from app.services.audit import audit
+from app.services.query_norm import canonicalize_query, near_dup_add, near_dup_find
+from app.services.redis_conn import get_redis, mark_redis_down
+
+
+class _MemoryTier:
+    """Bounded per-process LRU with a TTL, in front of the `SearchCache` table.
+
+    Values are shared between callers on a hit, so treat cached results as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._data: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple[str, str]) -> Any | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple[str, str], value: Any, ttl: float) -> None:
+        max_entries = int(settings.truecheck_cache_memory_max_entries)
+        if max_entries <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+            }
+
+    def reset_lock(self) -> None:
+        self._lock = threading.Lock()
+
+
+_memory = _MemoryTier()
+_persistent_stats = {"hits": 0, "misses": 0, "writes": 0, "swept_expired": 0, "evicted": 0}
+_redis_stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+_single_flight_stats = {"leader": 0, "follower_hits": 0, "follower_timeouts": 0}
+_search_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+_sweeper: threading.Thread | None = None
+
+
+def _bump(name: str, n: int = 1, table: dict[str, int] | None = None) -> None:
+    with _stats_lock:
+        (_persistent_stats if table is None else table)[name] += n
+
+
+def _redis_key(prefix: str, kind: str, query: str) -> str:
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return f"truecheck:{prefix}:{kind}:{digest}"
+
+
+def _redis_get(kind: str, query: str) -> Any | None:
+    if not settings.truecheck_cache_redis:
+        return None
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        raw = r.get(_redis_key("cache", kind, query))
+    except Exception:
+        _bump("errors", table=_redis_stats)
+        mark_redis_down()
+        return None
+    if raw is None:
+        _bump("misses", table=_redis_stats)
+        return None
+    try:
+        value = json.loads(raw)
+    except Exception:
+        _bump("misses", table=_redis_stats)
+        return None
+    _bump("hits", table=_redis_stats)
+    return value
+
+
+def _redis_put(kind: str, query: str, payload: str, ttl: int) -> None:
+    if not settings.truecheck_cache_redis or ttl <= 0:
+        return
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.set(_redis_key("cache", kind, query), payload, ex=ttl)
+        _bump("writes", table=_redis_stats)
+    except Exception:
+        _bump("errors", table=_redis_stats)
+        mark_redis_down()
 
 
 def cache_get(kind: str, query: str):
+    _ensure_sweeper()
+    key = (kind, query)
+    hit = _memory.get(key)
+    if hit is not None:
+        return hit
+
+    shared = _redis_get(kind, query)
+    if shared is not None:
+        _memory.put(key, shared, _memory_ttl(float(settings.truecheck_cache_memory_ttl_seconds)))
+        return shared
+
     now = datetime.utcnow()
     with get_session() as session:
         stmt = (
@@ -18,23 +156,305 @@ def cache_get(kind: str, query: str):
             .where(SearchCache.kind == kind)
             .where(SearchCache.query == query)
             .where(SearchCache.expires_at > now)
-            .order_by(SearchCache.created_at.desc())
             .limit(1)
         )
-        hit = session.exec(stmt).first()
-        if not hit:
+        row = session.exec(stmt).first()
+        if not row:
+            _bump("misses")
             return None
         try:
-            return json.loads(hit.response_json)
+            value = json.loads(row.response_json)
         except Exception:
+            _bump("misses")
             return None
 
+    _bump("hits")
+    remaining = (row.expires_at - now).total_seconds()
+    _memory.put(key, value, _memory_ttl(remaining))
+    _redis_put(kind, query, row.response_json, int(remaining))
+    return value
 
-def cache_put(kind: str, query: str, response_obj) -> None:
-    ttl = max(0, int(settings.truecheck_search_cache_ttl_seconds))
-    expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+
+def cache_put(kind: str, query: str, response_obj, ttl_seconds: int | None = None) -> None:
+    _ensure_sweeper()
+    if ttl_seconds is None:
+        ttl_seconds = settings.truecheck_search_cache_ttl_seconds
+    ttl = max(0, int(ttl_seconds))
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl)
 
     payload = json.dumps(response_obj)
-    with get_session() as session:
-        session.add(SearchCache(kind=kind, query=query, response_json=payload, expires_at=expires_at))
-        session.commit()
+    values = {"kind": kind, "query": query, "response_json": payload, "created_at": now, "expires_at": expires_at}
+    _upsert(values)
+    _bump("writes")
+    _redis_put(kind, query, payload, ttl)
+    _memory.put((kind, query), response_obj, _memory_ttl(ttl))
+
+
+def cache_get_or_fetch(
+    kind: str,
+    query: str,
+    fetch: Callable[[], Any],
+    check_cache: bool = True,
+) -> tuple[Any, bool]:
+    """Return `(value, from_cache)`, calling `fetch` at most once across workers per key.
+
+    On a miss the first caller takes a short-lived Redis lock and fetches; concurrent
+    callers for the same key poll the shared Redis tier for its result instead of
+    issuing an identical upstream request. If the leader fails or the wait exceeds
+    `truecheck_single_flight_wait_seconds`, followers fetch themselves. Without Redis
+    this is a plain cache-aside. Exceptions from `fetch` propagate and nothing is cached.
+    """
+    if check_cache:
+        cached = cache_get(kind, query)
+        if cached is not None:
+            return cached, True
+
+    r = get_redis() if settings.truecheck_cache_redis else None
+    if r is None:
+        value = fetch()
+        cache_put(kind, query, value)
+        return value, False
+
+    lock_key = _redis_key("sf", kind, query)
+    token = uuid.uuid4().hex
+    lock_ms = max(1000, int(float(settings.truecheck_single_flight_lock_seconds) * 1000))
+    deadline = time.monotonic() + max(0.0, float(settings.truecheck_single_flight_wait_seconds))
+    delay = 0.05
+
+    while True:
+        try:
+            leader = bool(r.set(lock_key, token, nx=True, px=lock_ms))
+        except Exception:
+            mark_redis_down()
+            leader = True
+            r = None
+
+        if leader:
+            _bump("leader", table=_single_flight_stats)
+            try:
+                value = fetch()
+                cache_put(kind, query, value)
+                return value, False
+            finally:
+                if r is not None:
+                    try:
+                        # Only release our own lock; it may have expired and been re-taken.
+                        if r.get(lock_key) == token.encode():
+                            r.delete(lock_key)
+                    except Exception:
+                        pass
+
+        time.sleep(delay)
+        delay = min(0.25, delay * 2)
+
+        shared = _redis_get(kind, query)
+        if shared is not None:
+            _bump("follower_hits", table=_single_flight_stats)
+            _memory.put((kind, query), shared, _memory_ttl(float(settings.truecheck_cache_memory_ttl_seconds)))
+            return shared, True
+
+        if time.monotonic() >= deadline:
+            _bump("follower_timeouts", table=_single_flight_stats)
+            value = fetch()
+            cache_put(kind, query, value)
+            return value, False
+
+
+def _memory_ttl(remaining_seconds: float) -> float:
+    return min(float(settings.truecheck_cache_memory_ttl_seconds), max(0.0, remaining_seconds))
+
+
+_unique_key: bool | None = None
+
+
+def _can_upsert() -> bool:
+    # ON CONFLICT needs the (kind, query) unique index; a DB the migration couldn't fix lacks it.
+    global _unique_key
+    if _unique_key is None:
+        try:
+            _unique_key = searchcache_has_unique_key()
+        except Exception:
+            return False
+    return _unique_key
+
+
+def _upsert(values: dict) -> None:
+    backend = engine.url.get_backend_name()
+    if backend in ("sqlite", "postgresql") and _can_upsert():
+        if backend == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(SearchCache).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "query"],
+            set_={k: stmt.excluded[k] for k in ("response_json", "created_at", "expires_at")},
+        )
+        with engine.begin() as conn:
+            conn.execute(stmt)
+        return
+
+    # Generic fallback: update in place, insert if nothing matched.
+    with engine.begin() as conn:
+        res = conn.execute(
+            update(SearchCache)
+            .where(SearchCache.kind == values["kind"], SearchCache.query == values["query"])
+            .values(response_json=values["response_json"], created_at=values["created_at"], expires_at=values["expires_at"])
+        )
+        if not res.rowcount:
+            conn.execute(insert(SearchCache).values(**values))
+
+
+def cached_search(report_id: str, kind: str, query: str, num: int, fetch: Callable[[], Any]) -> Any:
+    """Search-provider cache front door used by `search_web` / `search_images` / `search_gdelt`.
+
+    Keys are built from the canonicalized claim (see `query_norm.canonicalize_query`), so
+    trivially different phrasings share an entry. With `truecheck_cache_near_dup` enabled,
+    an exact miss also checks the MinHash/LSH index for a close paraphrase whose cached
+    evidence can be reused. Hits are audited as `<kind>_cache_hit`.
+    """
+    canonical = canonicalize_query(query) or query.strip()
+    key = f"q={canonical}|n={num}"
+    namespace = f"{kind}|n={num}"
+
+    cached = cache_get(kind, key)
+    if cached is not None:
+        _bump_search(kind, "exact_hits")
+        audit(report_id, f"{kind}_cache_hit", {"query": query})
+        return cached
+
+    if settings.truecheck_cache_near_dup:
+        match = near_dup_find(namespace, canonical)
+        if match is not None:
+            cached = cache_get(kind, f"q={match[0]}|n={num}")
+            if cached is not None:
+                _bump_search(kind, "near_dup_hits")
+                audit(
+                    report_id,
+                    f"{kind}_cache_hit",
+                    {"query": query, "near_duplicate_of": match[0], "similarity": round(match[1], 3)},
+                )
+                return cached
+
+    results, from_cache = cache_get_or_fetch(kind, key, fetch, check_cache=False)
+    if from_cache:
+        _bump_search(kind, "exact_hits")
+        audit(report_id, f"{kind}_cache_hit", {"query": query})
+    else:
+        _bump_search(kind, "misses")
+        if settings.truecheck_cache_near_dup:
+            near_dup_add(namespace, canonical)
+    return results
+
+
+def _bump_search(kind: str, name: str) -> None:
+    with _stats_lock:
+        counters = _search_stats.setdefault(kind, {"exact_hits": 0, "near_dup_hits": 0, "misses": 0})
+        counters[name] += 1
+
+
+def cache_invalidate(kind: str) -> int:
+    """Drop every entry of `kind` from all tiers (e.g. "reasoning" after a prompt/model change).
+
+    Other processes' memory tiers are not reachable from here; they age out within
+    `truecheck_cache_memory_ttl_seconds`. Returns the number of persistent rows deleted.
+    """
+    with _memory._lock:
+        for key in [k for k in _memory._data if k[0] == kind]:
+            del _memory._data[key]
+
+    r = get_redis() if settings.truecheck_cache_redis else None
+    if r is not None:
+        try:
+            batch = []
+            for key in r.scan_iter(match=f"truecheck:cache:{kind}:*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    r.delete(*batch)
+                    batch = []
+            if batch:
+                r.delete(*batch)
+        except Exception:
+            mark_redis_down()
+
+    with engine.begin() as conn:
+        return conn.execute(delete(SearchCache).where(SearchCache.kind == kind)).rowcount or 0
+
+
+def sweep_search_cache() -> dict[str, int]:
+    """Delete expired rows, then trim the table to `truecheck_search_cache_max_rows` (oldest first)."""
+    now = datetime.utcnow()
+    evicted = 0
+    with engine.begin() as conn:
+        expired = conn.execute(delete(SearchCache).where(SearchCache.expires_at <= now)).rowcount or 0
+
+        max_rows = int(settings.truecheck_search_cache_max_rows)
+        if max_rows > 0:
+            total = conn.execute(sa_select(func.count()).select_from(SearchCache)).scalar_one()
+            overflow = total - max_rows
+            if overflow > 0:
+                oldest = (
+                    sa_select(SearchCache.id).order_by(SearchCache.created_at.asc()).limit(overflow).scalar_subquery()
+                )
+                evicted = conn.execute(delete(SearchCache).where(SearchCache.id.in_(oldest))).rowcount or 0
+
+    _bump("swept_expired", expired)
+    _bump("evicted", evicted)
+    return {"expired": expired, "evicted": evicted}
+
+
+def _sweep_loop() -> None:
+    while True:
+        time.sleep(max(1, int(settings.truecheck_cache_sweep_interval_seconds)))
+        try:
+            sweep_search_cache()
+        except Exception:
+            # Best effort; a locked/busy DB just means we try again next interval.
+            pass
+
+
+def _ensure_sweeper() -> None:
+    global _sweeper
+    if int(settings.truecheck_cache_sweep_interval_seconds) <= 0:
+        return
+    if _sweeper is not None and _sweeper.is_alive():
+        return
+    with _stats_lock:
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper = threading.Thread(target=_sweep_loop, name="search-cache-sweeper", daemon=True)
+            _sweeper.start()
+
+
+def cache_stats() -> dict[str, Any]:
+    with _stats_lock:
+        search: dict[str, dict[str, Any]] = {}
+        for kind, c in _search_stats.items():
+            lookups = c["exact_hits"] + c["near_dup_hits"] + c["misses"]
+            hits = c["exact_hits"] + c["near_dup_hits"]
+            search[kind] = {**c, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
+        # Every web/image hit is one paid Custom Search call not made.
+        cse_calls_saved = sum(
+            c["exact_hits"] + c["near_dup_hits"] for k, c in _search_stats.items() if k in ("web", "image")
+        )
+        return {
+            "memory": _memory.stats(),
+            "redis": dict(_redis_stats),
+            "persistent": dict(_persistent_stats),
+            "single_flight": dict(_single_flight_stats),
+            "search": search,
+            "cse_calls_saved": cse_calls_saved,
+        }
+
+
+def _reset_after_fork() -> None:
+    # Keep the inherited warm entries; only locks and the sweeper thread are per-process.
+    global _stats_lock, _sweeper
+    _memory.reset_lock()
+    _stats_lock = threading.Lock()
+    _sweeper = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -5,11 +5,14 @@ import re
 from app.services.safety import sanitize_untrusted_text
 
 
-def extract_claims(text: str, max_claims: int = 6) -> list[str]:
+def extract_claims(text: str, max_claims: int = 6, fallback: bool = True) -> list[str]:
     """Rules-based claim splitter.
 
     This is deterministic and explainable. If Gemini is configured, you can later
     replace/augment with an LLM-based extractor.
+
+    With `fallback=False`, text without claim-like sentences yields [] instead of its
+    first sentences (used on partial transcripts, where later text may still add claims).
     """
     text = sanitize_untrusted_text(text, max_len=12000)
 
@@ -39,4 +42,6 @@ def extract_claims(text: str, max_claims: int = 6) -> list[str]:
         seen.add(key)
         uniq.append(c)
 
-    return uniq[:max_claims] if uniq else parts[: min(max_claims, len(parts))]
+    if uniq or not fallback:
+        return uniq[:max_claims]
+    return parts[: min(max_claims, len(parts))]
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import unicodedata
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi import UploadFile
+from sqlalchemy import insert, update
+
+from app.config import settings
+from app.db import engine, get_session
+from app.models import ContentIndex, InputType, Report, ReportStatus
+from app.limits import too_large
+from app.services.audit import audit
+from app.services.reports import materialize_report
+
+
+# Uploads are stored once per content hash, and a resubmission of content whose report
+# completed within `truecheck_dedupe_window_seconds` is linked to that report instead of
+# paying for OCR/search/Gemini again.
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WS_RE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def text_content_hash(text: str) -> str:
+    return "text:" + hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def file_content_hash(input_type: str, digest: str) -> str:
+    # The input type is part of the key: the same bytes analysed as text vs image differ.
+    return f"{input_type}:{digest}"
+
+
+def blob_path(digest: str, filename: str) -> Path:
+    suffix = Path(filename).suffix.lower()[:16]
+    return Path(settings.truecheck_storage_dir) / "blobs" / digest[:2] / f"{digest}{suffix}"
+
+
+async def store_upload(file: UploadFile, max_bytes: int) -> tuple[str, Path]:
+    """Stream an upload into the blob store in fixed-size chunks, hashing as it goes.
+
+    Returns `(sha256 hex, path)`; existing blobs are reused. Raises 413 past `max_bytes`
+    without keeping more than one chunk in memory.
+    """
+    filename = file.filename or "upload"
+    if file.size is not None and file.size > max_bytes:
+        raise too_large(max_bytes)
+
+    chunk_size = max(64 * 1024, int(settings.truecheck_upload_chunk_bytes))
+    tmp_dir = Path(settings.truecheck_storage_dir) / "blobs" / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=tmp_dir, prefix=".upload-")
+    try:
+        sha = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large(max_bytes)
+                sha.update(chunk)
+                out.write(chunk)
+        digest = sha.hexdigest()
+        dest = blob_path(digest, filename)
+        if dest.exists():
+            os.unlink(tmp)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, dest)
+        return digest, dest
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def find_fresh_report(content_hash: str) -> str | None:
+    return find_fresh_reports([content_hash]).get(content_hash)
+
+
+def find_fresh_reports(content_hashes: list[str]) -> dict[str, str]:
+    """content_hash -> report id for hashes with a report completed inside the window."""
+    window = int(settings.truecheck_dedupe_window_seconds)
+    if window <= 0 or not content_hashes:
+        return {}
+    cutoff = datetime.utcnow() - timedelta(seconds=window)
+    with get_session() as session:
+        rows = session.query(ContentIndex).filter(
+            ContentIndex.content_hash.in_(set(content_hashes)), ContentIndex.completed_at >= cutoff
+        )
+        return {row.content_hash: row.report_id for row in rows}
+
+
+def record_completed(report_id: str, content_hash: str | None) -> None:
+    """Point the content index at a report that just finished the pipeline."""
+    if not content_hash:
+        return
+    values = {"content_hash": content_hash, "report_id": report_id, "completed_at": datetime.utcnow()}
+    # Identical content can finish on two workers at once, so this must be a single upsert.
+    backend = engine.url.get_backend_name()
+    if backend in ("sqlite", "postgresql"):
+        if backend == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(ContentIndex).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["content_hash"],
+            set_={k: stmt.excluded[k] for k in ("report_id", "completed_at")},
+        )
+        with engine.begin() as conn:
+            conn.execute(stmt)
+        return
+
+    # Generic fallback: update in place, insert if nothing matched.
+    with engine.begin() as conn:
+        res = conn.execute(
+            update(ContentIndex)
+            .where(ContentIndex.content_hash == content_hash)
+            .values(report_id=report_id, completed_at=values["completed_at"])
+        )
+        if not res.rowcount:
+            conn.execute(insert(ContentIndex).values(**values))
+
+
+def duplicate_report(source: Report, report_id: str, *, input_type: InputType, content_hash: str, **fields) -> Report:
+    """Completed report row serving `source`'s result (caller adds and commits it)."""
+    return Report(
+        id=report_id,
+        input_type=input_type,
+        status=ReportStatus.complete,
+        verdict=source.verdict,
+        confidence=source.confidence,
+        explanation=source.explanation,
+        ai_likelihood=source.ai_likelihood,
+        content_hash=content_hash,
+        duplicate_of=source.duplicate_of or source.id,
+        **fields,
+    )
+
+
+def link_duplicate(
+    source_id: str,
+    *,
+    input_type: InputType,
+    content_hash: str,
+    input_text: str | None = None,
+    original_filename: str | None = None,
+    storage_path: str | None = None,
+) -> str | None:
+    """Create a completed report that serves `source_id`'s result; None if the source is gone."""
+    report_id = str(uuid.uuid4())
+    with get_session() as session:
+        source = session.get(Report, source_id)
+        if not source or source.status != ReportStatus.complete:
+            return None
+        session.add(
+            duplicate_report(
+                source,
+                report_id,
+                input_type=input_type,
+                content_hash=content_hash,
+                input_text=input_text,
+                original_filename=original_filename,
+                storage_path=storage_path,
+            )
+        )
+        session.commit()
+
+    audit(report_id, "duplicate_of", {"report_id": source_id, "content_hash": content_hash})
+    materialize_report(report_id)
+    return report_id
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from urllib.parse import urlparse
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
 
+from app.config import settings
 from app.models import SourceCredibility
 
 
@@ -31,18 +36,164 @@ LOW_CRED_DOMAINS = {
     "beforeitsnews.com",
 }
 
+log = logging.getLogger("truecheck.credibility")
+
+# Trie node key holding the label of a domain that ends at this node. Not a string, so it
+# can never collide with a host label.
+_END = object()
+
+
+class CredibilityIndex:
+    """Domain -> credibility lookup over a reversed-label trie.
+
+    "news.bbc.co.uk" is walked as uk -> co -> bbc -> news, so a lookup costs one dict step per
+    host label no matter how many domains are loaded. The deepest listed domain wins, which
+    lets a list mark "blogs.example.com" differently from "example.com". Results are memoized
+    per host; the memo lives and dies with the index, so a reload starts clean.
+    """
+
+    def __init__(self, trusted: set[str], low: set[str], memo_size: int = 50_000) -> None:
+        self._root: dict = {}
+        # Low first so a domain present in both lists ends up trusted, as with the old scan order.
+        for domain in low:
+            self._add(domain, SourceCredibility.low)
+        for domain in trusted:
+            self._add(domain, SourceCredibility.trusted)
+        self.size = len(trusted) + len(low)
+        self._memo: dict[str, SourceCredibility | None] = {}
+        self._memo_size = memo_size
+
+    def _add(self, domain: str, label: SourceCredibility) -> None:
+        node = self._root
+        for part in reversed(domain.split(".")):
+            if part:
+                node = node.setdefault(part, {})
+        node[_END] = label
+
+    def lookup(self, host: str) -> SourceCredibility | None:
+        hit = self._memo.get(host, self)
+        if hit is not self:
+            return hit
+        node = self._root
+        found = None
+        for part in reversed(host.split(".")):
+            if not part:
+                # "a..reuters.com" / trailing dot: empty labels are skipped, not matched.
+                continue
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(_END, found)
+        if len(self._memo) >= self._memo_size:
+            self._memo.clear()
+        self._memo[host] = found
+        return found
+
+
+def normalize_domain(value: str) -> str:
+    d = value.strip().lower().rstrip(".")
+    if d.startswith("*."):
+        d = d[2:]
+    if d.startswith("www."):
+        d = d[4:]
+    return d
+
+
+def load_domain_list(path: str) -> set[str]:
+    """Read one domain per line; `#` comments and hosts-file lines ("0.0.0.0 example.com") work."""
+    domains: set[str] = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            tokens = line.split("#", 1)[0].split()
+            if not tokens:
+                continue
+            d = normalize_domain(tokens[-1])
+            if "." in d:
+                domains.add(d)
+    return domains
+
+
+def _list_paths(value: str) -> list[str]:
+    return [p.strip() for p in (value or "").split(",") if p.strip()]
+
+
+def _mtimes(paths: list[str]) -> tuple:
+    out = []
+    for p in paths:
+        try:
+            out.append(os.stat(p).st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+def build_index() -> CredibilityIndex:
+    trusted = set(TRUSTED_DOMAINS)
+    low = set(LOW_CRED_DOMAINS)
+    for paths, target in (
+        (_list_paths(settings.truecheck_credibility_trusted_files), trusted),
+        (_list_paths(settings.truecheck_credibility_low_files), low),
+    ):
+        for path in paths:
+            try:
+                target |= load_domain_list(path)
+            except OSError as e:
+                log.warning("credibility list %s not loaded: %s", path, e)
+    return CredibilityIndex(trusted, low)
+
+
+_index: CredibilityIndex | None = None
+_index_mtimes: tuple = ()
+_next_check = 0.0
+_reload_lock = threading.Lock()
+
+
+def _list_files() -> list[str]:
+    return _list_paths(settings.truecheck_credibility_trusted_files) + _list_paths(
+        settings.truecheck_credibility_low_files
+    )
+
+
+def reload_index() -> CredibilityIndex:
+    """Rebuild from the list files and swap it in; lookups in flight keep the old index."""
+    global _index, _index_mtimes
+    with _reload_lock:
+        mtimes = _mtimes(_list_files())
+        index = build_index()
+        _index, _index_mtimes = index, mtimes
+    log.info("credibility index loaded: %d domains", index.size)
+    return index
+
+
+def get_index() -> CredibilityIndex:
+    """Current index; list files are re-checked at most every `truecheck_credibility_reload_seconds`."""
+    global _next_check
+    index = _index
+    if index is None:
+        return reload_index()
+    interval = float(settings.truecheck_credibility_reload_seconds)
+    if interval > 0 and time.monotonic() >= _next_check:
+        _next_check = time.monotonic() + interval
+        if _mtimes(_list_files()) != _index_mtimes:
+            index = reload_index()
+    return index
+
 
 def label_credibility(url: str | None, publisher: str | None = None) -> SourceCredibility:
     if not url:
         return SourceCredibility.unknown
 
-    host = (urlparse(url).hostname or "").lower()
-    host = host.replace("www.", "")
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        host = ""
+    # Only a leading "www." label is dropped ("awww.com" stays as is).
+    if host.startswith("www."):
+        host = host[4:]
 
-    if host in TRUSTED_DOMAINS or any(host.endswith("." + d) for d in TRUSTED_DOMAINS):
-        return SourceCredibility.trusted
-    if host in LOW_CRED_DOMAINS or any(host.endswith("." + d) for d in LOW_CRED_DOMAINS):
-        return SourceCredibility.low
+    found = get_index().lookup(host) if host else None
+    if found is not None:
+        return found
 
     # Default neutral if it looks like a known publisher domain.
     if host and "." in host:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from dateutil import parser as dtparser
+
+
+# Evidence dates arrive in a few known shapes: GDELT `seendate` ("20240101T120000Z") and ISO-8601
+# `article:published_time` / `og:updated_time`. Those take C-speed paths; dateutil only sees the rest.
+# Results are timezone-aware (naive inputs are taken as UTC) and keep the source's offset, so
+# `.date()` is the publisher's calendar date.
+
+
+def _parse_gdelt(value: str) -> Optional[datetime]:
+    # "YYYYMMDDTHHMMSSZ"
+    if len(value) != 16 or value[8] != "T" or value[15] != "Z" or not (value[:8] + value[9:15]).isdigit():
+        return None
+    return datetime(
+        int(value[0:4]),
+        int(value[4:6]),
+        int(value[6:8]),
+        int(value[9:11]),
+        int(value[11:13]),
+        int(value[13:15]),
+        tzinfo=timezone.utc,
+    )
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an evidence date string; None if it is empty or unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = _parse_gdelt(value)
+        if dt is None:
+            # fromisoformat only accepts a trailing "Z" from Python 3.11 on.
+            dt = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value)
+    except ValueError:
+        try:
+            dt = dtparser.parse(value)
+        except (ValueError, OverflowError):
+            return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator
+
+from app.config import settings
+from app.services.redis_conn import get_async_redis, get_redis, mark_redis_down
+
+
+# Progress events for GET /reports/{id}/events.
+#
+# Workers publish over Redis pub/sub and also append to a short-lived per-report list so
+# a subscriber that connects late can replay what it missed. Without Redis (in-process
+# local executor fallback) the same events go through a local broker.
+
+TERMINAL_EVENTS = {"complete", "failed"}
+
+_HISTORY_TTL_SECONDS = 60 * 60
+
+
+def _channel(report_id: str) -> str:
+    return f"truecheck:report:{report_id}:events"
+
+
+def _history_key(report_id: str) -> str:
+    return f"truecheck:report:{report_id}:history"
+
+
+def _seq_key(report_id: str) -> str:
+    return f"truecheck:report:{report_id}:seq"
+
+
+class _LocalBroker:
+    def __init__(self, max_reports: int = 512) -> None:
+        self._history: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._cond = threading.Condition()
+        self._max_reports = max_reports
+
+    def publish(self, report_id: str, event_type: str, data: dict[str, Any]) -> dict[str, Any]:
+        with self._cond:
+            history = self._history.setdefault(report_id, [])
+            self._history.move_to_end(report_id)
+            event = {"seq": len(history) + 1, "type": event_type, "data": data}
+            history.append(event)
+            while len(self._history) > self._max_reports:
+                self._history.popitem(last=False)
+            self._cond.notify_all()
+            return event
+
+    def wait(self, report_id: str, after_seq: int, timeout: float) -> list[dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                events = [e for e in self._history.get(report_id, []) if e["seq"] > after_seq]
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                self._cond.wait(remaining)
+
+
+_local = _LocalBroker()
+
+
+def publish_event(report_id: str, event_type: str, data: dict[str, Any] | None = None) -> None:
+    """Best-effort progress notification; never raises into the pipeline."""
+    data = data or {}
+    r = get_redis()
+    if r is not None:
+        try:
+            seq = int(r.incr(_seq_key(report_id)))
+            payload = json.dumps({"seq": seq, "type": event_type, "data": data})
+            pipe = r.pipeline(transaction=False)
+            pipe.rpush(_history_key(report_id), payload)
+            for key in (_history_key(report_id), _seq_key(report_id)):
+                pipe.expire(key, _HISTORY_TTL_SECONDS)
+            pipe.publish(_channel(report_id), payload)
+            pipe.execute()
+            return
+        except Exception:
+            mark_redis_down()
+    _local.publish(report_id, event_type, data)
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    head = f"id: {event['seq']}\n" if event.get("seq") is not None else ""
+    return f"{head}event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def stream_events(report_id: str, last_seq: int = 0) -> AsyncIterator[dict[str, Any] | None]:
+    """Yield events with seq > last_seq until a terminal event, replaying history first.
+
+    Yields `None` on idle keepalive ticks so the caller can send a comment and re-check
+    the report status in the DB.
+    """
+    keepalive = max(1.0, float(settings.truecheck_sse_keepalive_seconds))
+
+    # get_redis() may block on a connect + ping; keep that off the event loop.
+    if await asyncio.to_thread(get_redis) is not None:
+        try:
+            async for event in _stream_redis(report_id, last_seq, keepalive):
+                yield event
+            return
+        except Exception:
+            mark_redis_down()
+
+    seq = last_seq
+    while True:
+        events = await asyncio.to_thread(_local.wait, report_id, seq, keepalive)
+        if not events:
+            yield None
+            continue
+        for event in events:
+            seq = event["seq"]
+            yield event
+            if event["type"] in TERMINAL_EVENTS:
+                return
+
+
+async def _stream_redis(report_id: str, last_seq: int, keepalive: float) -> AsyncIterator[dict[str, Any] | None]:
+    client = get_async_redis()
+    pubsub = client.pubsub()
+    try:
+        # Subscribe before reading history so nothing published in between is lost;
+        # duplicates are dropped by seq.
+        await pubsub.subscribe(_channel(report_id))
+        seq = last_seq
+        for raw in await client.lrange(_history_key(report_id), 0, -1):
+            event = json.loads(raw)
+            if event["seq"] <= seq:
+                continue
+            seq = event["seq"]
+            yield event
+            if event["type"] in TERMINAL_EVENTS:
+                return
+
+        while True:
+            msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive)
+            if msg is None:
+                yield None
+                continue
+            event = json.loads(msg["data"])
+            if event["seq"] <= seq:
+                continue
+            seq = event["seq"]
+            yield event
+            if event["type"] in TERMINAL_EVENTS:
+                return
+    finally:
+        # Returns the subscription's connection; the shared client stays open.
+        try:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+        except Exception:
+            pass
+
+
+def _reset_after_fork() -> None:
+    global _local
+    _local = _LocalBroker()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
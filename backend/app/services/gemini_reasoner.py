@@ -1,22 +1,61 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
-import httpx
-
 from app.config import settings
 from app.services.audit import audit
+from app.services.cache import cache_get, cache_put
+from app.services.http_client import get_client
+from app.services.rate_limit import RateLimitExceeded, limited_request
+from app.services.query_norm import normalize_claim_text
 from app.services.safety import sanitize_untrusted_text
 
 
+_UNCLEAR = {"status": "Unclear", "rationale": "", "citations": []}
+_VALID_STATUSES = {"Supported", "Contradicted", "Unclear"}
+
+
+@dataclass
+class GeminiUsage:
+    """Per-report accumulator for Gemini call count, tokens and latency (thread-safe)."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    latency_ms: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, data: dict[str, Any], latency_ms: int) -> None:
+        meta = data.get("usageMetadata") or {}
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += int(meta.get("promptTokenCount") or 0)
+            self.output_tokens += int(meta.get("candidatesTokenCount") or 0)
+            self.total_tokens += int(meta.get("totalTokenCount") or 0)
+            self.latency_ms += latency_ms
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_ms": self.latency_ms,
+        }
+
+
 def is_configured() -> bool:
     return bool(settings.gemini_api_key)
 
 
-def build_reasoning_prompt(claim: str, evidence: list[dict[str, Any]]) -> str:
-    # IMPORTANT: reasoning must only use provided evidence; no invented sources.
+def _format_evidence(evidence: list[dict[str, Any]]) -> list[str]:
     evidence_lines = []
     for idx, ev in enumerate(evidence, start=1):
         evidence_lines.append(
@@ -25,6 +64,12 @@ def build_reasoning_prompt(claim: str, evidence: list[dict[str, Any]]) -> str:
             f"Date: {ev.get('published_date')}\n"
             f"Snippet: {sanitize_untrusted_text(ev.get('snippet') or '', 800)}\n"
         )
+    return evidence_lines
+
+
+def build_reasoning_prompt(claim: str, evidence: list[dict[str, Any]]) -> str:
+    # IMPORTANT: reasoning must only use provided evidence; no invented sources.
+    evidence_lines = _format_evidence(evidence)
 
     return (
         "You are a fact-checking assistant.\n"
@@ -42,6 +87,43 @@ def build_reasoning_prompt(claim: str, evidence: list[dict[str, Any]]) -> str:
     )
 
 
+def build_batch_reasoning_prompt(items: list[tuple[str, list[dict[str, Any]]]]) -> str:
+    """Rate several claims in one request; the rules preamble is sent once."""
+    blocks = []
+    for n, (claim, evidence) in enumerate(items, start=1):
+        blocks.append(
+            f"Claim {n}: {sanitize_untrusted_text(claim, 600)}\n"
+            f"Evidence for claim {n}:\n" + "\n".join(_format_evidence(evidence))
+        )
+
+    return (
+        "You are a fact-checking assistant.\n"
+        "Non-negotiable rules:\n"
+        "- Judge each claim using ONLY the evidence snippets listed under that claim.\n"
+        "- Do NOT invent new sources, URLs, quotes, or facts.\n"
+        "- If evidence is insufficient or conflicting, set status=Unclear and explain what is missing.\n"
+        "- Cite evidence ONLY by its bracketed number within that claim's evidence list (e.g., [1], [3]).\n\n"
+        f"Output a STRICT JSON array (no markdown, no code fences) with exactly {len(items)} objects, "
+        "one per claim, each with keys:\n"
+        "- id: the claim number\n"
+        "- status: one of Supported | Contradicted | Unclear\n"
+        "- rationale: 3–8 sentences explaining why, explicitly referencing evidence numbers\n"
+        "- citations: array of integers referencing the evidence items you relied on most\n\n"
+        "Claims:\n\n" + "\n".join(blocks)
+    )
+
+
+# Part of every reasoning cache key: any edit to either prompt template changes it.
+PROMPT_VERSION = hashlib.sha256(
+    (
+        build_reasoning_prompt("{claim}", [{"url": "{url}", "snippet": "{snippet}"}])
+        + build_batch_reasoning_prompt([("{claim}", [{"url": "{url}", "snippet": "{snippet}"}])])
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+REASONING_CACHE_KIND = "reasoning"
+
+
 def _extract_json_object(text: str) -> str:
     t = (text or "").strip()
     # Strip common code fences.
@@ -59,14 +141,22 @@ def _extract_json_object(text: str) -> str:
     return t
 
 
-def gemini_rate_claim(report_id: str, claim: str, evidence: list[dict[str, Any]]) -> dict[str, Any]:
-    if not is_configured():
-        audit(report_id, "gemini_skipped", {"reason": "GEMINI not configured"})
-        return {"status": "Unclear", "rationale": "", "citations": []}
+def _extract_json_array(text: str) -> str:
+    t = (text or "").strip()
+    t = re.sub(r"^```(?:json)?\s*", "", t, flags=re.IGNORECASE)
+    t = re.sub(r"\s*```$", "", t)
+    t = t.strip()
 
-    prompt = build_reasoning_prompt(claim, evidence)
-    audit(report_id, "gemini_call", {"model": settings.gemini_model, "evidence_count": len(evidence)})
+    if t.startswith("[") and t.endswith("]"):
+        return t
+
+    m = re.search(r"\[[\s\S]*\]", t)
+    if m:
+        return m.group(0)
+    return t
 
+
+def _generate(prompt: str, max_output_tokens: int, usage: GeminiUsage | None) -> str:
     # Minimal Gemini REST call (Google AI Studio style). Exact APIs may evolve.
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{settings.gemini_model}:generateContent"
     headers = {"Content-Type": "application/json"}
@@ -76,27 +166,223 @@ def gemini_rate_claim(report_id: str, claim: str, evidence: list[dict[str, Any]]
         "contents": [{"role": "user", "parts": [{"text": prompt}]}],
         "generationConfig": {
             "temperature": 0.1,
-            "maxOutputTokens": 900,
+            "maxOutputTokens": max_output_tokens,
             "responseMimeType": "application/json",
         },
     }
 
+    started = time.perf_counter()
+    client = get_client("gemini", timeout=float(settings.truecheck_gemini_timeout_seconds))
+    resp = limited_request("gemini", lambda: client.post(url, params=params, headers=headers, json=payload))
+    resp.raise_for_status()
+    data = resp.json()
+    if usage is not None:
+        usage.add(data, int((time.perf_counter() - started) * 1000))
+
+    return (
+        data.get("candidates", [{}])[0]
+        .get("content", {})
+        .get("parts", [{}])[0]
+        .get("text", "")
+    )
+
+
+def reasoning_cache_key(claim: str, evidence: list[dict[str, Any]]) -> str:
+    """Stable fingerprint of everything that determines a verdict.
+
+    Covers the lightly normalized claim (case/punctuation/whitespace only; modals and tense
+    change the verdict), the ordered evidence (URL + snippet, since citations
+    are positional), the model and PROMPT_VERSION, so changing the template or
+    `settings.gemini_model` naturally misses old entries.
+    """
+    material = json.dumps(
+        [
+            normalize_claim_text(claim) or claim.strip(),
+            [[ev.get("url"), ev.get("snippet")] for ev in evidence],
+            settings.gemini_model,
+            PROMPT_VERSION,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _cached_verdict(report_id: str, key: str, evidence_count: int) -> dict[str, Any] | None:
+    if not settings.truecheck_reasoning_cache:
+        return None
+    hit = cache_get(REASONING_CACHE_KIND, key)
+    if not isinstance(hit, dict):
+        return None
+    audit(
+        report_id,
+        "gemini_cache_hit",
+        {"model": settings.gemini_model, "prompt_version": PROMPT_VERSION, "evidence_count": evidence_count},
+    )
+    # Copy: cache tiers share the object between callers.
+    return {**hit, "citations": list(hit.get("citations") or [])}
+
+
+def _remember_verdict(key: str, result: dict[str, Any]) -> None:
+    if not settings.truecheck_reasoning_cache:
+        return
     try:
-        with httpx.Client(timeout=30) as client:
-            resp = client.post(url, params=params, headers=headers, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-
-        text = (
-            data.get("candidates", [{}])[0]
-            .get("content", {})
-            .get("parts", [{}])[0]
-            .get("text", "")
-        )
+        cache_put(REASONING_CACHE_KIND, key, result, ttl_seconds=int(settings.truecheck_reasoning_cache_ttl_seconds))
+    except Exception:
+        # A cache write failure must never cost us the verdict.
+        pass
+
+
+def gemini_rate_claim(
+    report_id: str,
+    claim: str,
+    evidence: list[dict[str, Any]],
+    usage: GeminiUsage | None = None,
+) -> dict[str, Any]:
+    if not is_configured():
+        audit(report_id, "gemini_skipped", {"reason": "GEMINI not configured"})
+        return dict(_UNCLEAR)
+
+    key = reasoning_cache_key(claim, evidence)
+    cached = _cached_verdict(report_id, key, len(evidence))
+    if cached is not None:
+        return cached
+    return _rate_claim_uncached(report_id, claim, evidence, usage, key)
+
+
+def _rate_claim_uncached(
+    report_id: str,
+    claim: str,
+    evidence: list[dict[str, Any]],
+    usage: GeminiUsage | None,
+    key: str,
+) -> dict[str, Any]:
+    prompt = build_reasoning_prompt(claim, evidence)
+    audit(report_id, "gemini_call", {"model": settings.gemini_model, "evidence_count": len(evidence)})
+
+    try:
+        text = _generate(prompt, 900, usage)
         text = _extract_json_object(text)
         # Best-effort JSON parse.
-        result = json.loads(text) if text.startswith("{") else {"status": "Unclear", "rationale": text, "citations": []}
+        if not text.startswith("{"):
+            return {"status": "Unclear", "rationale": text, "citations": []}
+        result = json.loads(text)
+        # Only well-formed verdicts are memoized; failures and free-text replies are retried next time.
+        if isinstance(result, dict) and result.get("status") in _VALID_STATUSES:
+            _remember_verdict(key, result)
         return result
+    except RateLimitExceeded as e:
+        # Not a verdict: an Unclear here would be stored as if the evidence were inconclusive.
+        audit(report_id, "gemini_rate_limited", {"error": str(e)})
+        raise
     except Exception as e:
         audit(report_id, "gemini_failed", {"error": str(e)})
-        return {"status": "Unclear", "rationale": "", "citations": []}
+        return _failed(e)
+
+
+def _failed(e: Exception) -> dict[str, Any]:
+    # "error" marks an Unclear that stands in for a failed call (see pipeline `_Work.degraded`).
+    return {**_UNCLEAR, "error": str(e)}
+
+
+def _parse_batch(text: str, n: int) -> dict[int, dict[str, Any]]:
+    """Map claim number -> result for every well-formed entry in a batch response."""
+    try:
+        rows = json.loads(_extract_json_array(text))
+    except Exception:
+        return {}
+    if not isinstance(rows, list):
+        return {}
+
+    parsed: dict[int, dict[str, Any]] = {}
+    for pos, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            continue
+        try:
+            n_id = int(row.get("id", pos))
+        except Exception:
+            continue
+        status = row.get("status")
+        if not (1 <= n_id <= n) or n_id in parsed or status not in _VALID_STATUSES:
+            continue
+        citations = row.get("citations")
+        parsed[n_id] = {
+            "status": status,
+            "rationale": row.get("rationale") if isinstance(row.get("rationale"), str) else "",
+            "citations": citations if isinstance(citations, list) else [],
+        }
+    return parsed
+
+
+def gemini_rate_claims(
+    report_id: str,
+    items: list[tuple[str, list[dict[str, Any]]]],
+    usage: GeminiUsage | None = None,
+) -> list[dict[str, Any]]:
+    """Batch variant of `gemini_rate_claim`: one request for all `(claim, evidence)` items.
+
+    Results are returned in input order. Claims missing from (or malformed in) the
+    batch response fall back to individual `gemini_rate_claim` calls; if the request
+    itself fails twice, every claim in it comes back Unclear with an error marker.
+    """
+    if not items:
+        return []
+    if not is_configured():
+        audit(report_id, "gemini_skipped", {"reason": "GEMINI not configured", "claims": len(items)})
+        return [dict(_UNCLEAR) for _ in items]
+
+    keys = [reasoning_cache_key(claim, evidence) for claim, evidence in items]
+    results: dict[int, dict[str, Any]] = {}
+    for i, ((_, evidence), key) in enumerate(zip(items, keys)):
+        cached = _cached_verdict(report_id, key, len(evidence))
+        if cached is not None:
+            results[i] = cached
+
+    pending = [i for i in range(len(items)) if i not in results]
+    if len(pending) == 1:
+        i = pending[0]
+        results[i] = _rate_claim_uncached(report_id, items[i][0], items[i][1], usage, keys[i])
+    elif pending:
+        batch = [items[i] for i in pending]
+        prompt = build_batch_reasoning_prompt(batch)
+        audit(
+            report_id,
+            "gemini_batch_call",
+            {
+                "model": settings.gemini_model,
+                "claims": len(batch),
+                "evidence_count": sum(len(ev) for _, ev in batch),
+            },
+        )
+
+        # A failed request is retried once as a batch; only a response with missing or
+        # malformed entries falls back to per-claim calls.
+        parsed: dict[int, dict[str, Any]] | None = None
+        error: Exception | None = None
+        for _ in range(2):
+            try:
+                parsed = _parse_batch(_generate(prompt, min(8192, 900 * len(batch)), usage), len(batch))
+                break
+            except RateLimitExceeded as e:
+                audit(report_id, "gemini_rate_limited", {"error": str(e), "batch": len(batch)})
+                raise
+            except Exception as e:
+                audit(report_id, "gemini_failed", {"error": str(e), "batch": len(batch)})
+                error = e
+
+        if parsed is None:
+            for i in pending:
+                results[i] = _failed(error)
+        else:
+            for n, result in parsed.items():
+                results[pending[n - 1]] = result
+                _remember_verdict(keys[pending[n - 1]], result)
+
+            missing = [n for n in range(1, len(batch) + 1) if n not in parsed]
+            if missing:
+                audit(report_id, "gemini_batch_fallback", {"claims": len(batch), "missing": missing})
+                for n in missing:
+                    i = pending[n - 1]
+                    results[i] = _rate_claim_uncached(report_id, items[i][0], items[i][1], usage, keys[i])
+
+    return [results[i] for i in range(len(items))]
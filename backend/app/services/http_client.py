@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+import httpx
+
+from app.config import settings
+
+
+# One pooled client per outbound provider, shared by every report in the process.
+# Keeping them separate gives each upstream host its own connection limits.
+_clients: dict[str, httpx.Client] = {}
+_handshakes: dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def _make_tracer(name: str):
+    def _trace(event_name: str, info: dict) -> None:
+        # Fires once per new TCP connection; reused keep-alive connections don't trigger it.
+        if event_name == "connection.connect_tcp.complete":
+            with _lock:
+                _handshakes[name] = _handshakes.get(name, 0) + 1
+
+    return _trace
+
+
+def _build_client(name: str, timeout: float | None) -> httpx.Client:
+    tracer = _make_tracer(name)
+
+    def _on_request(request: httpx.Request) -> None:
+        request.extensions["trace"] = tracer
+
+    limits = httpx.Limits(
+        max_connections=max(1, int(settings.truecheck_http_max_connections)),
+        max_keepalive_connections=max(0, int(settings.truecheck_http_max_keepalive_connections)),
+        keepalive_expiry=float(settings.truecheck_http_keepalive_expiry_seconds),
+    )
+    return httpx.Client(
+        timeout=timeout if timeout is not None else float(settings.truecheck_http_timeout_seconds),
+        limits=limits,
+        http2=bool(settings.truecheck_http2) and _http2_available(),
+        event_hooks={"request": [_on_request]},
+    )
+
+
+def get_client(name: str, timeout: float | None = None) -> httpx.Client:
+    """Return the process-wide pooled client for provider `name` (e.g. "google", "gdelt").
+
+    The client is created on first use; `timeout` only applies at creation time.
+    httpx clients are thread-safe, so the concurrent retrieval stage can share them.
+    """
+    client = _clients.get(name)
+    if client is not None and not client.is_closed:
+        return client
+    with _lock:
+        client = _clients.get(name)
+        if client is None or client.is_closed:
+            client = _build_client(name, timeout)
+            _clients[name] = client
+        return client
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """Connection reuse stats per provider client: open/idle connections and TCP handshakes."""
+    stats: dict[str, dict[str, Any]] = {}
+    for name, client in list(_clients.items()):
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        conns = list(getattr(pool, "connections", []) or [])
+        stats[name] = {
+            "open": sum(1 for c in conns if not c.is_closed()),
+            "idle": sum(1 for c in conns if c.is_idle()),
+            "handshakes": _handshakes.get(name, 0),
+            "closed": client.is_closed,
+        }
+    return stats
+
+
+def close_clients() -> None:
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+
+
+def _reset_after_fork() -> None:
+    # Sockets must not be shared with a forked child (e.g. RQ's per-job work horse).
+    global _lock
+    _clients.clear()
+    _handshakes.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
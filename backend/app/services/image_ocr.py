@@ -1,24 +1,229 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
 from pathlib import Path
+from typing import Any
 
+from app.config import settings
 from app.services.audit import audit
 
 
+def load_ocr() -> float:
+    """Import the OCR bindings and probe the Tesseract binary; returns elapsed ms.
+
+    Raises if `pytesseract`/Pillow or the Tesseract install are missing.
+    """
+    started = time.perf_counter()
+    from PIL import Image  # noqa: F401
+    import pytesseract
+
+    pytesseract.get_tesseract_version()
+    return (time.perf_counter() - started) * 1000
+
+
+# Tesseract is tuned for ~300 DPI text (capital letters ~20-30px tall). Screenshots are
+# usually far larger than needed, so we cap the long side; tiny crops get upscaled.
+_MIN_LONG_SIDE = 1000
+_CROP_MARGIN = 16
+
+
+def _otsu_threshold(histogram: list[int]) -> int:
+    total = sum(histogram)
+    sum_all = sum(i * h for i, h in enumerate(histogram))
+    sum_bg = weight_bg = 0
+    best, best_var = 127, -1.0
+    for t, h in enumerate(histogram):
+        weight_bg += h
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        sum_bg += t * h
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        var = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if var > best_var:
+            best, best_var = t, var
+    return best
+
+
+def preprocess_image(img: Any) -> Any:
+    """Grayscale -> resize to an OCR-friendly scale -> Otsu binarization -> crop to the text region."""
+    from PIL import Image, ImageOps
+
+    img = ImageOps.exif_transpose(img).convert("L")
+
+    long_side = max(img.size)
+    max_side = max(_MIN_LONG_SIDE, int(settings.truecheck_ocr_max_side))
+    if long_side > max_side:
+        scale = max_side / long_side
+    elif long_side < _MIN_LONG_SIDE:
+        scale = min(3.0, _MIN_LONG_SIDE / long_side)
+    else:
+        scale = 1.0
+    if scale != 1.0:
+        img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), resample=Image.Resampling.LANCZOS)
+
+    img = ImageOps.autocontrast(img)
+    threshold = _otsu_threshold(img.histogram())
+    img = img.point([255 if p > threshold else 0 for p in range(256)])
+
+    # Dark text on light background is what Tesseract expects; flip dark-mode screenshots.
+    hist = img.histogram()
+    if hist[0] > hist[255]:
+        img = ImageOps.invert(img)
+
+    bbox = ImageOps.invert(img).getbbox()
+    if bbox:
+        left, top, right, bottom = bbox
+        img = img.crop(
+            (
+                max(0, left - _CROP_MARGIN),
+                max(0, top - _CROP_MARGIN),
+                min(img.width, right + _CROP_MARGIN),
+                min(img.height, bottom + _CROP_MARGIN),
+            )
+        )
+    return img
+
+
+def run_ocr(path: str, preprocess: bool = True, timeout: float = 0) -> tuple[str, dict]:
+    """OCR one image file; returns `(text, timings)`. Runs in the pool workers or inline."""
+    from PIL import Image
+    import pytesseract
+
+    started = time.perf_counter()
+    with Image.open(Path(path)) as src:
+        size = src.size
+        img = preprocess_image(src) if preprocess else src.copy()
+    prep_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    text = pytesseract.image_to_string(img, timeout=timeout) or ""
+    tesseract_ms = (time.perf_counter() - started) * 1000
+    return text, {
+        "size": list(size),
+        "ocr_size": list(img.size),
+        "preprocess_ms": round(prep_ms, 1),
+        "tesseract_ms": round(tesseract_ms, 1),
+    }
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+# Unfinished futures per pool, so retiring a pool can let other callers' jobs finish first.
+_inflight: dict[ProcessPoolExecutor, set[Future]] = {}
+
+
+def _current_pool() -> ProcessPoolExecutor:
+    # Caller holds _pool_lock.
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=int(settings.truecheck_ocr_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _inflight[_pool] = set()
+    return _pool
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    with _pool_lock:
+        return _current_pool()
+
+
+def _submit(fn: Any, *args: Any) -> tuple[ProcessPoolExecutor, Future]:
+    with _pool_lock:
+        pool = _current_pool()
+        future = pool.submit(fn, *args)
+        pending = _inflight[pool]
+        pending.add(future)
+    future.add_done_callback(pending.discard)
+    return pool, future
+
+
+def _retire_pool(pool: ProcessPoolExecutor, stuck: Future, grace: float | None) -> None:
+    """Swap out a pool whose worker is stuck past its deadline, without failing anyone else.
+
+    New jobs go to a fresh pool at once. Other callers' jobs already on the old pool run to
+    completion (or their own deadline); then its remaining processes, the stuck one included,
+    are killed, since a running pool task can't be cancelled and `shutdown` won't stop it.
+    """
+    global _pool
+    with _pool_lock:
+        if pool not in _inflight:
+            return  # already being retired for another stuck job
+        if _pool is pool:
+            _pool = None
+        others = [f for f in _inflight.pop(pool) if f is not stuck]
+
+    def reap() -> None:
+        wait(others, timeout=grace)
+        # ProcessPoolExecutor has no public handle on its workers.
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        for proc in processes:
+            if proc.is_alive():
+                proc.kill()
+        for proc in processes:
+            proc.join(timeout=5)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    threading.Thread(target=reap, name="ocr-retire", daemon=True).start()
+
+
+def warm_pool() -> None:
+    """Start the OCR worker processes now rather than on the first image."""
+    workers = int(settings.truecheck_ocr_workers)
+    if workers > 0:
+        pool = _get_pool()
+        for f in [pool.submit(load_ocr) for _ in range(workers)]:
+            f.result()
+
+
 def ocr_image(report_id: str, path: str) -> str:
     """Optional OCR.
 
     Requires `pytesseract` and a local Tesseract install.
     If unavailable, returns empty string and records a limitation.
     """
+    timeout = max(0.0, float(settings.truecheck_ocr_timeout_seconds))
+    preprocess = bool(settings.truecheck_ocr_preprocess)
     try:
-        from PIL import Image
-        import pytesseract
-
-        img = Image.open(Path(path))
-        text = pytesseract.image_to_string(img)
-        audit(report_id, "ocr", {"chars": len(text or "")})
-        return text or ""
+        started = time.perf_counter()
+        if int(settings.truecheck_ocr_workers) > 0:
+            # Tesseract itself is killed at `timeout`; the extra slack covers load + preprocessing.
+            deadline = (timeout + 10) if timeout else None
+            pool, future = _submit(run_ocr, path, preprocess, timeout)
+            try:
+                text, timings = future.result(timeout=deadline)
+            except FutureTimeout:
+                if not future.cancel():
+                    _retire_pool(pool, future, deadline)
+                raise TimeoutError(f"OCR exceeded {timeout:.0f}s")
+        else:
+            text, timings = run_ocr(path, preprocess, timeout)
+        audit(
+            report_id,
+            "ocr",
+            {"chars": len(text), "ocr_ms": round((time.perf_counter() - started) * 1000, 1), **timings},
+        )
+        return text
     except Exception as e:
         audit(report_id, "ocr_failed", {"error": str(e)})
         return ""
+
+
+def _reset_after_fork() -> None:
+    global _pool, _pool_lock, _inflight
+    _pool = None
+    _pool_lock = threading.Lock()
+    _inflight = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import queue
+import threading
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import delete, update
+
+from app.config import settings
+from app.db import get_session
+from app.models import LocalJobLease, Report, ReportStatus
+from app.services.audit import audit
+from app.services.redis_conn import get_redis
+
+
+# In-process fallback when jobs can't go to the RQ queue (Redis down or `truecheck_use_queue=0`).
+# A fixed set of threads drains a bounded queue, so a burst of uploads can't start an
+# unbounded number of pipelines inside the API process; when the queue is full the API
+# answers 503 with Retry-After instead. Each job holds a `LocalJobLease` row while it runs.
+
+log = logging.getLogger("truecheck.local_executor")
+
+_LOCAL_EVENT = "local_submit"
+
+
+def _new_instance_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+# Lease owner name for jobs run by this process.
+_instance = _new_instance_id()
+_heartbeat: threading.Thread | None = None
+# Recovered jobs (job_id -> is_batch) leased by this process but not yet accepted by the executor.
+_awaiting: dict[str, bool] = {}
+
+
+class LocalExecutor:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_pending)
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._in_flight = 0
+        self._counters = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._job_seconds = 0.0
+
+    def _ensure_threads(self) -> None:
+        if len(self._threads) == self.workers and all(t.is_alive() for t in self._threads):
+            return
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                t = threading.Thread(target=self._loop, name=f"local-job-{len(self._threads)}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _loop(self) -> None:
+        while True:
+            fn, args = self._queue.get()
+            with self._lock:
+                self._in_flight += 1
+            started = time.perf_counter()
+            ok = True
+            try:
+                fn(*args)
+            except Exception:
+                # run_pipeline records its own failures; this only guards the thread.
+                ok = False
+                log.exception("local job %s failed", getattr(fn, "__name__", fn))
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._counters["completed" if ok else "failed"] += 1
+                    self._job_seconds += time.perf_counter() - started
+                self._queue.task_done()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, block: bool = False) -> bool:
+        """Queue `fn(*args)`; False when the pending queue is full (only without `block`)."""
+        self._ensure_threads()
+        try:
+            self._queue.put((fn, args), block=block)
+        except queue.Full:
+            with self._lock:
+                self._counters["rejected"] += 1
+            return False
+        with self._lock:
+            self._counters["submitted"] += 1
+        return True
+
+    def admit(self) -> bool:
+        """Cheap pre-check before accepting new work; counts a rejection when full."""
+        if not self._queue.full():
+            return True
+        with self._lock:
+            self._counters["rejected"] += 1
+        return False
+
+    def retry_after(self) -> int:
+        """Seconds until a pending slot is likely free, from the average job time so far."""
+        with self._lock:
+            done = self._counters["completed"] + self._counters["failed"]
+            avg = self._job_seconds / done if done else 0.0
+        if not avg:
+            return max(1, int(settings.truecheck_local_retry_after_seconds))
+        backlog = self._queue.qsize() + self._in_flight
+        return min(300, max(1, math.ceil(avg * backlog / self.workers)))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            done = self._counters["completed"] + self._counters["failed"]
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._queue.qsize(),
+                "in_flight": self._in_flight,
+                **self._counters,
+                "avg_job_ms": round(self._job_seconds / done * 1000, 1) if done else None,
+            }
+
+
+_executor: LocalExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> LocalExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = LocalExecutor(
+                    int(settings.truecheck_local_workers), int(settings.truecheck_local_max_pending)
+                )
+    return _executor
+
+
+def runs_locally() -> bool:
+    """Whether new jobs will most likely land on the local executor rather than RQ."""
+    return not settings.truecheck_use_queue or get_redis() is None
+
+
+def run_batch_local(batch_id: str, report_ids: list[str]) -> None:
+    from app.services.pipeline import run_batch_pipeline, run_pipeline
+
+    if settings.truecheck_batch_pipeline:
+        size = max(1, int(settings.truecheck_batch_chunk_size))
+        for i in range(0, len(report_ids), size):
+            run_batch_pipeline(batch_id, report_ids[i : i + size])
+    else:
+        for report_id in report_ids:
+            run_pipeline(report_id)
+
+
+def _lease_seconds() -> int:
+    return max(5, int(settings.truecheck_local_lease_seconds))
+
+
+def _take_lease(job_id: str, is_batch: bool) -> None:
+    # Written synchronously (not through the buffered audit log) so recovery can rely on it.
+    with get_session() as session:
+        session.merge(LocalJobLease(job_id=job_id, is_batch=is_batch, owner=_instance, heartbeat_at=datetime.utcnow()))
+        session.commit()
+
+
+def _release_lease(job_id: str) -> None:
+    try:
+        with get_session() as session:
+            session.execute(
+                delete(LocalJobLease).where(LocalJobLease.job_id == job_id, LocalJobLease.owner == _instance)
+            )
+            session.commit()
+    except Exception:
+        # A leftover lease only means recovery looks at the job again and finds it finished.
+        log.exception("releasing local job lease %s failed", job_id)
+
+
+def _run_leased(job_id: str, fn: Callable[..., Any], *args: Any) -> None:
+    try:
+        fn(*args)
+    finally:
+        _release_lease(job_id)
+
+
+def submit_report(report_id: str, block: bool = False, leased: bool = False) -> bool:
+    """Run a report on the local executor; False when it is full.
+
+    `leased` means the caller already holds the job's lease and keeps it if the submit fails.
+    """
+    from app.services.pipeline import run_pipeline
+
+    if not leased:
+        _take_lease(report_id, is_batch=False)
+    if not get_executor().submit(_run_leased, report_id, run_pipeline, report_id, block=block):
+        if not leased:
+            _release_lease(report_id)
+            audit(report_id, "local_rejected", get_executor().stats())
+        return False
+    audit(report_id, _LOCAL_EVENT, {})
+    _ensure_heartbeat()
+    return True
+
+
+def submit_batch(batch_id: str, report_ids: list[str], block: bool = False, leased: bool = False) -> bool:
+    if not leased:
+        _take_lease(batch_id, is_batch=True)
+    if not get_executor().submit(_run_leased, batch_id, run_batch_local, batch_id, report_ids, block=block):
+        if not leased:
+            _release_lease(batch_id)
+            audit(batch_id, "local_rejected", get_executor().stats())
+        return False
+    audit(batch_id, _LOCAL_EVENT, {"reports": len(report_ids)})
+    _ensure_heartbeat()
+    return True
+
+
+def executor_stats() -> dict[str, Any]:
+    return get_executor().stats()
+
+
+def _claim_lease(job_id: str, cutoff: datetime) -> bool:
+    """Take over a stale lease; only one process can win the conditional update."""
+    with get_session() as session:
+        result = session.execute(
+            update(LocalJobLease)
+            .where(LocalJobLease.job_id == job_id, LocalJobLease.heartbeat_at < cutoff)
+            .values(owner=_instance, heartbeat_at=datetime.utcnow())
+        )
+        session.commit()
+    return result.rowcount == 1
+
+
+def _resubmit(job_id: str, is_batch: bool) -> bool:
+    """Queue a job whose lease this process holds; False (lease kept) while the executor is full."""
+    with get_session() as session:
+        unfinished = session.query(Report.id).filter(
+            Report.status.in_([ReportStatus.queued, ReportStatus.running]),
+            Report.batch_id == job_id if is_batch else Report.id == job_id,
+        )
+        report_ids = [r for (r,) in unfinished.order_by(Report.created_at)]
+    if not report_ids:
+        _release_lease(job_id)
+        return True
+    if is_batch:
+        ok = submit_batch(job_id, report_ids, leased=True)
+    else:
+        ok = submit_report(job_id, leased=True)
+    if ok:
+        audit(job_id, "local_recovered", {"reports": len(report_ids)} if is_batch else {})
+    return ok
+
+
+def recover_local_jobs() -> int:
+    """Re-run local jobs whose owning process stopped heartbeating.
+
+    Each stale lease is claimed with a conditional update first, so with several API processes
+    or replicas exactly one of them re-runs it, and never while the owner is still alive. A
+    report left `running` by the dead owner restarts from scratch; its results were never
+    committed, since they are persisted in one transaction at the end.
+
+    Never blocks: runs on the heartbeat thread, which must keep our leases fresh. A claimed
+    job that finds the executor full stays leased (and heartbeated) by this process and is
+    submitted on a later pass; no new leases are claimed until it is.
+    """
+    recovered = 0
+    for job_id, is_batch in list(_awaiting.items()):
+        if not _resubmit(job_id, is_batch):
+            return recovered
+        del _awaiting[job_id]
+        recovered += 1
+
+    cutoff = datetime.utcnow() - timedelta(seconds=_lease_seconds())
+    with get_session() as session:
+        stale = session.query(LocalJobLease.job_id, LocalJobLease.is_batch).filter(LocalJobLease.heartbeat_at < cutoff).all()
+
+    for job_id, is_batch in stale:
+        if not _claim_lease(job_id, cutoff):
+            continue
+        if not _resubmit(job_id, is_batch):
+            _awaiting[job_id] = is_batch
+            break
+        recovered += 1
+    if recovered:
+        log.info("recovered %d local jobs", recovered)
+    return recovered
+
+
+def _heartbeat_loop() -> None:
+    while True:
+        try:
+            with get_session() as session:
+                session.execute(
+                    update(LocalJobLease)
+                    .where(LocalJobLease.owner == _instance)
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+                session.commit()
+            if settings.truecheck_local_recover:
+                recover_local_jobs()
+        except Exception:
+            log.exception("local job heartbeat failed")
+        time.sleep(_lease_seconds() / 3)
+
+
+def _ensure_heartbeat() -> None:
+    global _heartbeat
+    if _heartbeat is not None and _heartbeat.is_alive():
+        return
+    with _executor_lock:
+        if _heartbeat is None or not _heartbeat.is_alive():
+            _heartbeat = threading.Thread(target=_heartbeat_loop, name="local-heartbeat", daemon=True)
+            _heartbeat.start()
+
+
+def start_recovery() -> None:
+    """Start heartbeating; with `truecheck_local_recover` it also picks up jobs of dead processes."""
+    _ensure_heartbeat()
+
+
+def _reset_after_fork() -> None:
+    global _executor, _executor_lock, _heartbeat, _instance
+    _executor = None
+    _executor_lock = threading.Lock()
+    _heartbeat = None
+    _awaiting.clear()
+    _instance = _new_instance_id()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
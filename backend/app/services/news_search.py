@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
-
 from app.services.audit import audit
-from app.services.cache import cache_get, cache_put
+from app.services.cache import cached_search
+from app.services.http_client import get_client
+from app.services.rate_limit import limited_request
 from app.services.safety import sanitize_untrusted_text
 
 
@@ -18,12 +18,16 @@ def search_gdelt(report_id: str, query: str, num: int = 5) -> list[dict[str, Any
     This is additive evidence and should be treated as neutral unless domain is trusted.
     """
 
-    cache_key = f"q={query}|n={min(max(num, 1), 50)}"
-    cached = cache_get("gdelt", cache_key)
-    if cached is not None:
-        audit(report_id, "gdelt_cache_hit", {"query": query})
-        return cached
+    n = min(max(num, 1), 50)
+    try:
+        return cached_search(report_id, "gdelt", query, n, lambda: _fetch_gdelt(report_id, query, num))
+    except Exception as e:
+        # Failures are not cached; the next report retries GDELT.
+        audit(report_id, "gdelt_failed", {"error": str(e)})
+        return []
+
 
+def _fetch_gdelt(report_id: str, query: str, num: int) -> list[dict[str, Any]]:
     params = {
         "query": query,
         "mode": "ArtList",
@@ -34,27 +38,20 @@ def search_gdelt(report_id: str, query: str, num: int = 5) -> list[dict[str, Any
 
     audit(report_id, "gdelt_search", {"query": query, "num": params["maxrecords"]})
 
-    try:
-        with httpx.Client(timeout=20) as client:
-            resp = client.get(GDELT_DOC_ENDPOINT, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-        arts = data.get("articles") or []
-        results: list[dict[str, Any]] = []
-        for a in arts:
-            results.append(
-                {
-                    "url": a.get("url"),
-                    "title": sanitize_untrusted_text(a.get("title") or "", 500),
-                    "snippet": sanitize_untrusted_text(a.get("seendate") or "", 120),
-                    "publisher": sanitize_untrusted_text(a.get("sourceCountry") or "", 120) or None,
-                    "published_date": a.get("seendate"),
-                }
-            )
-
-        cache_put("gdelt", cache_key, results)
-        return results
-    except Exception as e:
-        audit(report_id, "gdelt_failed", {"error": str(e)})
-        return []
+    resp = limited_request("gdelt", lambda: get_client("gdelt").get(GDELT_DOC_ENDPOINT, params=params))
+    resp.raise_for_status()
+    data = resp.json()
+
+    arts = data.get("articles") or []
+    results: list[dict[str, Any]] = []
+    for a in arts:
+        results.append(
+            {
+                "url": a.get("url"),
+                "title": sanitize_untrusted_text(a.get("title") or "", 500),
+                "snippet": sanitize_untrusted_text(a.get("seendate") or "", 120),
+                "publisher": sanitize_untrusted_text(a.get("sourceCountry") or "", 120) or None,
+                "published_date": a.get("seendate"),
+            }
+        )
+    return results
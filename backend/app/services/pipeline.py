@@ -1,72 +1,424 @@
 from __future__ import annotations
 
 import json
+import logging
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from dateutil import parser as dtparser
 
-from app.db import get_session
+from sqlalchemy import insert, select, update
+
+from app.db import engine, get_session
 from app.config import settings
 from app.models import (
+    AuditEvent,
     Claim,
     EvidenceItem,
     InputType,
     OriginTrace,
     Report,
     ReportStatus,
-    Verdict,
 )
-from app.services.audit import audit
-from app.services.audio_transcribe import transcribe_audio
+from app.services.audit import audit, flush_audit_quietly
+from app.services.audio_transcribe import transcribe_audio_stream
+from app.services.cache import cache_stats
 from app.services.claim_extractor import extract_claims
+from app.services.content_store import record_completed
 from app.services.credibility import label_credibility
-from app.services.gemini_reasoner import gemini_rate_claim
+from app.services.dates import parse_date
+from app.services.events import publish_event
+from app.services.gemini_reasoner import GeminiUsage, gemini_rate_claim, gemini_rate_claims, reasoning_cache_key
+from app.services.http_client import pool_stats
 from app.services.image_ocr import ocr_image
 from app.services.news_search import search_gdelt
-from app.services.scoring import EvidenceSignal, compute_claim_confidence
+from app.services.reports import materialize_report
+from app.services.scoring import EvidenceSignal, compute_claim_confidence, overall_verdict
 from app.services.web_search import is_configured as google_is_configured
 from app.services.web_search import search_images, search_web
 
+log = logging.getLogger("truecheck.pipeline")
+
+# Audit events that mean the report was built from partial evidence or reasoning.
+_DEGRADED_EVENTS = ("gemini_failed", "gdelt_failed")
 
 def run_pipeline(report_id: str) -> None:
     """Main analysis pipeline. Runs in worker or background task."""
+    if not _mark_running([report_id]):
+        return
+
+    try:
+        degraded = _run(report_id)
+        _mark_complete(report_id, degraded)
+    except Exception as e:
+        _mark_failed(report_id, e)
+    finally:
+        flush_audit_quietly()
+
+
+def run_batch_pipeline(batch_id: str, report_ids: list[str]) -> None:
+    """Run a batch of reports together so claims they share are searched and rated once.
+
+    Searches go through one shared retrieval pool (deduplicated by claim text) and all
+    (claim, evidence) pairs go to the reasoner in one pass, deduplicated by the reasoning
+    cache key. Each report still gets its own rows, verdict and status; a failure in one
+    report doesn't fail the others.
+    """
+    found = _mark_running(report_ids)
+    if not found:
+        return
+    with get_session() as session:
+        reports = {r.id: r for r in session.query(Report).filter(Report.id.in_(found)).all()}
+
+    done: set[str] = set()
+    try:
+        works: list[_Work] = []
+        with _Retrieval(batch_id) as retrieval:
+            for report_id in found:
+                try:
+                    works.append(_extract(reports[report_id], retrieval))
+                except Exception as e:
+                    _mark_failed(report_id, e)
+                    done.add(report_id)
+            ready: list[_Work] = []
+            for work in works:
+                try:
+                    _gather_evidence(work, retrieval)
+                    ready.append(work)
+                except Exception as e:
+                    _mark_failed(work.report.id, e)
+                    done.add(work.report.id)
+
+        owner: dict[str, str] = {}
+        index: dict[str, int] = {}
+        items: list[tuple[str, list[dict]]] = []
+        slots: list[list[int]] = []
+        for work in ready:
+            row = []
+            for claim_text, evidence, _ in work.prepared:
+                owner.setdefault(claim_text, work.report.id)
+                key = reasoning_cache_key(claim_text, evidence)
+                if key not in index:
+                    index[key] = len(items)
+                    items.append((claim_text, evidence))
+                row.append(index[key])
+            slots.append(row)
+
+        reasoned = _reason_claims(batch_id, items)
+        audit(batch_id, "batch_pooled", {"reports": len(found), "claims": sum(map(len, slots)), "unique_claims": len(items)})
+
+        for work, row in zip(ready, slots):
+            report_id = work.report.id
+            try:
+                audit(
+                    report_id,
+                    "batch",
+                    {
+                        "batch_id": batch_id,
+                        "claims": len(work.claims),
+                        "shared_claims": sum(1 for c in work.claims if owner.get(c, report_id) != report_id),
+                    },
+                )
+                _finish(work, [reasoned[i] for i in row])
+                _mark_complete(report_id, work.degraded)
+            except Exception as e:
+                _mark_failed(report_id, e)
+            done.add(report_id)
+    except Exception as e:
+        for report_id in found:
+            if report_id not in done:
+                _mark_failed(report_id, e)
+    finally:
+        flush_audit_quietly()
+
+
+def _mark_running(report_ids: list[str]) -> list[str]:
+    """Flip queued reports to running; returns the ids that exist."""
+    with engine.begin() as conn:
+        found = list(conn.execute(select(Report.id).where(Report.id.in_(report_ids))).scalars())
+        if found:
+            conn.execute(
+                update(Report)
+                .where(Report.id.in_(found))
+                .values(status=ReportStatus.running, updated_at=datetime.utcnow())
+            )
+    for report_id in found:
+        publish_event(report_id, "running", {"status": ReportStatus.running.value})
+    return found
+
+
+def _mark_complete(report_id: str, degraded: bool = False) -> None:
+    # Readers treat status=complete as "all report data visible", limitations included.
+    # If the flush fails the rows stay buffered; the result is then not indexed for reuse.
+    if not flush_audit_quietly():
+        degraded = True
+    summary: dict = {"status": ReportStatus.complete.value}
+    content_hash = None
     with get_session() as session:
         report = session.get(Report, report_id)
-        if not report:
-            return
-        report.status = ReportStatus.running
-        report.updated_at = datetime.utcnow()
-        session.add(report)
-        session.commit()
+        if report:
+            report.status = ReportStatus.complete
+            report.updated_at = datetime.utcnow()
+            session.add(report)
+            session.commit()
+            summary.update(
+                verdict=(report.verdict.value if report.verdict else None),
+                confidence=report.confidence,
+            )
+            content_hash = report.content_hash
+
+    # The report is complete from here on; nothing below may turn it into a failure.
+    try:
+        _index_content(report_id, content_hash, degraded)
+        audit(report_id, "complete", {"http_pool": pool_stats(), "search_cache": cache_stats()})
+        flush_audit_quietly()
+        _materialize(report_id)
+        publish_event(report_id, "complete", summary)
+    except Exception:
+        log.exception("bookkeeping after completing report %s failed", report_id)
+
 
+def _index_content(report_id: str, content_hash: str | None, degraded: bool) -> None:
+    """Let resubmissions of this content reuse the report, unless it was built from partial results."""
+    if not content_hash or degraded or _recorded_failures(report_id):
+        return
     try:
-        _run(report_id)
-        with get_session() as session:
-            report = session.get(Report, report_id)
-            if report:
-                report.status = ReportStatus.complete
-                report.updated_at = datetime.utcnow()
-                session.add(report)
-                session.commit()
-        audit(report_id, "complete", {})
+        record_completed(report_id, content_hash)
     except Exception as e:
-        with get_session() as session:
-            report = session.get(Report, report_id)
-            if report:
-                report.status = ReportStatus.failed
-                report.error_message = str(e)
-                report.updated_at = datetime.utcnow()
-                session.add(report)
-                session.commit()
-        audit(report_id, "failed", {"error": str(e)})
-
-
-def _run(report_id: str) -> None:
+        audit(report_id, "content_index_failed", {"error": str(e)})
+
+
+def _recorded_failures(report_id: str) -> bool:
+    # Events were flushed before the status commit, so the table has the whole run.
+    with get_session() as session:
+        row = (
+            session.query(AuditEvent.id)
+            .filter(AuditEvent.report_id == report_id, AuditEvent.event_type.in_(_DEGRADED_EVENTS))
+            .first()
+        )
+    return row is not None
+
+
+def _mark_failed(report_id: str, e: Exception) -> None:
+    with get_session() as session:
+        report = session.get(Report, report_id)
+        if report:
+            report.status = ReportStatus.failed
+            report.error_message = str(e)
+            report.updated_at = datetime.utcnow()
+            session.add(report)
+            session.commit()
+    audit(report_id, "failed", {"error": str(e)})
+    flush_audit_quietly()
+    _materialize(report_id)
+    publish_event(report_id, "failed", {"status": ReportStatus.failed.value, "error": str(e)})
+
+
+def _materialize(report_id: str) -> None:
+    # GET falls back to materializing lazily, so a failure here only costs one rebuild later.
+    try:
+        materialize_report(report_id)
+    except Exception as e:
+        audit(report_id, "report_materialize_failed", {"error": str(e)})
+        flush_audit_quietly()
+
+
+class _Retrieval:
+    """Claim x provider searches on a bounded thread pool, submitted as claims become known.
+
+    Submitting the same claim twice is a no-op, so claims found early (e.g. from the first
+    transcript chunks) are reused when the final claim list is collected.
+    """
+
+    def __init__(self, report_id: str) -> None:
+        self.report_id = report_id
+        self._per_claim_images = max(0, int(settings.truecheck_max_image_matches_per_claim))
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(settings.truecheck_retrieval_concurrency)),
+            thread_name_prefix="retrieve",
+        )
+        self._futures: dict[str, tuple[Future, Future, Future]] = {}
+
+    def __enter__(self) -> "_Retrieval":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # Searches for claims that didn't make the final list are dropped if not yet started.
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, claim: str, report_id: str | None = None) -> bool:
+        """Start searches for `claim` (audited under `report_id`); False if already submitted."""
+        if claim in self._futures:
+            return False
+        rid = report_id or self.report_id
+        self._futures[claim] = (
+            self._pool.submit(search_web, rid, claim, num=6),
+            self._pool.submit(search_gdelt, rid, claim, num=6),
+            self._pool.submit(search_images, rid, claim, num=self._per_claim_images),
+        )
+        return True
+
+    def submit_images(self, query: str, report_id: str | None = None) -> Future:
+        return self._pool.submit(search_images, report_id or self.report_id, query, num=6)
+
+    def collect(self, claims: list[str], report_id: str | None = None) -> list[tuple[list[dict], list[dict], list[dict]]]:
+        """Wait for each claim's searches; progress goes to `report_id` (the owning report in a batch)."""
+        rid = report_id or self.report_id
+        for c in claims:
+            self.submit(c, rid)
+        retrieved = []
+        for idx, c in enumerate(claims):
+            w, g, i = self._futures[c]
+            results = (w.result(), g.result(), i.result())
+            retrieved.append(results)
+            publish_event(
+                rid,
+                "evidence_ready",
+                {"index": idx, "claim": c, "web": len(results[0]), "gdelt": len(results[1]), "images": len(results[2])},
+            )
+        return retrieved
+
+
+def _retrieve_evidence(
+    report_id: str,
+    claims: list[str],
+    img_query: str | None = None,
+    retrieval: _Retrieval | None = None,
+) -> tuple[list[tuple[list[dict], list[dict], list[dict]]], list[dict]]:
+    """Fan out every claim x provider search onto a bounded thread pool.
+
+    Returns `(web, gdelt, images)` per claim in claim order, plus the report-level
+    image matches for `img_query`. Provider exceptions propagate exactly as they did
+    when the calls ran inline. Pass `retrieval` to reuse searches already submitted.
+    """
+    if retrieval is None:
+        with _Retrieval(report_id) as own:
+            return _retrieve_evidence(report_id, claims, img_query, own)
+
+    for c in claims:
+        retrieval.submit(c, report_id)
+    img_future = retrieval.submit_images(img_query, report_id) if img_query else None
+    retrieved = retrieval.collect(claims, report_id)
+    img_results = img_future.result() if img_future else []
+    return retrieved, img_results
+
+
+_MAX_CLAIMS = 6
+_SENTENCE_END_RE = re.compile(r"(?s)^.*[.!?](?=\s|$)")
+
+
+def _transcribe_with_prefetch(report_id: str, path: str, retrieval: _Retrieval) -> str:
+    """Consume the transcript stream, starting searches for claims in completed sentences.
+
+    Claims are picked in order of appearance, so the claims of a complete-sentence prefix
+    are a prefix of the final claim list; once `max_claims` are known nothing later can
+    change them. Only sentences completed since the last segment are extracted; `pending`
+    holds the unfinished tail, so the work stays linear in the transcript length.
+    """
+    parts: list[str] = []
+    pending = ""
+    seen: set[str] = set()
+    prefetched: list[str] = []
+    for text in transcribe_audio_stream(report_id, path):
+        parts.append(text)
+        if len(prefetched) >= _MAX_CLAIMS:
+            continue
+        # Segments are joined with a space, so a sentence end at a segment end is final.
+        pending = f"{pending} {text}" if pending else text
+        m = _SENTENCE_END_RE.match(pending)
+        if not m:
+            continue
+        completed, pending = m.group(0), pending[m.end() :].lstrip()
+        for claim in extract_claims(completed, max_claims=_MAX_CLAIMS, fallback=False):
+            # extract_claims dedupes case-insensitively within a call; keep that across calls.
+            key = claim.lower()
+            if key in seen or len(prefetched) >= _MAX_CLAIMS:
+                continue
+            seen.add(key)
+            prefetched.append(claim)
+            retrieval.submit(claim)
+    if prefetched:
+        audit(report_id, "claims_prefetched", {"count": len(prefetched)})
+    return " ".join(parts)
+
+
+def _reason_claims(report_id: str, items: list[tuple[str, list[dict]]]) -> list[dict]:
+    """Rate each (claim, evidence) pair with Gemini, preserving order.
+
+    In batch mode claims are grouped into `truecheck_gemini_batch_size` chunks, one
+    request per chunk; otherwise one request per claim. Either way requests run
+    concurrently and per-report token/latency totals land in the audit trail.
+    """
+    if not items:
+        return []
+
+    usage = GeminiUsage()
+    started = time.perf_counter()
+    workers = max(1, int(settings.truecheck_retrieval_concurrency))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reason") as pool:
+        if settings.truecheck_gemini_batch:
+            size = max(1, int(settings.truecheck_gemini_batch_size))
+            chunks = [items[i : i + size] for i in range(0, len(items), size)]
+            results = [r for chunk in pool.map(lambda ch: gemini_rate_claims(report_id, ch, usage), chunks) for r in chunk]
+        else:
+            results = list(pool.map(lambda it: gemini_rate_claim(report_id, it[0], it[1], usage), items))
+
+    if usage.calls:
+        audit(
+            report_id,
+            "gemini_usage",
+            {
+                **usage.as_dict(),
+                "claims": len(items),
+                "batch": bool(settings.truecheck_gemini_batch),
+                "wall_ms": int((time.perf_counter() - started) * 1000),
+            },
+        )
+    return results
+
+
+@dataclass
+class _Work:
+    """Per-report state carried between pipeline stages."""
+
+    report: Report
+    limitations: list[str] = field(default_factory=list)
+    claims: list[str] = field(default_factory=list)
+    img_query: str | None = None
+    img_results: list[dict] = field(default_factory=list)
+    # (claim_text, evidence_for_reasoner, signals) per claim, in claim order.
+    prepared: list[tuple[str, list[dict], list[EvidenceSignal]]] = field(default_factory=list)
+    # (index into claims or None for report-level matches, row); claim ids are assigned at persist time.
+    evidence_items: list[tuple[int | None, EvidenceItem]] = field(default_factory=list)
+    timeline_items: list[dict] = field(default_factory=list)
+    total_web_evidence: int = 0
+    # Set when some claim's verdict stands in for a reasoner failure; such reports aren't reused.
+    degraded: bool = False
+
+
+def _run(report_id: str) -> bool:
+    """Analyse one report; returns whether the result is degraded (see `_Work.degraded`)."""
     with get_session() as session:
         report = session.get(Report, report_id)
         if not report:
-            return
+            return False
+
+    with _Retrieval(report_id) as retrieval:
+        work = _extract(report, retrieval)
+        _gather_evidence(work, retrieval)
 
-    limitations: list[str] = []
+    # Reasoning runs concurrently too; results come back in claim order.
+    reasoned_all = _reason_claims(report_id, [(p[0], p[1]) for p in work.prepared])
+    _finish(work, reasoned_all)
+    return work.degraded
+
+
+def _extract(report: Report, retrieval: _Retrieval) -> _Work:
+    """Input -> text -> claims; searches for the claims are submitted to `retrieval` right away."""
+    report_id = report.id
+    work = _Work(report=report)
+    limitations = work.limitations
 
     if report.input_type == InputType.text:
         text = report.input_text or ""
@@ -75,64 +427,53 @@ def _run(report_id: str) -> None:
         if not text:
             limitations.append("OCR unavailable or no text detected in image.")
     elif report.input_type == InputType.audio:
-        text = transcribe_audio(report_id, report.storage_path or "")
+        text = _transcribe_with_prefetch(report_id, report.storage_path or "", retrieval)
         if not text:
             limitations.append("Transcription unavailable; install faster-whisper or provide transcript.")
     else:
         text = ""
 
-    claims = extract_claims(text)
+    claims = extract_claims(text, max_claims=_MAX_CLAIMS)
     audit(report_id, "claims_extracted", {"count": len(claims)})
+    publish_event(report_id, "claims_extracted", {"claims": claims})
 
-    claim_rows: list[Claim] = []
-    evidence_items: list[EvidenceItem] = []
-    timeline_items: list[dict] = []
+    if report.input_type == InputType.image and report.storage_path:
+        # Basic image match lookup based on OCR text; real reverse-image search needs a dedicated service.
+        work.img_query = (claims[0] if claims else "image context")
 
-    total_web_evidence = 0
+    for c in claims:
+        retrieval.submit(c, report_id)
+    work.claims = claims
+    return work
 
-    for claim_text in claims:
-        query = claim_text
-        web_results = search_web(report_id, query, num=6)
-        gdelt_results = search_gdelt(report_id, query, num=6)
-        image_results = search_images(
-            report_id,
-            query,
-            num=max(0, int(settings.truecheck_max_image_matches_per_claim)),
-        )
 
-        # Persist claim first so evidence can reference claim_id.
-        with get_session() as session:
-            claim_row = Claim(
-                report_id=report_id,
-                claim_text=claim_text,
-                status="Unclear",
-                confidence=0,
-            )
-            session.add(claim_row)
-            session.commit()
-            session.refresh(claim_row)
+def _gather_evidence(work: _Work, retrieval: _Retrieval) -> None:
+    """Collect search results and turn them into evidence rows, reasoner inputs and scoring signals."""
+    report_id = work.report.id
+    claims = work.claims
+    retrieved, work.img_results = _retrieve_evidence(report_id, claims, work.img_query, retrieval)
+
+    evidence_items = work.evidence_items
+    timeline_items = work.timeline_items
+    prepared = work.prepared
+    total_web_evidence = 0
 
-        claim_id = claim_row.id
+    def _add_timeline(url: str | None, publisher: str | None, published_at: datetime | None, context: str | None):
+        if not url or published_at is None:
+            return
+        timeline_items.append(
+            {
+                "date": published_at.date().isoformat(),
+                "source": publisher,
+                "url": url,
+                "context": (context or "")[:240],
+            }
+        )
 
+    for claim_idx, (claim_text, (web_results, gdelt_results, image_results)) in enumerate(zip(claims, retrieved)):
         evidence_for_reasoner: list[dict] = []
         signals: list[EvidenceSignal] = []
 
-        def _add_timeline(url: str | None, publisher: str | None, published_date: str | None, context: str | None):
-            if not url or not published_date:
-                return
-            try:
-                dt = dtparser.parse(published_date)
-                timeline_items.append(
-                    {
-                        "date": dt.date().isoformat(),
-                        "source": publisher,
-                        "url": url,
-                        "context": (context or "")[:240],
-                    }
-                )
-            except Exception:
-                return
-
         for wr in web_results:
             url = wr.get("url")
             pub = wr.get("displayLink")
@@ -155,22 +496,28 @@ def _run(report_id: str) -> None:
                     "credibility": cred.value,
                 }
             )
-            signals.append(EvidenceSignal(credibility=cred.value, published_date=published_date))
+            # Parsed once here; scoring and the origin timeline both use the datetime.
+            published_at = parse_date(published_date)
+            signals.append(
+                EvidenceSignal(credibility=cred.value, published_date=published_date, published_at=published_at)
+            )
 
-            _add_timeline(url, pub, published_date, snippet)
+            _add_timeline(url, pub, published_at, snippet)
 
             evidence_items.append(
-                EvidenceItem(
-                    report_id=report_id,
-                    claim_id=claim_id,
-                    kind="web_extract",
-                    url=url or "",
-                    publisher=pub,
-                    published_date=published_date,
-                    title=wr.get("title"),
-                    snippet=snippet,
-                    thumbnail_url=thumbnail_url,
-                    credibility=cred,
+                (
+                    claim_idx,
+                    EvidenceItem(
+                        report_id=report_id,
+                        kind="web_extract",
+                        url=url or "",
+                        publisher=pub,
+                        published_date=published_date,
+                        title=wr.get("title"),
+                        snippet=snippet,
+                        thumbnail_url=thumbnail_url,
+                        credibility=cred,
+                    ),
                 )
             )
             total_web_evidence += 1
@@ -191,20 +538,25 @@ def _run(report_id: str) -> None:
                     "credibility": cred.value,
                 }
             )
-            signals.append(EvidenceSignal(credibility=cred.value, published_date=published_date))
-            _add_timeline(url, pub, published_date, snippet)
+            published_at = parse_date(published_date)
+            signals.append(
+                EvidenceSignal(credibility=cred.value, published_date=published_date, published_at=published_at)
+            )
+            _add_timeline(url, pub, published_at, snippet)
 
             evidence_items.append(
-                EvidenceItem(
-                    report_id=report_id,
-                    claim_id=claim_id,
-                    kind="web_extract",
-                    url=url or "",
-                    publisher=pub,
-                    published_date=published_date,
-                    title=gr.get("title"),
-                    snippet=snippet,
-                    credibility=cred,
+                (
+                    claim_idx,
+                    EvidenceItem(
+                        report_id=report_id,
+                        kind="web_extract",
+                        url=url or "",
+                        publisher=pub,
+                        published_date=published_date,
+                        title=gr.get("title"),
+                        snippet=snippet,
+                        credibility=cred,
+                    ),
                 )
             )
             total_web_evidence += 1
@@ -215,19 +567,41 @@ def _run(report_id: str) -> None:
             pub = ir.get("displayLink")
             cred = label_credibility(url, pub)
             evidence_items.append(
-                EvidenceItem(
-                    report_id=report_id,
-                    claim_id=claim_id,
-                    kind="image_match",
-                    url=url or "",
-                    publisher=pub,
-                    title=ir.get("title"),
-                    thumbnail_url=ir.get("thumbnail_url"),
-                    credibility=cred,
+                (
+                    claim_idx,
+                    EvidenceItem(
+                        report_id=report_id,
+                        kind="image_match",
+                        url=url or "",
+                        publisher=pub,
+                        title=ir.get("title"),
+                        thumbnail_url=ir.get("thumbnail_url"),
+                        credibility=cred,
+                    ),
                 )
             )
 
-        reasoned = gemini_rate_claim(report_id, claim_text, evidence_for_reasoner)
+        prepared.append((claim_text, evidence_for_reasoner, signals))
+
+    work.total_web_evidence = total_web_evidence
+
+
+def _finish(work: _Work, reasoned_all: list[dict]) -> None:
+    """Score claims from the reasoner output, derive the verdict and origin, and persist."""
+    report = work.report
+    report_id = report.id
+    limitations = work.limitations
+    evidence_items = work.evidence_items
+    img_results = work.img_results
+    total_web_evidence = work.total_web_evidence
+    timeline_items = work.timeline_items
+
+    claim_rows: list[Claim] = []
+
+    unrated = 0
+    for (claim_text, evidence_for_reasoner, signals), reasoned in zip(work.prepared, reasoned_all):
+        if reasoned.get("error"):
+            unrated += 1
         status = (reasoned.get("status") or "Unclear").strip()
         rationale_raw = reasoned.get("rationale")
         rationale = (rationale_raw or "").strip()
@@ -260,17 +634,18 @@ def _run(report_id: str) -> None:
             has_conflict=has_conflict,
         )
 
-        # Update persisted claim
-        with get_session() as session:
-            persisted = session.get(Claim, claim_id)
-            if persisted:
-                persisted.status = status
-                persisted.confidence = confidence
-                persisted.rationale = rationale or None
-                persisted.reasoning_json = json.dumps(reasoning_snapshot)
-                session.add(persisted)
-                session.commit()
-
+        publish_event(
+            report_id,
+            "claim_verdict",
+            {
+                "index": len(claim_rows),
+                "claim_text": claim_text,
+                "status": status,
+                "confidence": confidence,
+                "rationale": rationale or None,
+                "citations": [evidence_for_reasoner[i - 1] for i in citations[:5]],
+            },
+        )
         claim_rows.append(
             Claim(
                 report_id=report_id,
@@ -282,15 +657,13 @@ def _run(report_id: str) -> None:
             )
         )
 
-    if report.input_type == InputType.image and report.storage_path:
-        # Basic image match lookup based on OCR text; real reverse-image search needs a dedicated service.
-        img_query = (claims[0] if claims else "image context")
-        img_results = search_images(report_id, img_query, num=6)
-        for ir in img_results:
-            url = ir.get("url")
-            pub = ir.get("displayLink")
-            cred = label_credibility(url, pub)
-            evidence_items.append(
+    for ir in img_results:
+        url = ir.get("url")
+        pub = ir.get("displayLink")
+        cred = label_credibility(url, pub)
+        evidence_items.append(
+            (
+                None,
                 EvidenceItem(
                     report_id=report_id,
                     kind="image_match",
@@ -299,8 +672,16 @@ def _run(report_id: str) -> None:
                     title=ir.get("title"),
                     thumbnail_url=ir.get("thumbnail_url"),
                     credibility=cred,
-                )
+                ),
             )
+        )
+
+    if unrated:
+        work.degraded = True
+        limitations.append(
+            f"{unrated} of {len(claim_rows)} claims could not be rated because the reasoning service failed; "
+            "they are marked Unclear. Resubmit later for a full analysis."
+        )
 
     if total_web_evidence == 0:
         if not google_is_configured():
@@ -320,29 +701,9 @@ def _run(report_id: str) -> None:
         limitations.append("If results look incomplete, provide more context or a clearer quote fragment.")
 
     # Determine overall verdict.
-    supported = sum(1 for c in claim_rows if c.status == "Supported")
-    contradicted = sum(1 for c in claim_rows if c.status == "Contradicted")
-
-    if not claim_rows:
-        verdict = Verdict.unverifiable
-        overall_conf = 20
-        explanation = "No checkable claims were extracted from the input."
-    elif contradicted and supported:
-        verdict = Verdict.mixed
-        overall_conf = int(round(sum(c.confidence for c in claim_rows) / len(claim_rows)))
-        explanation = "Some claims are supported while others are contradicted by the retrieved evidence."
-    elif contradicted:
-        verdict = Verdict.false
-        overall_conf = int(round(sum(c.confidence for c in claim_rows) / len(claim_rows)))
-        explanation = "Key claims are contradicted by retrieved evidence from listed sources."
-    elif supported:
-        verdict = Verdict.true
-        overall_conf = int(round(sum(c.confidence for c in claim_rows) / len(claim_rows)))
-        explanation = "Key claims are supported by retrieved evidence from listed sources."
-    else:
-        verdict = Verdict.unverifiable
-        overall_conf = int(round(sum(c.confidence for c in claim_rows) / len(claim_rows)))
-        explanation = "Evidence was insufficient or unclear to verify the extracted claims."
+    verdict, overall_conf, explanation = overall_verdict(
+        [c.status for c in claim_rows], [c.confidence for c in claim_rows]
+    )
 
     ai_likelihood = None
     if report.input_type == InputType.image:
@@ -371,19 +732,60 @@ def _run(report_id: str) -> None:
         timeline_json=json.dumps(timeline_sorted[:30]),
     )
 
-    with get_session() as session:
-        for e in evidence_items:
-            session.add(e)
-        session.add(origin)
-
-        report = session.get(Report, report_id)
-        if report:
-            report.verdict = verdict
-            report.confidence = overall_conf
-            report.explanation = explanation
-            report.ai_likelihood = ai_likelihood
-            # store limitations in audit for now
-        session.commit()
+    _persist_results(
+        report_id,
+        claim_rows,
+        evidence_items,
+        origin,
+        {
+            "verdict": verdict,
+            "confidence": overall_conf,
+            "explanation": explanation,
+            "ai_likelihood": ai_likelihood,
+        },
+    )
+    # store limitations in audit for now
 
     if limitations:
         audit(report_id, "limitations", {"items": limitations})
+
+
+def _persist_results(
+    report_id: str,
+    claim_rows: list[Claim],
+    evidence_items: list[tuple[int | None, EvidenceItem]],
+    origin: OriginTrace,
+    report_fields: dict,
+) -> None:
+    """Write claims, evidence, origin trace and the report verdict in one transaction.
+
+    Claims go in as a single multi-row INSERT ... RETURNING so evidence rows can be
+    linked to their claim ids and bulk-inserted right after; the statement count is
+    constant regardless of how many claims/evidence items the report has.
+    """
+    with engine.begin() as conn:
+        claim_ids: list[int] = []
+        if claim_rows:
+            params = [c.model_dump(exclude={"id"}) for c in claim_rows]
+            texts = [c.claim_text for c in claim_rows]
+            if len(set(texts)) == len(texts):
+                # Claim text is unique per report, so map RETURNING rows back by text; this keeps
+                # the insert batched on SQLite, where sort_by_parameter_order degrades to row-by-row.
+                rows = conn.execute(insert(Claim).returning(Claim.id, Claim.claim_text), params)
+                by_text = {text: claim_id for claim_id, text in rows}
+                claim_ids = [by_text[t] for t in texts]
+            else:
+                claim_ids = list(
+                    conn.execute(insert(Claim).returning(Claim.id, sort_by_parameter_order=True), params).scalars()
+                )
+
+        evidence_rows = []
+        for claim_idx, item in evidence_items:
+            row = item.model_dump(exclude={"id"})
+            row["claim_id"] = claim_ids[claim_idx] if claim_idx is not None else None
+            evidence_rows.append(row)
+        if evidence_rows:
+            conn.execute(insert(EvidenceItem), evidence_rows)
+
+        conn.execute(insert(OriginTrace), [origin.model_dump(exclude={"id"})])
+        conn.execute(update(Report).where(Report.id == report_id).values(**report_fields))
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from app.config import settings
+from app.services.redis_conn import get_redis, mark_redis_down
+
+
+# Dropped from cache keys only; the upstream search still receives the original claim text.
+# Negations are deliberately absent: "X is flat" and "X is not flat" must never share evidence.
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "for", "by", "with", "from",
+    "as", "is", "are", "was", "were", "be", "been", "being", "it", "its", "this", "that",
+    "these", "those", "has", "have", "had", "do", "does", "did", "will", "would", "can",
+    "could", "should", "there", "their", "they", "he", "she", "his", "her", "we", "our",
+    "which", "who", "whom", "what", "about", "into", "than", "then", "so", "also", "just",
+}
+NEGATIONS = {"no", "not", "never", "none", "nobody", "nothing", "neither", "nor", "without", "cannot"}
+
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_DECIMAL_ZEROS_RE = re.compile(r"\b(\d+)\.(\d*?)0+\b")
+_PERCENT_RE = re.compile(r"(\d)\s*(?:%|percent\b|per cent\b)")
+_POSSESSIVE_RE = re.compile(r"['’]s\b")
+_TOKEN_RE = re.compile(r"\d+(?:\.\d+)?%?|[^\W_]+")
+_NUMBER_RE = re.compile(r"^\d+(?:\.\d+)?%?$")
+_PUNCT_RE = re.compile(r"[^\w\s]|_")
+
+
+def canonicalize_query(text: str) -> str:
+    """Canonical form of a claim for cache keys.
+
+    Case, punctuation, whitespace, stopwords and number formatting ("1,000" / "1000",
+    "10.0" / "10", "10 percent" / "10%") are normalized; word order is kept.
+    """
+    t = unicodedata.normalize("NFKC", text or "").lower()
+    t = t.replace("n't", " not").replace("n’t", " not")
+    t = _POSSESSIVE_RE.sub("", t)
+    t = _THOUSANDS_RE.sub("", t)
+    t = _DECIMAL_ZEROS_RE.sub(lambda m: m.group(1) + ("." + m.group(2) if m.group(2) else ""), t)
+    t = _PERCENT_RE.sub(r"\1%", t)
+    tokens = [tok for tok in _TOKEN_RE.findall(t) if tok not in STOPWORDS]
+    return " ".join(tokens)
+
+
+def normalize_claim_text(text: str) -> str:
+    """Light normalization for verdict keys: casefold, punctuation to spaces, collapsed whitespace.
+
+    Unlike `canonicalize_query`, every word is kept: "X could cause Y" and "X did cause Y"
+    share search evidence but not a verdict.
+    """
+    t = unicodedata.normalize("NFKC", text or "").casefold()
+    return " ".join(_PUNCT_RE.sub(" ", t).split())
+
+
+def _shingles(canonical: str) -> set[str]:
+    tokens = canonical.split()
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def _guard_tokens(canonical: str) -> frozenset[str]:
+    # Near-duplicates must agree on negations and numbers ("2018" vs "2019" is a different claim).
+    return frozenset(tok for tok in canonical.split() if tok in NEGATIONS or _NUMBER_RE.match(tok))
+
+
+def jaccard(a: str, b: str) -> float:
+    sa, sb = _shingles(a), _shingles(b)
+    if not sa or not sb:
+        return 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x7C0FFEE)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_NUM_PERM)]
+
+
+def minhash_signature(canonical: str) -> list[int]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in _shingles(canonical)
+    ]
+    if not hashes:
+        return []
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def _band_keys(namespace: str, canonical: str) -> list[str]:
+    sig = minhash_signature(canonical)
+    if not sig:
+        return []
+    keys = []
+    for band in range(_BANDS):
+        chunk = ",".join(str(v) for v in sig[band * _ROWS : (band + 1) * _ROWS])
+        digest = hashlib.blake2b(chunk.encode("ascii"), digest_size=8).hexdigest()
+        keys.append(f"truecheck:lsh:{namespace}:{band}:{digest}")
+    return keys
+
+
+class _LocalLSH:
+    """Process-local fallback for the LSH buckets when Redis isn't available."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, set[str]] = {}
+        self._members: OrderedDict[str, list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, member: str, keys: list[str]) -> None:
+        max_entries = max(1, int(settings.truecheck_cache_memory_max_entries))
+        with self._lock:
+            if member in self._members:
+                self._members.move_to_end(member)
+                return
+            self._members[member] = keys
+            for k in keys:
+                self._buckets.setdefault(k, set()).add(member)
+            while len(self._members) > max_entries:
+                old, old_keys = self._members.popitem(last=False)
+                for k in old_keys:
+                    bucket = self._buckets.get(k)
+                    if bucket is not None:
+                        bucket.discard(old)
+                        if not bucket:
+                            del self._buckets[k]
+
+    def candidates(self, keys: list[str]) -> set[str]:
+        with self._lock:
+            out: set[str] = set()
+            for k in keys:
+                out |= self._buckets.get(k, set())
+            return out
+
+
+_local = _LocalLSH()
+
+
+def near_dup_add(namespace: str, canonical: str) -> None:
+    keys = _band_keys(namespace, canonical)
+    if not keys:
+        return
+    member = canonical
+    r = get_redis() if settings.truecheck_cache_redis else None
+    if r is not None:
+        try:
+            ttl = max(1, int(settings.truecheck_search_cache_ttl_seconds))
+            pipe = r.pipeline(transaction=False)
+            for k in keys:
+                pipe.sadd(k, member)
+                pipe.expire(k, ttl)
+            pipe.execute()
+            return
+        except Exception:
+            mark_redis_down()
+    _local.add(member, keys)
+
+
+def near_dup_find(namespace: str, canonical: str) -> tuple[str, float] | None:
+    """Best previously indexed canonical query within the similarity threshold, if any."""
+    keys = _band_keys(namespace, canonical)
+    if not keys:
+        return None
+
+    candidates: set[str] = set()
+    r = get_redis() if settings.truecheck_cache_redis else None
+    if r is not None:
+        try:
+            pipe = r.pipeline(transaction=False)
+            for k in keys:
+                pipe.smembers(k)
+            for members in pipe.execute():
+                candidates |= {m.decode("utf-8") if isinstance(m, bytes) else m for m in members}
+        except Exception:
+            mark_redis_down()
+    candidates |= _local.candidates(keys)
+    candidates.discard(canonical)
+
+    threshold = float(settings.truecheck_cache_near_dup_threshold)
+    guard = _guard_tokens(canonical)
+    best: tuple[str, float] | None = None
+    for cand in candidates:
+        if _guard_tokens(cand) != guard:
+            continue
+        score = jaccard(canonical, cand)
+        if score >= threshold and (best is None or score > best[1]):
+            best = (cand, score)
+    return best
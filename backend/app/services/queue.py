@@ -5,6 +5,7 @@ from rq import Queue
 
 from app.config import settings
 from app.services.audit import audit
+from app.services.redis_conn import get_redis, mark_redis_down
 
 
 def enqueue_report(report_id: str) -> bool:
@@ -18,3 +19,43 @@ def enqueue_report(report_id: str) -> bool:
         # If Redis/worker isn't available, fall back to in-process in API.
         audit(report_id, "enqueue_failed", {"error": str(e)})
         return False
+
+
+def enqueue_batch(batch_id: str, report_ids: list[str]) -> bool:
+    """Enqueue a whole batch in one pipelined round trip.
+
+    With `truecheck_batch_pipeline` the reports are grouped into jobs of
+    `truecheck_batch_chunk_size` that run through the batch pipeline (shared claims
+    searched/rated once per job); otherwise one `process_report` job per report.
+    """
+    try:
+        redis_conn = Redis.from_url(settings.truecheck_redis_url)
+        queue = Queue(settings.truecheck_queue_name, connection=redis_conn)
+        if settings.truecheck_batch_pipeline:
+            size = max(1, int(settings.truecheck_batch_chunk_size))
+            jobs = [
+                Queue.prepare_data("worker.worker.process_batch", args=(batch_id, report_ids[i : i + size]))
+                for i in range(0, len(report_ids), size)
+            ]
+        else:
+            jobs = [Queue.prepare_data("worker.worker.process_report", args=(rid,)) for rid in report_ids]
+        with redis_conn.pipeline() as pipe:
+            queue.enqueue_many(jobs, pipeline=pipe)
+            pipe.execute()
+        audit(batch_id, "enqueue", {"queue": settings.truecheck_queue_name, "jobs": len(jobs), "reports": len(report_ids)})
+        return True
+    except Exception as e:
+        audit(batch_id, "enqueue_failed", {"error": str(e)})
+        return False
+
+
+def queue_depth() -> int | None:
+    """Jobs waiting in the RQ queue, or None when Redis is unavailable."""
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        return Queue(settings.truecheck_queue_name, connection=r).count
+    except Exception:
+        mark_redis_down()
+        return None
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import httpx
+from redis.exceptions import WatchError
+
+from app.config import settings
+from app.services.redis_conn import get_redis, mark_redis_down
+
+
+# Token buckets shared through Redis, kept per process without it.
+#
+# Outbound: one budget per provider ("google", "gemini", "gdelt") so adding workers doesn't
+# multiply the quota we consume. A call reserves the next slot and sleeps until it, so
+# callers queue in arrival order instead of failing.
+# Inbound: one bucket per API client, checked without waiting (see `try_acquire`).
+#
+# Each bucket is GCRA state: a single "theoretical arrival time" per bucket name.
+
+_QUOTA_EXHAUSTED = "daily quota exhausted"
+_QUEUE_TOO_LONG = "wait exceeds truecheck_rl_max_wait_seconds"
+_COUNTERS = ("acquired", "waited", "wait_ms", "rejected", "throttled")
+_INBOUND_COUNTERS = ("admitted", "limited", "shed")
+
+
+class RateLimitExceeded(RuntimeError):
+    def __init__(self, provider: str, retry_after: float, reason: str) -> None:
+        super().__init__(f"{provider} rate limit: {reason} (retry in {retry_after:.0f}s)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def _budget(provider: str) -> tuple[int, int]:
+    """(requests per minute, requests per day) for `provider`; 0 = unlimited."""
+    per_minute = getattr(settings, f"truecheck_rl_{provider}_per_minute", 0)
+    per_day = getattr(settings, f"truecheck_rl_{provider}_per_day", 0)
+    return max(0, int(per_minute)), max(0, int(per_day))
+
+
+def _reserve(tat: float, now: float, interval: float, burst: int) -> tuple[float, float]:
+    """Return (new_tat, wait) for one more request; `burst` requests may go back to back."""
+    new_tat = max(tat, now) + interval
+    return new_tat, max(0.0, new_tat - now - max(1, burst) * interval)
+
+
+def _day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+
+class _LocalBuckets:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tat: dict[str, float] = {}
+        self._days: dict[str, tuple[str, int]] = {}
+
+    def reserve(
+        self, name: str, interval: float, burst: int, per_day: int, max_wait: float, count_day: bool = True
+    ) -> tuple[float, str | None]:
+        with self._lock:
+            now = time.time()
+            day, used = self._days.get(name, ("", 0))
+            if day != _day():
+                day, used = _day(), 0
+            if per_day and used >= per_day:
+                return _seconds_to_midnight(), _QUOTA_EXHAUSTED
+            wait = 0.0
+            if interval:
+                new_tat, wait = _reserve(self._tat.get(name, 0.0), now, interval, burst)
+                if wait > max_wait:
+                    return wait, _QUEUE_TOO_LONG
+                self._tat[name] = new_tat
+                if len(self._tat) > _LOCAL_MAX_BUCKETS:
+                    # Buckets whose slot is in the past are full again; forgetting them is free.
+                    self._tat = {k: v for k, v in self._tat.items() if v > now}
+            if count_day:
+                self._days[name] = (day, used + 1)
+            return wait, None
+
+    def day_used(self, provider: str) -> int:
+        with self._lock:
+            day, used = self._days.get(provider, ("", 0))
+            return used if day == _day() else 0
+
+
+_LOCAL_MAX_BUCKETS = 10_000
+_local = _LocalBuckets()
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _seconds_to_midnight() -> float:
+    now = datetime.now(timezone.utc)
+    return float(86400 - (now.hour * 3600 + now.minute * 60 + now.second))
+
+
+def _key(provider: str, part: str) -> str:
+    return f"truecheck:rl:{provider}:{part}"
+
+
+def _bump(provider: str, counts: dict[str, int], counters: tuple[str, ...] = _COUNTERS) -> None:
+    with _stats_lock:
+        row = _stats.setdefault(provider, dict.fromkeys(counters, 0))
+        for name, n in counts.items():
+            row[name] += n
+
+
+def _reserve_redis(
+    r, name: str, interval: float, burst: int, per_day: int, max_wait: float, count_day: bool = True
+) -> tuple[float, str | None]:
+    tat_key, day_key = _key(name, "tat"), _key(name, f"day:{_day()}")
+    with r.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch(tat_key, day_key)
+                sec, usec = pipe.time()
+                now = sec + usec / 1e6
+                if per_day and int(pipe.get(day_key) or 0) >= per_day:
+                    pipe.unwatch()
+                    return _seconds_to_midnight(), _QUOTA_EXHAUSTED
+                wait = 0.0
+                new_tat = None
+                if interval:
+                    new_tat, wait = _reserve(float(pipe.get(tat_key) or 0.0), now, interval, burst)
+                    if wait > max_wait:
+                        pipe.unwatch()
+                        return wait, _QUEUE_TOO_LONG
+                pipe.multi()
+                if new_tat is not None:
+                    pipe.set(tat_key, repr(new_tat), px=int((new_tat - now) * 1000) + 1000)
+                if count_day:
+                    pipe.incr(day_key)
+                    pipe.expire(day_key, 2 * 86400)
+                pipe.execute()
+                return wait, None
+            except WatchError:
+                # Another worker reserved in between; recompute against its slot.
+                continue
+
+
+def _record_shared(r, provider: str, counts: dict[str, int]) -> None:
+    try:
+        pipe = r.pipeline(transaction=False)
+        for name, n in counts.items():
+            if n:
+                pipe.hincrby(_key(provider, "stats"), name, n)
+        pipe.execute()
+    except Exception:
+        mark_redis_down()
+
+
+def acquire(provider: str) -> float:
+    """Block until `provider` has budget for one request; returns the seconds waited.
+
+    A single reservation never waits longer than `truecheck_rl_max_wait_seconds`; when the
+    queue ahead is longer, the caller backs off and queues again, for up to
+    `truecheck_rl_queue_timeout_seconds` in total. Raises `RateLimitExceeded` past that, or
+    when the daily quota is spent.
+    """
+    per_minute, per_day = _budget(provider)
+    if not per_minute and not per_day:
+        return 0.0
+    interval = 60.0 / per_minute if per_minute else 0.0
+    burst = int(settings.truecheck_rl_burst)
+    max_wait = max(0.0, float(settings.truecheck_rl_max_wait_seconds))
+    deadline = time.monotonic() + max(max_wait, float(settings.truecheck_rl_queue_timeout_seconds))
+    backed_off = 0.0
+
+    while True:
+        r = get_redis()
+        wait, reason = None, None
+        if r is not None:
+            try:
+                wait, reason = _reserve_redis(r, provider, interval, burst, per_day, max_wait)
+            except Exception:
+                mark_redis_down()
+                r = None
+        if r is None:
+            wait, reason = _local.reserve(provider, interval, burst, per_day, max_wait)
+        if reason != _QUEUE_TOO_LONG:
+            break
+        # Sleep until the queue ahead fits in max_wait, then take a place in it again.
+        backoff = max(0.05, wait - max_wait)
+        if time.monotonic() + backoff + max_wait > deadline:
+            break
+        time.sleep(backoff)
+        backed_off += backoff
+
+    if reason:
+        counts = {"rejected": 1}
+    else:
+        waited = backed_off + wait
+        counts = {"acquired": 1, "waited": int(waited > 0), "wait_ms": int(waited * 1000)}
+    _bump(provider, counts)
+    if r is not None:
+        _record_shared(r, provider, counts)
+    if reason:
+        raise RateLimitExceeded(provider, wait, reason)
+    if wait > 0:
+        time.sleep(wait)
+    return backed_off + wait
+
+
+def try_acquire(name: str, per_minute: int, burst: int) -> float:
+    """Take a token from bucket `name` if one is free now; otherwise return the seconds until one is.
+
+    Returns 0.0 when admitted. Never sleeps; used to answer inbound requests with 429.
+    """
+    if per_minute <= 0:
+        return 0.0
+    interval = 60.0 / per_minute
+    r = get_redis()
+    if r is not None:
+        try:
+            wait, _ = _reserve_redis(r, name, interval, burst, 0, 0.0, count_day=False)
+            return wait
+        except Exception:
+            mark_redis_down()
+    wait, _ = _local.reserve(name, interval, burst, 0, 0.0, count_day=False)
+    return wait
+
+
+def _retry_after(resp: httpx.Response, default: float) -> float:
+    try:
+        return max(0.0, float(resp.headers.get("retry-after", "")))
+    except ValueError:
+        return default
+
+
+def limited_request(provider: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+    """Call `send` under the provider budget, retrying 429 responses after their Retry-After.
+
+    The last response is returned as-is, so callers keep their `raise_for_status()` handling.
+    """
+    retries = max(0, int(settings.truecheck_rl_retries_on_429))
+    max_wait = max(0.0, float(settings.truecheck_rl_max_wait_seconds))
+    per_minute, _ = _budget(provider)
+    for attempt in range(retries + 1):
+        acquire(provider)
+        resp = send()
+        if resp.status_code != 429 or attempt == retries:
+            return resp
+        _bump(provider, {"throttled": 1})
+        r = get_redis()
+        if r is not None:
+            _record_shared(r, provider, {"throttled": 1})
+        delay = _retry_after(resp, 60.0 / per_minute if per_minute else 1.0)
+        if delay > max_wait:
+            return resp
+        time.sleep(delay)
+    return resp
+
+
+def rate_limit_stats() -> dict[str, dict[str, Any]]:
+    """Budgets plus counters per provider: this process, and all workers when Redis is up."""
+    r = get_redis()
+    out: dict[str, dict[str, Any]] = {}
+    for provider in ("google", "gemini", "gdelt"):
+        per_minute, per_day = _budget(provider)
+        with _stats_lock:
+            process = dict(_stats.get(provider) or dict.fromkeys(_COUNTERS, 0))
+        row: dict[str, Any] = {
+            "per_minute": per_minute,
+            "per_day": per_day,
+            "burst": max(1, int(settings.truecheck_rl_burst)),
+            "process": process,
+            "shared": None,
+            "day_used": _local.day_used(provider),
+        }
+        if r is not None:
+            try:
+                raw = r.hgetall(_key(provider, "stats"))
+                row["shared"] = {name: int((raw or {}).get(name.encode(), 0)) for name in _COUNTERS}
+                row["day_used"] = int(r.get(_key(provider, f"day:{_day()}")) or 0)
+            except Exception:
+                mark_redis_down()
+        out[provider] = row
+    return out
+
+
+def record_inbound(outcome: str) -> None:
+    """Count an upload admission decision ("admitted", "limited" or "shed")."""
+    _bump("inbound", {outcome: 1}, _INBOUND_COUNTERS)
+    r = get_redis()
+    if r is not None:
+        _record_shared(r, "inbound", {outcome: 1})
+
+
+def inbound_stats() -> dict[str, Any]:
+    """Upload admission counters for this API process and, with Redis, all replicas."""
+    with _stats_lock:
+        process = dict(_stats.get("inbound") or dict.fromkeys(_INBOUND_COUNTERS, 0))
+    out: dict[str, Any] = {
+        "per_minute": int(settings.truecheck_rl_requests_per_minute),
+        "burst": int(settings.truecheck_rl_client_burst),
+        "process": process,
+        "shared": None,
+    }
+    r = get_redis()
+    if r is not None:
+        try:
+            raw = r.hgetall(_key("inbound", "stats")) or {}
+            out["shared"] = {name: int(raw.get(name.encode(), 0)) for name in _INBOUND_COUNTERS}
+        except Exception:
+            mark_redis_down()
+    return out
+
+
+def _reset_after_fork() -> None:
+    global _local, _stats_lock
+    _local = _LocalBuckets()
+    _stats.clear()
+    _stats_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
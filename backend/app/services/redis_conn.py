@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from app.config import settings
+
+
+# Shared Redis client for cache/coordination use. Callers must treat `None` as
+# "Redis unavailable" and degrade to process-local behaviour.
+_client: Redis | None = None
+# Asyncio client for SSE subscriptions: one connection pool per event loop, not per stream.
+_async: tuple[asyncio.AbstractEventLoop | None, AsyncRedis] | None = None
+_down_until = 0.0
+_lock = threading.Lock()
+
+_RETRY_AFTER_SECONDS = 30.0
+
+
+def get_redis() -> Redis | None:
+    global _client, _down_until
+    if not settings.truecheck_redis_url:
+        return None
+    if _client is not None:
+        return _client
+    if time.monotonic() < _down_until:
+        return None
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            client = Redis.from_url(
+                settings.truecheck_redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=2.0,
+            )
+            client.ping()
+        except Exception:
+            _down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+            return None
+        _client = client
+        return _client
+
+
+def get_async_redis() -> AsyncRedis:
+    """Shared asyncio client for the running event loop (one connection pool, not one per caller).
+
+    Doesn't check availability; callers gate on `get_redis()` first, off the event loop,
+    since its first call may block on a ping.
+    """
+    global _async
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if _async is None or (_async[0] is not None and _async[0] is not loop):
+            _async = (loop, AsyncRedis.from_url(settings.truecheck_redis_url, socket_connect_timeout=0.5))
+        return _async[1]
+
+
+def set_redis(client: Redis | None, async_client: AsyncRedis | None = None) -> None:
+    """Install specific clients (e.g. fakeredis in tests) or reset to lazy connect with None."""
+    global _client, _async, _down_until
+    with _lock:
+        _client = client
+        _async = (None, async_client) if async_client is not None else None
+        _down_until = 0.0
+
+
+def mark_redis_down() -> None:
+    """Called after an operation error so we stop paying connect timeouts for a while."""
+    global _client, _down_until
+    with _lock:
+        _client = None
+        _down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+
+
+def _reset_after_fork() -> None:
+    global _client, _async, _lock
+    _client = None
+    _async = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from datetime import datetime
 
+import orjson
 from fastapi import HTTPException
 
 from app.config import settings
 from app.db import get_session
-from app.models import AuditEvent, Claim, EvidenceItem, OriginTrace, Report
-from app.schemas import AuditResponse, Citation, ClaimRow, ReportResponse
+from app.models import AuditEvent, Claim, EvidenceItem, OriginTrace, Report, ReportDocument, ReportStatus
+from app.schemas import AuditResponse, BatchAuditResponse, Citation, ClaimRow, ReportResponse
+from app.services.audit import flush_audit
+
+
+def _report_fields(report: Report) -> dict:
+    # Per-report headline fields; everything else in the response comes from the source report.
+    return {
+        "report_id": report.id,
+        "created_at": report.created_at,
+        "updated_at": report.updated_at,
+        "input_type": report.input_type.value,
+        "status": report.status.value,
+        "verdict": (report.verdict.value if report.verdict else None),
+        "confidence": report.confidence,
+        "ai_likelihood": report.ai_likelihood,
+        "explanation": report.explanation,
+    }
 
 
 def build_report_response(report_id: str) -> ReportResponse:
@@ -17,11 +35,13 @@ def build_report_response(report_id: str) -> ReportResponse:
         if not report:
             raise HTTPException(status_code=404, detail="report not found")
 
-        claims = session.query(Claim).filter(Claim.report_id == report_id).all()
-        evidence = session.query(EvidenceItem).filter(EvidenceItem.report_id == report_id).all()
-        origin = session.query(OriginTrace).filter(OriginTrace.report_id == report_id).first()
+        # Duplicate submissions carry no rows of their own; they serve the linked report's.
+        source_id = report.duplicate_of or report_id
+        claims = session.query(Claim).filter(Claim.report_id == source_id).all()
+        evidence = session.query(EvidenceItem).filter(EvidenceItem.report_id == source_id).all()
+        origin = session.query(OriginTrace).filter(OriginTrace.report_id == source_id).first()
         limitations_events = session.query(AuditEvent).filter(
-            AuditEvent.report_id == report_id, AuditEvent.event_type == "limitations"
+            AuditEvent.report_id == source_id, AuditEvent.event_type == "limitations"
         ).all()
 
     key_claims: list[ClaimRow] = []
@@ -132,15 +152,7 @@ def build_report_response(report_id: str) -> ReportResponse:
             pass
 
     return ReportResponse(
-        report_id=report.id,
-        created_at=report.created_at,
-        updated_at=report.updated_at,
-        input_type=report.input_type.value,
-        status=report.status.value,
-        verdict=(report.verdict.value if report.verdict else None),
-        confidence=report.confidence,
-        ai_likelihood=report.ai_likelihood,
-        explanation=report.explanation,
+        **_report_fields(report),
         key_claims=key_claims,
         evidence=evidence_gallery,
         origin_tracing=origin_tracing,
@@ -148,18 +160,89 @@ def build_report_response(report_id: str) -> ReportResponse:
     )
 
 
-def build_audit_response(report_id: str) -> AuditResponse:
+_FINAL_STATUSES = (ReportStatus.complete, ReportStatus.failed)
+
+
+def materialize_report(report_id: str) -> tuple[bytes, str]:
+    """Serialize the finished report once and store it; returns `(body, etag)`.
+
+    Complete/failed reports never change, so GET can serve these bytes as-is instead of
+    re-querying claims/evidence/origin/limitations on every request.
+    """
+    body = orjson.dumps(build_report_response(report_id).model_dump(mode="json"))
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
     with get_session() as session:
-        events = session.query(AuditEvent).filter(AuditEvent.report_id == report_id).order_by(AuditEvent.created_at).all()
+        session.merge(ReportDocument(report_id=report_id, etag=etag, body=body))
+        session.commit()
+    return body, etag
 
-    return AuditResponse(
-        report_id=report_id,
-        events=[
-            {
-                "time": e.created_at.isoformat(),
-                "type": e.event_type,
-                "details": json.loads(e.details_json) if e.details_json else {},
-            }
-            for e in events
-        ],
-    )
+
+def materialize_reports(report_ids: list[str]) -> None:
+    """`materialize_report` for many duplicates: each source is built once, one write for all."""
+    if not report_ids:
+        return
+    with get_session() as session:
+        reports = session.query(Report).filter(Report.id.in_(report_ids)).all()
+    groups: dict[str, list[Report]] = {}
+    for report in reports:
+        groups.setdefault(report.duplicate_of or report.id, []).append(report)
+
+    docs = []
+    for group in groups.values():
+        shared = build_report_response(group[0].id)
+        for report in group:
+            response = shared.model_copy(update=_report_fields(report))
+            body = orjson.dumps(response.model_dump(mode="json"))
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            docs.append(ReportDocument(report_id=report.id, etag=etag, body=body))
+    with get_session() as session:
+        for doc in docs:
+            session.merge(doc)
+        session.commit()
+
+
+def load_report_document(report_id: str) -> tuple[bytes, str] | None:
+    """Stored `(body, etag)` for a finished report, or None while it's still queued/running.
+
+    Reports that finished before documents existed are materialized on first read.
+    """
+    with get_session() as session:
+        doc = session.get(ReportDocument, report_id)
+        if doc:
+            return doc.body, doc.etag
+        report = session.get(Report, report_id)
+        if not report or report.status not in _FINAL_STATUSES:
+            return None
+    return materialize_report(report_id)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def build_audit_response(report_id: str) -> AuditResponse:
+    return AuditResponse(report_id=report_id, events=_audit_events(report_id))
+
+
+def build_batch_audit_response(batch_id: str) -> BatchAuditResponse:
+    # Work shared by a batch's reports (pooled Gemini calls and usage, enqueue, worker job) is audited here.
+    return BatchAuditResponse(batch_id=batch_id, events=_audit_events(batch_id))
+
+
+def _audit_events(owner_id: str) -> list[dict]:
+    # Make this process's own buffered events (e.g. upload/enqueue) visible.
+    flush_audit()
+    with get_session() as session:
+        events = session.query(AuditEvent).filter(AuditEvent.report_id == owner_id).order_by(AuditEvent.created_at).all()
+
+    return [
+        {
+            "time": e.created_at.isoformat(),
+            "type": e.event_type,
+            "details": json.loads(e.details_json) if e.details_json else {},
+        }
+        for e in events
+    ]
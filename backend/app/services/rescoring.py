@@ -0,0 +1,311 @@
+"""Re-score stored claims and reports after tuning `scoring.py`.
+
+Signals are read back from each claim's `reasoning_json` snapshot (the exact evidence list
+the pipeline scored), loaded column-wise a chunk of reports at a time, and scored with NumPy:
+credibility weights, freshness, corroboration and conflict for every claim in the chunk at
+once, then report verdicts and confidences from the claim columns. Ages are measured from
+the report's `created_at`, so unchanged weights reproduce the stored scores.
+
+Usage (from backend/; needs `pip install numpy`):
+    python -m app.services.rescoring --dry-run
+    python -m app.services.rescoring --chunk-size 1000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from datetime import timezone
+
+import orjson
+from sqlalchemy import delete, update
+
+from app.db import get_session, init_db
+from app.models import Claim, Report, ReportDocument, ReportStatus, Verdict
+from app.services import scoring
+from app.services.dates import parse_date
+
+try:
+    import numpy as np
+except ImportError:  # optional: only this maintenance command needs it
+    np = None
+
+
+# Freshness states per evidence row.
+_UNDATED, _UNPARSEABLE, _DATED = 0, 1, 2
+
+_VERDICT_CODES = [Verdict.unverifiable, Verdict.true, Verdict.false, Verdict.mixed]
+
+# Histogram bins for score deltas: [edge, next_edge) on integer deltas.
+_DELTA_EDGES = [-100, -49, -19, -9, -4, 0, 1, 5, 10, 20, 50, 101]
+
+
+@dataclass
+class _Chunk:
+    report_ids: list[str] = field(default_factory=list)
+    report_conf: list[int] = field(default_factory=list)
+    report_verdict: list[str | None] = field(default_factory=list)
+
+    claim_ids: list[int] = field(default_factory=list)
+    claim_report: list[int] = field(default_factory=list)
+    claim_conf: list[int] = field(default_factory=list)
+    claim_status: list[str] = field(default_factory=list)
+    claim_corroboration: list[int] = field(default_factory=list)
+
+    # One row per evidence item the claim was scored on.
+    ev_claim: list[int] = field(default_factory=list)
+    ev_weight: list[float] = field(default_factory=list)
+    ev_state: list[int] = field(default_factory=list)
+    ev_days: list[int] = field(default_factory=list)
+
+    # Raw inputs for the scalar cross-check.
+    signals: list[list[tuple[str, str | None]]] = field(default_factory=list)
+    created_at: list = field(default_factory=list)
+
+
+def _load_chunk(after_id: str, size: int) -> _Chunk | None:
+    with get_session() as session:
+        reports = (
+            session.query(Report.id, Report.created_at, Report.confidence, Report.verdict)
+            .filter(Report.status == ReportStatus.complete, Report.duplicate_of.is_(None), Report.id > after_id)
+            .order_by(Report.id)
+            .limit(size)
+            .all()
+        )
+        if not reports:
+            return None
+        claims = (
+            session.query(Claim.id, Claim.report_id, Claim.status, Claim.confidence, Claim.reasoning_json)
+            .filter(Claim.report_id.in_([r.id for r in reports]))
+            .order_by(Claim.report_id, Claim.id)
+            .all()
+        )
+
+    chunk = _Chunk()
+    report_index: dict[str, int] = {}
+    created_by_report = []
+    for r in reports:
+        report_index[r.id] = len(chunk.report_ids)
+        chunk.report_ids.append(r.id)
+        chunk.report_conf.append(r.confidence if r.confidence is not None else -1)
+        chunk.report_verdict.append(r.verdict.value if r.verdict else None)
+        created_by_report.append(r.created_at.replace(tzinfo=timezone.utc))
+
+    for claim_id, report_id, status, confidence, reasoning_json in claims:
+        idx = len(chunk.claim_ids)
+        created = created_by_report[report_index[report_id]]
+        chunk.claim_ids.append(claim_id)
+        chunk.claim_report.append(report_index[report_id])
+        chunk.claim_conf.append(confidence)
+        chunk.claim_status.append(status)
+        chunk.created_at.append(created)
+
+        evidence = (orjson.loads(reasoning_json) if reasoning_json else {}).get("evidence") or []
+        chunk.claim_corroboration.append(len({(e.get("publisher"), e.get("url")) for e in evidence if e.get("url")}))
+        signals = []
+        for e in evidence:
+            cred, published = e.get("credibility"), e.get("published_date")
+            signals.append((cred, published))
+            chunk.ev_claim.append(idx)
+            chunk.ev_weight.append(scoring.CREDIBILITY_WEIGHT.get(cred, scoring.DEFAULT_CREDIBILITY_WEIGHT))
+            if not published:
+                chunk.ev_state.append(_UNDATED)
+                chunk.ev_days.append(0)
+                continue
+            dt = parse_date(published)
+            if dt is None:
+                chunk.ev_state.append(_UNPARSEABLE)
+                chunk.ev_days.append(0)
+            else:
+                chunk.ev_state.append(_DATED)
+                chunk.ev_days.append((created - dt).days)
+        chunk.signals.append(signals)
+    return chunk
+
+
+def score_chunk(chunk: _Chunk) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Return (claim confidences, report confidences, report verdict codes) for a chunk."""
+    n_claims, n_reports = len(chunk.claim_ids), len(chunk.report_ids)
+
+    ev_claim = np.asarray(chunk.ev_claim, dtype=np.int64)
+    state = np.asarray(chunk.ev_state, dtype=np.int8)
+    days = np.maximum(0, np.asarray(chunk.ev_days, dtype=np.int64))
+    freshness = np.select(
+        [state == _UNDATED, state == _UNPARSEABLE, days <= scoring.FRESH_DAYS, days <= scoring.RECENT_DAYS],
+        [
+            scoring.UNDATED_WEIGHT,
+            scoring.UNPARSEABLE_WEIGHT,
+            1.0 - days / scoring.FRESH_SLOPE,
+            scoring.RECENT_BASE - (days - scoring.FRESH_DAYS) / scoring.RECENT_SLOPE,
+        ],
+        scoring.OLD_WEIGHT,
+    )
+    weighted = np.asarray(chunk.ev_weight, dtype=np.float64) * freshness
+    sums = np.bincount(ev_claim, weights=weighted, minlength=n_claims)
+    counts = np.bincount(ev_claim, minlength=n_claims)
+    base = sums / np.maximum(counts, 1)
+
+    corroboration = np.asarray(chunk.claim_corroboration, dtype=np.int64)
+    boost = np.minimum(scoring.CORROBORATION_MAX, scoring.CORROBORATION_STEP * np.maximum(0, corroboration - 1))
+    status = np.asarray(chunk.claim_status, dtype=object)
+    contradicted = status == "Contradicted"
+    penalty = np.where(contradicted, scoring.CONFLICT_PENALTY, 0.0)
+    score = np.clip((base + boost - penalty) * 100, 0, 100)
+    # np.rint rounds half to even, like round() in compute_claim_confidence.
+    claim_conf = np.where(counts == 0, scoring.NO_EVIDENCE_CONFIDENCE, np.rint(score)).astype(np.int64)
+
+    claim_report = np.asarray(chunk.claim_report, dtype=np.int64)
+    n = np.bincount(claim_report, minlength=n_reports)
+    supported = np.bincount(claim_report, weights=(status == "Supported"), minlength=n_reports) > 0
+    contra = np.bincount(claim_report, weights=contradicted, minlength=n_reports) > 0
+    mean = np.bincount(claim_report, weights=claim_conf, minlength=n_reports) / np.maximum(n, 1)
+    report_conf = np.where(n == 0, scoring.NO_CLAIMS_CONFIDENCE, np.rint(mean)).astype(np.int64)
+    verdict = np.select([contra & supported, contra, supported], [3, 2, 1], 0)
+    return claim_conf, report_conf, verdict
+
+
+def _check_scalar(chunk: _Chunk, claim_conf: "np.ndarray", sample: int = 200) -> None:
+    """Guard against the vectorized formula drifting from `compute_claim_confidence`."""
+    for i in range(min(sample, len(chunk.claim_ids))):
+        signals = [
+            scoring.EvidenceSignal(credibility=c, published_date=d, published_at=parse_date(d))
+            for c, d in chunk.signals[i]
+        ]
+        expected = scoring.compute_claim_confidence(
+            signals,
+            corroboration_count=chunk.claim_corroboration[i],
+            has_conflict=chunk.claim_status[i] == "Contradicted",
+            now=chunk.created_at[i],
+        )
+        if expected != int(claim_conf[i]):
+            raise RuntimeError(
+                f"vectorized score {int(claim_conf[i])} != compute_claim_confidence {expected} "
+                f"for claim {chunk.claim_ids[i]}; update rescoring.score_chunk to match scoring.py"
+            )
+
+
+def _write_chunk(chunk: _Chunk, claim_conf, report_conf, verdict) -> tuple[int, int]:
+    old_claims = np.asarray(chunk.claim_conf, dtype=np.int64)
+    changed_claims = np.nonzero(claim_conf != old_claims)[0]
+
+    old_reports = np.asarray(chunk.report_conf, dtype=np.int64)
+    new_verdicts = [_VERDICT_CODES[v] for v in verdict]
+    changed_reports = [
+        i
+        for i in range(len(chunk.report_ids))
+        if report_conf[i] != old_reports[i] or new_verdicts[i].value != chunk.report_verdict[i]
+    ]
+    if not len(changed_claims) and not changed_reports:
+        return 0, 0
+    has_claims = np.bincount(np.asarray(chunk.claim_report, dtype=np.int64), minlength=len(chunk.report_ids)) > 0
+
+    with get_session() as session:
+        if len(changed_claims):
+            session.execute(
+                update(Claim),
+                [{"id": chunk.claim_ids[i], "confidence": int(claim_conf[i])} for i in changed_claims],
+            )
+        if changed_reports:
+            rows = [
+                {
+                    "id": chunk.report_ids[i],
+                    "confidence": int(report_conf[i]),
+                    "verdict": new_verdicts[i],
+                    "explanation": (
+                        scoring.VERDICT_EXPLANATIONS[new_verdicts[i]]
+                        if has_claims[i]
+                        else scoring.NO_CLAIMS_EXPLANATION
+                    ),
+                }
+                for i in changed_reports
+            ]
+            session.execute(update(Report), rows)
+            ids = [row["id"] for row in rows]
+            # Duplicates copy their source's headline fields (see content_store.duplicate_report).
+            for row in rows:
+                session.execute(
+                    update(Report)
+                    .where(Report.duplicate_of == row["id"])
+                    .values(confidence=row["confidence"], verdict=row["verdict"], explanation=row["explanation"])
+                )
+            dup_ids = [r for (r,) in session.query(Report.id).filter(Report.duplicate_of.in_(ids))]
+            # Stored documents are now stale; GET rebuilds them (with a new ETag) on demand.
+            session.execute(delete(ReportDocument).where(ReportDocument.report_id.in_(ids + dup_ids)))
+        session.commit()
+    return len(changed_claims), len(changed_reports)
+
+
+def _histogram(title: str, deltas: "np.ndarray") -> None:
+    counts, _ = np.histogram(deltas, bins=_DELTA_EDGES)
+    total = max(1, int(counts.sum()))
+    print(f"\n{title} (n={int(counts.sum())})")
+    for lo, hi, n in zip(_DELTA_EDGES, _DELTA_EDGES[1:], counts):
+        label = str(lo) if hi - lo == 1 else f"{lo}..{hi - 1}"
+        bar = "#" * int(round(50 * n / total))
+        print(f"  {label:>10} {int(n):>9} {bar}")
+
+
+def rescore(chunk_size: int = 500, dry_run: bool = False, limit: int | None = None) -> dict:
+    if np is None:
+        raise RuntimeError("rescoring needs NumPy: pip install numpy")
+
+    started = time.perf_counter()
+    claim_deltas, report_deltas = [], []
+    verdict_changes: dict[tuple[str | None, str], int] = {}
+    totals = {"reports": 0, "claims": 0, "claims_changed": 0, "reports_changed": 0}
+    after = ""
+    while limit is None or totals["reports"] < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - totals["reports"])
+        chunk = _load_chunk(after, size)
+        if chunk is None:
+            break
+        after = chunk.report_ids[-1]
+
+        claim_conf, report_conf, verdict = score_chunk(chunk)
+        if not totals["reports"]:
+            _check_scalar(chunk, claim_conf)
+
+        claim_deltas.append(claim_conf - np.asarray(chunk.claim_conf, dtype=np.int64))
+        known = np.asarray(chunk.report_conf, dtype=np.int64) >= 0
+        report_deltas.append((report_conf - np.asarray(chunk.report_conf, dtype=np.int64))[known])
+        for old, new in zip(chunk.report_verdict, verdict):
+            new_value = _VERDICT_CODES[new].value
+            if old != new_value:
+                verdict_changes[(old, new_value)] = verdict_changes.get((old, new_value), 0) + 1
+
+        totals["reports"] += len(chunk.report_ids)
+        totals["claims"] += len(chunk.claim_ids)
+        if not dry_run:
+            n_claims, n_reports = _write_chunk(chunk, claim_conf, report_conf, verdict)
+            totals["claims_changed"] += n_claims
+            totals["reports_changed"] += n_reports
+
+    totals["seconds"] = round(time.perf_counter() - started, 2)
+    claim_d = np.concatenate(claim_deltas) if claim_deltas else np.zeros(0, dtype=np.int64)
+    report_d = np.concatenate(report_deltas) if report_deltas else np.zeros(0, dtype=np.int64)
+    if dry_run:
+        totals["claims_changed"] = int(np.count_nonzero(claim_d))
+        totals["reports_changed"] = int(np.count_nonzero(report_d))
+        _histogram("claim confidence delta", claim_d)
+        _histogram("report confidence delta", report_d)
+        if verdict_changes:
+            print("\nverdict changes")
+            for (old, new), n in sorted(verdict_changes.items(), key=lambda kv: -kv[1]):
+                print(f"  {old} -> {new}: {n}")
+    return totals
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Re-score stored claims/reports with the current scoring.py weights.")
+    ap.add_argument("--dry-run", action="store_true", help="print score-delta histograms, write nothing")
+    ap.add_argument("--chunk-size", type=int, default=500, help="reports loaded and scored per chunk")
+    ap.add_argument("--limit", type=int, default=None, help="stop after this many reports")
+    args = ap.parse_args()
+
+    init_db()
+    totals = rescore(max(1, args.chunk_size), args.dry_run, args.limit)
+    print(f"\n{'dry run: ' if args.dry_run else ''}{totals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,27 +9,73 @@ INJECTION_PATTERNS = [
     r"(?i)you\s+are\s+chatgpt",
 ]
 
+# Lightweight redaction for common patterns. This is not exhaustive. Applied in this order:
+# a later pattern sees the earlier replacements, which keeps e.g. "+1 123-45-6789" from
+# being taken whole as a phone number.
+PII_PATTERNS = [
+    r"\b\d{3}-\d{2}-\d{4}\b",  # US SSN-like
+    r"\b\+?\d[\d\s\-]{7,}\b",  # phone-like
+    r"\b[\w.%-]+@[\w.-]+\.[A-Za-z]{2,}\b",
+]
+REDACTED = "[REDACTED]"
+TRUNCATED = "\n[TRUNCATED]"
+
+_PII_PASSES = [re.compile(p) for p in PII_PATTERNS]
+# Matches somewhere iff at least one pass would; most snippets need no pass at all.
+_PII_ANY = re.compile("|".join(f"(?:{p})" for p in PII_PATTERNS))
+_INJECTION = re.compile("|".join(p.removeprefix("(?i)") for p in INJECTION_PATTERNS), re.IGNORECASE)
+
+
+class _ControlTable(dict):
+    """`str.translate` table dropping non-printable characters (except newline and tab).
+
+    Filled per code point on first sight, so every later lookup is a C-level dict hit.
+    """
+
+    def __missing__(self, cp: int) -> int | None:
+        ch = chr(cp)
+        value = cp if ch.isprintable() or ch in "\n\t" else None
+        self[cp] = value
+        return value
+
+
+_CONTROL_TABLE = _ControlTable()
+for _cp in range(256):
+    _CONTROL_TABLE[_cp]
+
+
+class _Sanitized(str):
+    """Marks `sanitize_untrusted_text` output that it would return unchanged if called again."""
+
+    __slots__ = ()
+
 
 def strip_control_chars(text: str) -> str:
-    return "".join(ch for ch in text if ch.isprintable() or ch in "\n\t")
+    if text.isprintable():
+        return text
+    return text.translate(_CONTROL_TABLE)
 
 
 def redact_pii_like(text: str) -> str:
-    # Lightweight redaction for common patterns. This is not exhaustive.
-    text = re.sub(r"\b\d{3}-\d{2}-\d{4}\b", "[REDACTED]", text)  # US SSN-like
-    text = re.sub(r"\b\+?\d[\d\s\-]{7,}\b", "[REDACTED]", text)  # phone-like
-    text = re.sub(r"\b[\w.%-]+@[\w.-]+\.[A-Za-z]{2,}\b", "[REDACTED]", text)
+    if not _PII_ANY.search(text):
+        return text
+    for pattern in _PII_PASSES:
+        text = pattern.sub(REDACTED, text)
     return text
 
 
 def sanitize_untrusted_text(text: str, max_len: int = 8000) -> str:
+    # Evidence fields are sanitized when fetched and again when the prompt is built.
+    if type(text) is _Sanitized and len(text) <= max_len:
+        return text
     text = strip_control_chars(text)
     text = redact_pii_like(text)
     text = text.strip()
     if len(text) > max_len:
-        text = text[:max_len] + "\n[TRUNCATED]"
-    return text
+        # Cutting can leave a new match at the edge, so truncated text is not marked.
+        return text[:max_len] + TRUNCATED
+    return _Sanitized(text)
 
 
 def looks_like_prompt_injection(text: str) -> bool:
-    return any(re.search(pat, text or "") for pat in INJECTION_PATTERNS)
+    return _INJECTION.search(text or "") is not None
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from dateutil import parser as dtparser
+from app.models import Verdict
+from app.services.dates import parse_date
 
 
 CREDIBILITY_WEIGHT = {
@@ -13,52 +14,106 @@ CREDIBILITY_WEIGHT = {
     "Unknown": 0.5,
     "Low credibility": 0.2,
 }
+DEFAULT_CREDIBILITY_WEIGHT = 0.5
+
+# Freshness curve and score adjustments. `rescoring.py` applies the same constants column-wise,
+# so tune them here rather than inline.
+UNDATED_WEIGHT = 0.8
+UNPARSEABLE_WEIGHT = 0.75
+FRESH_DAYS = 30  # 0-30 days: 1.0 -> 0.9
+FRESH_SLOPE = 300
+RECENT_DAYS = 365  # 31-365: down to 0.7
+RECENT_BASE = 0.9
+RECENT_SLOPE = 1675
+OLD_WEIGHT = 0.6
+CORROBORATION_STEP = 0.05
+CORROBORATION_MAX = 0.15
+CONFLICT_PENALTY = 0.25
+NO_EVIDENCE_CONFIDENCE = 25
+NO_CLAIMS_CONFIDENCE = 20
+
+VERDICT_EXPLANATIONS = {
+    Verdict.mixed: "Some claims are supported while others are contradicted by the retrieved evidence.",
+    Verdict.false: "Key claims are contradicted by retrieved evidence from listed sources.",
+    Verdict.true: "Key claims are supported by retrieved evidence from listed sources.",
+    Verdict.unverifiable: "Evidence was insufficient or unclear to verify the extracted claims.",
+}
+NO_CLAIMS_EXPLANATION = "No checkable claims were extracted from the input."
 
 
 @dataclass
 class EvidenceSignal:
     credibility: str
     published_date: Optional[str] = None
+    # Parsed once by the pipeline; `published_date` is only parsed here when this is missing.
+    published_at: Optional[datetime] = None
 
 
-def freshness_weight(published_date: Optional[str], now: Optional[datetime] = None) -> float:
-    if not published_date:
-        return 0.8
-    now = now or datetime.utcnow()
-    try:
-        dt = dtparser.parse(published_date)
-        days = max(0, (now - dt).days)
-        # 0-30 days: 1.0 -> 0.9, 31-365: down to 0.7, older: 0.6
-        if days <= 30:
-            return 1.0 - (days / 300)
-        if days <= 365:
-            return 0.9 - ((days - 30) / 1675)
-        return 0.6
-    except Exception:
-        return 0.75
+def freshness_weight(
+    published_date: Optional[str],
+    now: Optional[datetime] = None,
+    published_at: Optional[datetime] = None,
+) -> float:
+    if not published_date and published_at is None:
+        return UNDATED_WEIGHT
+    dt = published_at if published_at is not None else parse_date(published_date)
+    if dt is None:
+        return UNPARSEABLE_WEIGHT
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    days = max(0, (now - dt).days)
+    if days <= FRESH_DAYS:
+        return 1.0 - (days / FRESH_SLOPE)
+    if days <= RECENT_DAYS:
+        return RECENT_BASE - ((days - FRESH_DAYS) / RECENT_SLOPE)
+    return OLD_WEIGHT
 
 
 def compute_claim_confidence(
     signals: list[EvidenceSignal],
     corroboration_count: int,
     has_conflict: bool,
+    now: Optional[datetime] = None,
 ) -> int:
     if not signals:
-        return 25
+        return NO_EVIDENCE_CONFIDENCE
 
+    now = now or datetime.now(timezone.utc)
     base = 0.0
     for s in signals:
-        c = CREDIBILITY_WEIGHT.get(s.credibility, 0.5)
-        f = freshness_weight(s.published_date)
+        c = CREDIBILITY_WEIGHT.get(s.credibility, DEFAULT_CREDIBILITY_WEIGHT)
+        f = freshness_weight(s.published_date, now, s.published_at)
         base += c * f
     base /= len(signals)
 
     # Corroboration boost: multiple independent sources increases confidence.
-    corroboration_boost = min(0.15, 0.05 * max(0, corroboration_count - 1))
+    corroboration_boost = min(CORROBORATION_MAX, CORROBORATION_STEP * max(0, corroboration_count - 1))
 
     # Conflict penalty: contradictory evidence reduces confidence.
-    conflict_penalty = 0.25 if has_conflict else 0.0
+    conflict_penalty = CONFLICT_PENALTY if has_conflict else 0.0
 
     score = (base + corroboration_boost - conflict_penalty) * 100
     score = max(0, min(100, score))
     return int(round(score))
+
+
+def overall_verdict(statuses: list[str], confidences: list[int]) -> tuple[Verdict, int, str]:
+    """Report verdict, confidence and explanation from its claims' statuses and confidences."""
+    if not statuses:
+        return Verdict.unverifiable, NO_CLAIMS_CONFIDENCE, NO_CLAIMS_EXPLANATION
+
+    supported = statuses.count("Supported")
+    contradicted = statuses.count("Contradicted")
+    if contradicted and supported:
+        verdict = Verdict.mixed
+    elif contradicted:
+        verdict = Verdict.false
+    elif supported:
+        verdict = Verdict.true
+    else:
+        verdict = Verdict.unverifiable
+    confidence = int(round(sum(confidences) / len(confidences)))
+    return verdict, confidence, VERDICT_EXPLANATIONS[verdict]
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
-import httpx
-
 from app.config import settings
 from app.services.audit import audit
-from app.services.cache import cache_get, cache_put
+from app.services.cache import cached_search
+from app.services.http_client import get_client
+from app.services.rate_limit import limited_request
 from app.services.safety import sanitize_untrusted_text
 
 
@@ -44,12 +44,11 @@ def search_web(report_id: str, query: str, num: int = 5) -> list[dict[str, Any]]
         audit(report_id, "web_search_skipped", {"reason": "GOOGLE_CSE not configured", "query": query})
         return []
 
-    cache_key = f"q={query}|n={min(max(num, 1), 10)}"
-    cached = cache_get("web", cache_key)
-    if cached is not None:
-        audit(report_id, "web_cache_hit", {"query": query})
-        return cached
+    n = min(max(num, 1), 10)
+    return cached_search(report_id, "web", query, n, lambda: _fetch_web(report_id, query, num))
+
 
+def _fetch_web(report_id: str, query: str, num: int) -> list[dict[str, Any]]:
     params = {
         "key": settings.google_cse_api_key,
         "cx": settings.google_cse_engine_id,
@@ -59,10 +58,9 @@ def search_web(report_id: str, query: str, num: int = 5) -> list[dict[str, Any]]
 
     audit(report_id, "web_search", {"query": query, "num": params["num"]})
 
-    with httpx.Client(timeout=20) as client:
-        resp = client.get(GOOGLE_CSE_ENDPOINT, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    resp = limited_request("google", lambda: get_client("google").get(GOOGLE_CSE_ENDPOINT, params=params))
+    resp.raise_for_status()
+    data = resp.json()
 
     items = data.get("items") or []
     results: list[dict[str, Any]] = []
@@ -79,7 +77,6 @@ def search_web(report_id: str, query: str, num: int = 5) -> list[dict[str, Any]]
             }
         )
 
-    cache_put("web", cache_key, results)
     return results
 
 
@@ -88,12 +85,11 @@ def search_images(report_id: str, query: str, num: int = 5) -> list[dict[str, An
         audit(report_id, "image_search_skipped", {"reason": "GOOGLE_CSE not configured", "query": query})
         return []
 
-    cache_key = f"q={query}|n={min(max(num, 1), 10)}"
-    cached = cache_get("image", cache_key)
-    if cached is not None:
-        audit(report_id, "image_cache_hit", {"query": query})
-        return cached
+    n = min(max(num, 1), 10)
+    return cached_search(report_id, "image", query, n, lambda: _fetch_image(report_id, query, num))
+
 
+def _fetch_image(report_id: str, query: str, num: int) -> list[dict[str, Any]]:
     params = {
         "key": settings.google_cse_api_key,
         "cx": settings.google_cse_engine_id,
@@ -104,10 +100,9 @@ def search_images(report_id: str, query: str, num: int = 5) -> list[dict[str, An
 
     audit(report_id, "image_search", {"query": query, "num": params["num"]})
 
-    with httpx.Client(timeout=20) as client:
-        resp = client.get(GOOGLE_CSE_ENDPOINT, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    resp = limited_request("google", lambda: get_client("google").get(GOOGLE_CSE_ENDPOINT, params=params))
+    resp.raise_for_status()
+    data = resp.json()
 
     items = data.get("items") or []
     results: list[dict[str, Any]] = []
@@ -122,5 +117,4 @@ def search_images(report_id: str, query: str, num: int = 5) -> list[dict[str, An
             }
         )
 
-    cache_put("image", cache_key, results)
     return results
@@ -0,0 +1,90 @@
+"""Microbenchmark: credibility lookup by linear suffix scan vs the reversed-label trie.
+
+Runs the previous `label_credibility` implementation (any(host.endswith(...)) over every
+listed domain) against `CredibilityIndex` with the built-in lists (~20 domains) and with
+100k synthetic domains, on a mix of listed hosts, subdomains and unlisted hosts. The trie is
+timed cold (empty per-host memo) and warm (repeat hosts, as within a report's evidence).
+
+Usage (from backend/):
+    python -m benchmarks.bench_credibility
+"""
+import random
+import time
+from urllib.parse import urlparse
+
+from app.models import SourceCredibility
+from app.services.credibility import LOW_CRED_DOMAINS, TRUSTED_DOMAINS, CredibilityIndex, normalize_domain
+
+
+def legacy_label(url: str, trusted: set[str], low: set[str]) -> SourceCredibility:
+    host = (urlparse(url).hostname or "").lower()
+    host = host.replace("www.", "")
+    if host in trusted or any(host.endswith("." + d) for d in trusted):
+        return SourceCredibility.trusted
+    if host in low or any(host.endswith("." + d) for d in low):
+        return SourceCredibility.low
+    if host and "." in host:
+        return SourceCredibility.neutral
+    return SourceCredibility.unknown
+
+
+def trie_label(url: str, index: CredibilityIndex) -> SourceCredibility:
+    host = urlparse(url).hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    found = index.lookup(host) if host else None
+    if found is not None:
+        return found
+    return SourceCredibility.neutral if "." in host else SourceCredibility.unknown
+
+
+def _synthetic(n: int, rng: random.Random) -> set[str]:
+    tlds = ("com", "org", "net", "co.uk", "info", "co.ke", "de", "io")
+    return {f"site{i}-{rng.randrange(10**6)}.{rng.choice(tlds)}" for i in range(n)}
+
+
+def _urls(trusted: set[str], low: set[str], n: int, rng: random.Random) -> list[str]:
+    listed = sorted(trusted | low)
+    urls = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            host = "www." + rng.choice(listed)
+        elif kind == 1:
+            host = "news." + rng.choice(listed)
+        else:
+            host = f"unlisted{rng.randrange(10**6)}.example.com"
+        urls.append(f"https://{host}/article/{i}")
+    return urls
+
+
+def _time(fn, urls: list[str]) -> tuple[float, list]:
+    started = time.perf_counter()
+    out = [fn(u) for u in urls]
+    return (time.perf_counter() - started) / len(urls) * 1e6, out
+
+
+def main() -> None:
+    rng = random.Random(7)
+    print(f"{'domains':>8} {'lookups':>8} {'legacy us':>10} {'trie cold us':>13} {'trie warm us':>13} {'build ms':>9}")
+    for extra in (0, 100_000):
+        trusted = set(TRUSTED_DOMAINS) | {normalize_domain(d) for d in _synthetic(extra // 2, rng)}
+        low = set(LOW_CRED_DOMAINS) | {normalize_domain(d) for d in _synthetic(extra // 2, rng)} - trusted
+        # The scan is O(domains) per lookup; keep its sample small at 100k so the run stays short.
+        urls = _urls(trusted, low, 20_000 if not extra else 400, rng)
+
+        started = time.perf_counter()
+        index = CredibilityIndex(trusted, low)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        legacy_us, legacy_out = _time(lambda u: legacy_label(u, trusted, low), urls)
+        cold_us, trie_out = _time(lambda u: trie_label(u, index), urls)
+        warm_us, _ = _time(lambda u: trie_label(u, index), urls)
+        assert legacy_out == trie_out, "trie and scan disagree"
+        print(
+            f"{len(trusted) + len(low):>8} {len(urls):>8} {legacy_us:>10.2f} {cold_us:>13.2f} {warm_us:>13.2f} {build_ms:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
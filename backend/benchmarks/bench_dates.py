@@ -0,0 +1,81 @@
+"""Parse throughput for evidence dates: dateutil vs `dates.parse_date` fast paths and memo.
+
+Inputs mimic real evidence: GDELT `seendate` ("20240101T120000Z"), ISO-8601 published times
+with "Z" / offsets / fractions, plain dates, and a few free-form strings that fall back to
+dateutil. "per report" replays the old flow (two dateutil parses per item: scoring +
+timeline) against one memoized parse per item.
+
+Usage (from backend/):
+    python -m benchmarks.bench_dates
+"""
+import random
+import time
+
+from dateutil import parser as dtparser
+
+from app.services.dates import parse_date
+
+
+def _samples(n: int, rng: random.Random) -> list[str]:
+    out = []
+    for i in range(n):
+        y, mo, d = rng.randrange(2015, 2026), rng.randrange(1, 13), rng.randrange(1, 29)
+        h, mi, s = rng.randrange(24), rng.randrange(60), rng.randrange(60)
+        kind = i % 10
+        if kind < 5:
+            out.append(f"{y}{mo:02d}{d:02d}T{h:02d}{mi:02d}{s:02d}Z")
+        elif kind < 8:
+            out.append(f"{y}-{mo:02d}-{d:02d}T{h:02d}:{mi:02d}:{s:02d}{rng.choice(['Z', '+00:00', '-05:00', '.123Z'])}")
+        elif kind == 8:
+            out.append(f"{y}-{mo:02d}-{d:02d}")
+        else:
+            out.append(f"{d} {rng.choice(['Jan', 'Mar', 'Jul', 'Oct'])} {y} {h:02d}:{mi:02d}")
+    return out
+
+
+def _rate(fn, values: list[str]) -> float:
+    started = time.perf_counter()
+    for v in values:
+        fn(v)
+    return len(values) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    rng = random.Random(3)
+    values = _samples(20_000, rng)
+    uncached = parse_date.__wrapped__
+
+    for v in values[:200]:
+        a, b = dtparser.parse(v), uncached(v)
+        assert a.replace(tzinfo=None) == b.replace(tzinfo=None), (v, a, b)
+
+    print(f"{'parser':<28} {'parses/s':>12}")
+    print(f"{'dateutil':<28} {_rate(dtparser.parse, values):>12,.0f}")
+    print(f"{'parse_date (no memo)':<28} {_rate(uncached, values):>12,.0f}")
+    parse_date.cache_clear()
+    print(f"{'parse_date (memo, cold)':<28} {_rate(parse_date, values):>12,.0f}")
+    # Repeats within the memo size, as when the same articles come back for related claims.
+    hot = values[:2000] * 10
+    _rate(parse_date, hot)
+    print(f"{'parse_date (memo, warm)':<28} {_rate(parse_date, hot):>12,.0f}")
+
+    # One report: 6 claims x ~12 dated evidence items, many shared across claims.
+    report = [rng.choice(values[:30]) for _ in range(72)]
+    parse_date.cache_clear()
+    runs = 200
+    started = time.perf_counter()
+    for _ in range(runs):
+        for v in report:
+            dtparser.parse(v)
+            dtparser.parse(v)
+    old_ms = (time.perf_counter() - started) / runs * 1000
+    started = time.perf_counter()
+    for _ in range(runs):
+        for v in report:
+            parse_date(v)
+    new_ms = (time.perf_counter() - started) / runs * 1000
+    print(f"\nper report ({len(report)} items): dateutil x2 {old_ms:.2f} ms, parse_date x1 (memo) {new_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
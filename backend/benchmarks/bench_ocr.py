@@ -0,0 +1,96 @@
+"""OCR latency/throughput: previous inline full-resolution path vs the pooled, preprocessed engine.
+
+Needs Pillow, pytesseract and a Tesseract install. Uses the screenshots in DIR if given,
+otherwise renders a set of phone-sized sample screenshots (light and dark mode).
+
+Usage (from backend/):
+    python -m benchmarks.bench_ocr [DIR]
+"""
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+
+from app.config import settings
+from app.services.image_ocr import _get_pool, run_ocr
+
+_LINES = [
+    "BREAKING: Officials confirmed the bridge closed in 2019",
+    "after inspectors found 40% of the supports corroded.",
+    "The mayor said repairs will cost $12 million and",
+    "the crossing is expected to reopen next spring.",
+    "Shared 2,381 times  ·  Reply  ·  Like",
+]
+
+
+def _render_samples(out: Path, count: int = 8) -> list[Path]:
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size=44)
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+    paths = []
+    for n in range(count):
+        dark = n % 2 == 1
+        img = Image.new("RGB", (1170, 2532), (18, 18, 18) if dark else (250, 250, 250))
+        draw = ImageDraw.Draw(img)
+        fg = (235, 235, 235) if dark else (20, 20, 20)
+        draw.rectangle((0, 0, 1170, 140), fill=(40, 90, 200))
+        y = 400 + 60 * n
+        for line in _LINES:
+            draw.text((60, y), line, fill=fg, font=font)
+            y += 70
+        path = out / f"sample_{n}.png"
+        img.save(path)
+        paths.append(path)
+    return paths
+
+
+def _inline(paths: list[Path]) -> tuple[float, list[float]]:
+    from PIL import Image
+    import pytesseract
+
+    latencies = []
+    started = time.perf_counter()
+    for p in paths:
+        t = time.perf_counter()
+        pytesseract.image_to_string(Image.open(p))
+        latencies.append((time.perf_counter() - t) * 1000)
+    return (time.perf_counter() - started) * 1000, latencies
+
+
+def _pooled(paths: list[Path]) -> tuple[float, list[float]]:
+    pool = _get_pool()
+    # Warm the worker processes so process start-up isn't counted against the first images.
+    for f in [pool.submit(run_ocr, str(paths[0]), True, 0) for _ in range(int(settings.truecheck_ocr_workers))]:
+        f.result()
+
+    latencies = []
+    started = time.perf_counter()
+    futures = [pool.submit(run_ocr, str(p), True, 0) for p in paths]
+    for f in as_completed(futures):
+        _, timings = f.result()
+        latencies.append(timings["preprocess_ms"] + timings["tesseract_ms"])
+    return (time.perf_counter() - started) * 1000, latencies
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        paths = sorted(p for p in Path(sys.argv[1]).iterdir() if p.suffix.lower() in {".png", ".jpg", ".jpeg", ".webp"})
+    else:
+        paths = _render_samples(Path(tempfile.mkdtemp()))
+    if int(settings.truecheck_ocr_workers) < 1:
+        raise SystemExit("set TRUECHECK_OCR_WORKERS >= 1")
+
+    print(f"{len(paths)} images, {settings.truecheck_ocr_workers} OCR workers")
+    print(f"{'path':>8} {'wall ms':>9} {'img/s':>6} {'p50 ms':>8} {'max ms':>8}")
+    for name, fn in (("inline", _inline), ("pooled", _pooled)):
+        wall, lat = fn(paths)
+        print(f"{name:>8} {wall:>9.0f} {len(paths) / (wall / 1000):>6.2f} {statistics.median(lat):>8.0f} {max(lat):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
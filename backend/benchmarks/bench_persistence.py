@@ -0,0 +1,123 @@
+"""Count SQL statements/transactions used to persist one report's claims + evidence.
+
+Compares the previous per-claim pattern (insert/commit/refresh, later update, then
+evidence row by row) with `pipeline._persist_results`.
+
+Usage (from backend/):
+    python -m benchmarks.bench_persistence
+"""
+import os
+import tempfile
+import time
+import uuid
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault("TRUECHECK_DB_URL", f"sqlite:///{_tmp}/bench.db")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.db import engine, get_session, init_db  # noqa: E402
+from app.models import Claim, EvidenceItem, InputType, OriginTrace, Report, SourceCredibility  # noqa: E402
+from app.services.pipeline import _persist_results  # noqa: E402
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+        event.remove(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+
+def _new_report() -> str:
+    report_id = str(uuid.uuid4())
+    with get_session() as session:
+        session.add(Report(id=report_id, input_type=InputType.text, input_text="bench"))
+        session.commit()
+    return report_id
+
+
+def _fixture(report_id: str, n_claims: int, n_evidence: int):
+    claims = [
+        Claim(report_id=report_id, claim_text=f"claim {i}", status="Supported", confidence=70, reasoning_json="{}")
+        for i in range(n_claims)
+    ]
+    evidence = [
+        (
+            i,
+            EvidenceItem(
+                report_id=report_id,
+                kind="web_extract",
+                url=f"https://example.com/{i}/{j}",
+                publisher="example.com",
+                snippet="snippet",
+                credibility=SourceCredibility.neutral,
+            ),
+        )
+        for i in range(n_claims)
+        for j in range(n_evidence)
+    ]
+    origin = OriginTrace(report_id=report_id, timeline_json="[]")
+    return claims, evidence, origin
+
+
+def legacy_persist(report_id: str, claims, evidence, origin) -> None:
+    ids = []
+    for c in claims:
+        with get_session() as session:
+            row = Claim(report_id=report_id, claim_text=c.claim_text, status="Unclear", confidence=0)
+            session.add(row)
+            session.commit()
+            session.refresh(row)
+            ids.append(row.id)
+    for c, claim_id in zip(claims, ids):
+        with get_session() as session:
+            persisted = session.get(Claim, claim_id)
+            persisted.status = c.status
+            persisted.confidence = c.confidence
+            persisted.reasoning_json = c.reasoning_json
+            session.add(persisted)
+            session.commit()
+    with get_session() as session:
+        for idx, e in evidence:
+            e.claim_id = ids[idx]
+            session.add(e)
+        session.add(origin)
+        report = session.get(Report, report_id)
+        report.confidence = 70
+        session.commit()
+
+
+def bulk_persist(report_id: str, claims, evidence, origin) -> None:
+    _persist_results(report_id, claims, evidence, origin, {"confidence": 70})
+
+
+def main() -> None:
+    init_db()
+    print(f"{'claims':>6} {'evidence':>8} {'mode':>7} {'stmts':>6} {'commits':>7} {'ms':>8}")
+    for n_claims, n_evidence in ((1, 12), (6, 12), (24, 12)):
+        for name, fn in (("legacy", legacy_persist), ("bulk", bulk_persist)):
+            report_id = _new_report()
+            claims, evidence, origin = _fixture(report_id, n_claims, n_evidence)
+            with StatementCounter() as counter:
+                started = time.perf_counter()
+                fn(report_id, claims, evidence, origin)
+                ms = (time.perf_counter() - started) * 1000
+            print(f"{n_claims:>6} {n_claims * n_evidence:>8} {name:>7} {counter.statements:>6} {counter.commits:>7} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
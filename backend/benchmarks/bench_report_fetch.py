@@ -0,0 +1,75 @@
+"""Time GET /reports/{id} work: live rebuild vs the stored report document.
+
+Usage (from backend/):
+    python -m benchmarks.bench_report_fetch
+"""
+import json
+import os
+import tempfile
+import time
+import uuid
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault("TRUECHECK_DB_URL", f"sqlite:///{_tmp}/bench.db")
+
+from app.db import get_session, init_db  # noqa: E402
+from app.models import Claim, EvidenceItem, InputType, OriginTrace, Report, ReportStatus, SourceCredibility  # noqa: E402
+from app.services.pipeline import _persist_results  # noqa: E402
+from app.services.reports import build_report_response, load_report_document, materialize_report  # noqa: E402
+
+
+def _seed(n_claims: int, n_evidence: int) -> str:
+    report_id = str(uuid.uuid4())
+    with get_session() as session:
+        session.add(Report(id=report_id, input_type=InputType.text, input_text="bench", status=ReportStatus.complete))
+        session.commit()
+    ev = [{"url": f"https://example.com/{j}", "publisher": "example.com", "snippet": "snippet"} for j in range(n_evidence)]
+    claims = [
+        Claim(
+            report_id=report_id,
+            claim_text=f"claim {i}",
+            status="Supported",
+            confidence=70,
+            reasoning_json=json.dumps({"evidence": ev, "citations": [1, 2, 3]}),
+        )
+        for i in range(n_claims)
+    ]
+    evidence = [
+        (
+            i,
+            EvidenceItem(
+                report_id=report_id,
+                kind="web_extract",
+                url=f"https://example.com/{i}/{j}",
+                publisher="example.com",
+                snippet="snippet",
+                credibility=SourceCredibility.trusted if j % 3 == 0 else SourceCredibility.neutral,
+            ),
+        )
+        for i in range(n_claims)
+        for j in range(n_evidence)
+    ]
+    _persist_results(report_id, claims, evidence, OriginTrace(report_id=report_id, timeline_json="[]"), {"confidence": 70})
+    materialize_report(report_id)
+    return report_id
+
+
+def _time(fn, n: int = 50) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) * 1000 / n
+
+
+def main() -> None:
+    init_db()
+    print(f"{'claims':>6} {'evidence':>8} {'live ms':>8} {'stored ms':>9}")
+    for n_claims, n_evidence in ((2, 12), (8, 12), (24, 24)):
+        report_id = _seed(n_claims, n_evidence)
+        live = _time(lambda: build_report_response(report_id).model_dump(mode="json"))
+        stored = _time(lambda: load_report_document(report_id))
+        print(f"{n_claims:>6} {n_claims * n_evidence:>8} {live:>8.2f} {stored:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Scoring throughput for `rescoring.score_chunk` vs the per-claim `compute_claim_confidence` loop.
+
+Builds one synthetic chunk (reports with 0-6 claims, 0-12 evidence items each, a mix of GDELT,
+ISO, missing and unparseable dates) and scores it both ways; results must match exactly. Only
+the scoring step is timed: loading `reasoning_json` is the same for both.
+
+Usage (from backend/; needs numpy):
+    python -m benchmarks.bench_rescoring
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.services.dates import parse_date
+from app.services.rescoring import _Chunk, _DATED, _UNDATED, _UNPARSEABLE, score_chunk
+from app.services.scoring import CREDIBILITY_WEIGHT, EvidenceSignal, compute_claim_confidence, overall_verdict
+
+_CREDS = ["Trusted", "Neutral", "Unknown", "Low credibility"]
+
+
+def _chunk(reports: int, rng: random.Random) -> _Chunk:
+    chunk = _Chunk()
+    for r in range(reports):
+        created = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(days=rng.randrange(600))
+        chunk.report_ids.append(f"r{r}")
+        chunk.report_conf.append(-1)
+        chunk.report_verdict.append(None)
+        for _ in range(rng.randrange(7)):
+            idx = len(chunk.claim_ids)
+            chunk.claim_ids.append(idx)
+            chunk.claim_report.append(r)
+            chunk.claim_conf.append(0)
+            chunk.claim_status.append(rng.choice(["Supported", "Contradicted", "Unclear"]))
+            chunk.claim_corroboration.append(rng.randrange(6))
+            chunk.created_at.append(created)
+            signals = []
+            for _ in range(rng.randrange(13)):
+                cred = rng.choice(_CREDS)
+                k = rng.random()
+                if k < 0.1:
+                    published = None
+                elif k < 0.15:
+                    published = "sometime last spring"
+                else:
+                    published = (created - timedelta(days=rng.randrange(-2, 900))).strftime(
+                        rng.choice(["%Y%m%dT%H%M%SZ", "%Y-%m-%dT%H:%M:%S+02:00"])
+                    )
+                dt = parse_date(published)
+                signals.append((cred, published))
+                chunk.ev_claim.append(idx)
+                chunk.ev_weight.append(CREDIBILITY_WEIGHT[cred])
+                chunk.ev_state.append(_UNDATED if not published else _UNPARSEABLE if dt is None else _DATED)
+                chunk.ev_days.append((created - dt).days if dt else 0)
+            chunk.signals.append(signals)
+    return chunk
+
+
+def _scalar(chunk: _Chunk) -> tuple[list[int], list[int]]:
+    claim_conf = []
+    for i, signals in enumerate(chunk.signals):
+        claim_conf.append(
+            compute_claim_confidence(
+                [EvidenceSignal(credibility=c, published_date=d, published_at=parse_date(d)) for c, d in signals],
+                corroboration_count=chunk.claim_corroboration[i],
+                has_conflict=chunk.claim_status[i] == "Contradicted",
+                now=chunk.created_at[i],
+            )
+        )
+    by_report: list[list[int]] = [[] for _ in chunk.report_ids]
+    for i, r in enumerate(chunk.claim_report):
+        by_report[r].append(i)
+    report_conf = [
+        overall_verdict([chunk.claim_status[i] for i in ids], [claim_conf[i] for i in ids])[1] for ids in by_report
+    ]
+    return claim_conf, report_conf
+
+
+def main() -> None:
+    rng = random.Random(5)
+    print(f"{'reports':>8} {'claims':>8} {'evidence':>9} {'scalar ms':>10} {'numpy ms':>9} {'speedup':>8}")
+    for reports in (500, 5_000, 20_000):
+        chunk = _chunk(reports, rng)
+        started = time.perf_counter()
+        scalar_claims, scalar_reports = _scalar(chunk)
+        scalar_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        claim_conf, report_conf, _ = score_chunk(chunk)
+        numpy_ms = (time.perf_counter() - started) * 1000
+        assert claim_conf.tolist() == scalar_claims and report_conf.tolist() == scalar_reports, "scorers disagree"
+        print(
+            f"{reports:>8} {len(chunk.claim_ids):>8} {len(chunk.ev_claim):>9} "
+            f"{scalar_ms:>10.1f} {numpy_ms:>9.1f} {scalar_ms / numpy_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
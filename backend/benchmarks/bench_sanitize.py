@@ -0,0 +1,119 @@
+"""Untrusted-text sanitizer: previous implementation vs `safety.sanitize_untrusted_text`.
+
+First a golden check: over a synthetic search-snippet corpus (titles, snippets, publishers,
+claims with dates, nbsp/zero-width/control characters, phone numbers, SSNs and emails) and a
+fuzz corpus built from the characters the patterns care about, the new sanitizer must return
+byte-identical output for every max_len used in the app, and marked output must come back
+unchanged. Then throughput: fetch-time sanitizing, and the prompt-time pass over text that was
+already sanitized.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sanitize
+"""
+import random
+import re
+import time
+
+import orjson
+
+from app.services.safety import sanitize_untrusted_text
+
+
+def legacy_sanitize(text: str, max_len: int = 8000) -> str:
+    text = "".join(ch for ch in text if ch.isprintable() or ch in "\n\t")
+    text = re.sub(r"\b\d{3}-\d{2}-\d{4}\b", "[REDACTED]", text)
+    text = re.sub(r"\b\+?\d[\d\s\-]{7,}\b", "[REDACTED]", text)
+    text = re.sub(r"\b[\w.%-]+@[\w.-]+\.[A-Za-z]{2,}\b", "[REDACTED]", text)
+    text = text.strip()
+    if len(text) > max_len:
+        text = text[:max_len] + "\n[TRUNCATED]"
+    return text
+
+
+_WORDS = (
+    "the government said on Tuesday that health officials confirmed new cases in Nairobi "
+    "according to a statement released by ministry spokesperson reports claim vaccine "
+    "election results were announced after counting in several counties police said"
+).split()
+_PUBLISHERS = ["reuters.com", "www.bbc.co.uk", "nation.africa", "KE", "US", "citizen.digital"]
+
+
+def _snippet(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randrange(12, 40))]
+    k = rng.random()
+    if k < 0.35:
+        words.insert(0, rng.choice(["Jan 5, 2024 ...", "3 days ago ...", "Mar 12, 2023 —"]))
+    if k < 0.08:
+        words.insert(rng.randrange(len(words)), f"+254 7{rng.randrange(10**8):08d}")
+    elif k < 0.12:
+        words.insert(rng.randrange(len(words)), f"contact{rng.randrange(99)}@example.org")
+    elif k < 0.14:
+        words.insert(rng.randrange(len(words)), f"{rng.randrange(100, 999)}-{rng.randrange(10, 99)}-{rng.randrange(1000, 9999)}")
+    text = " ".join(words)
+    if rng.random() < 0.2:
+        text = text.replace(" ", "\xa0", 2)
+    if rng.random() < 0.1:
+        text = text.replace(" ", "\n", 1) + "​\x07"
+    return text
+
+
+def _corpus(n: int, rng: random.Random) -> list[tuple[str, int]]:
+    out = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            out.append((" ".join(rng.choice(_WORDS) for _ in range(rng.randrange(4, 14))).title(), 500))
+        elif kind == 1:
+            out.append((_snippet(rng), 800))
+        elif kind == 2:
+            out.append((rng.choice(_PUBLISHERS), 120))
+        else:
+            out.append((f"{rng.randrange(2015, 2026)}0{rng.randrange(1, 10)}1{rng.randrange(10)}T101500Z", 120))
+    return out
+
+
+def _fuzz(n: int, rng: random.Random) -> list[str]:
+    alphabet = "0123456789012345-- .+@_%abcxyz.COM\n\t\xa0​\x00[]"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randrange(1, 40))) for _ in range(n)]
+
+
+def _check(corpus: list[tuple[str, int]], fuzz: list[str]) -> int:
+    checked = 0
+    cases = corpus + [(t, m) for t in fuzz for m in (8, 16, 600, 800)]
+    for text, max_len in cases:
+        expected = legacy_sanitize(text, max_len)
+        got = sanitize_untrusted_text(text, max_len)
+        assert got == expected, (text, max_len, got, expected)
+        # A marked result is returned as is, which is only right if it is a fixed point.
+        for again_len in (max_len, 800, 600):
+            assert sanitize_untrusted_text(got, again_len) == legacy_sanitize(expected, again_len), (text, again_len)
+        assert orjson.loads(orjson.dumps(got)) == expected
+        checked += 1
+    return checked
+
+
+def _rate(fn, items: list) -> float:
+    started = time.perf_counter()
+    for text, max_len in items:
+        fn(text, max_len)
+    return len(items) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    rng = random.Random(11)
+    corpus = _corpus(20_000, rng)
+    checked = _check(corpus, _fuzz(20_000, rng))
+    print(f"golden check: {checked} inputs byte-identical to the previous sanitizer")
+
+    print(f"\n{'pass':<34} {'legacy/s':>10} {'new/s':>10} {'speedup':>8}")
+    for label, items_for in (
+        ("fetch (raw text)", lambda fn: corpus),
+        ("prompt (already sanitized)", lambda fn: [(fn(t, m), m) for t, m in corpus]),
+    ):
+        legacy = _rate(legacy_sanitize, items_for(legacy_sanitize))
+        new = _rate(sanitize_untrusted_text, items_for(sanitize_untrusted_text))
+        print(f"{label:<34} {legacy:>10,.0f} {new:>10,.0f} {new / legacy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Peak API RSS while N large uploads stream in concurrently.
+
+Starts uvicorn in a subprocess (temporary DB/storage, no queue), posts N concurrent
+multipart uploads of SIZE_MB each from a generator (so the client doesn't buffer
+them either) and samples the server's RSS from /proc (Linux only).
+
+Usage (from backend/):
+    python -m benchmarks.bench_upload_memory [N] [SIZE_MB]
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+_CHUNK = b"\0" * (1024 * 1024)
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _upload(client: httpx.AsyncClient, url: str, size_mb: int, n: int) -> int:
+    boundary = f"bench{n}"
+
+    async def body():
+        yield (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"input_type\"\r\n\r\naudio\r\n"
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"clip{n}.wav\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        yield f"upload {n}".encode()  # distinct content per upload
+        for _ in range(size_mb):
+            yield _CHUNK
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    r = await client.post(url, content=body(), headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    return r.status_code
+
+
+async def _run(port: int, pid: int, n: int, size_mb: int) -> None:
+    peak = 0.0
+    done = asyncio.Event()
+
+    async def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, _rss_mb(pid))
+            await asyncio.sleep(0.05)
+
+    url = f"http://127.0.0.1:{port}/api/v1/upload/file"
+    async with httpx.AsyncClient(timeout=600) as client:
+        baseline = _rss_mb(pid)
+        sampler = asyncio.create_task(sample())
+        started = time.perf_counter()
+        codes = await asyncio.gather(*(_upload(client, url, size_mb, i) for i in range(n)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await sampler
+    print(f"{n} x {size_mb} MB uploads -> {codes} in {elapsed:.1f}s")
+    print(f"server RSS: baseline {baseline:.0f} MB, peak {peak:.0f} MB (+{peak - baseline:.0f} MB)")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    tmp = tempfile.mkdtemp()
+    port = _free_port()
+    env = dict(
+        os.environ,
+        TRUECHECK_DB_URL=f"sqlite:///{tmp}/bench.db",
+        TRUECHECK_STORAGE_DIR=f"{tmp}/storage",
+        TRUECHECK_USE_QUEUE="0",
+        TRUECHECK_UPLOAD_MAX_BYTES_AUDIO=str((size_mb + 1) * 1024 * 1024),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/api/v1/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        asyncio.run(_run(port, server.pid, n, size_mb))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import json
 import time
 import httpx
 
@@ -11,6 +12,20 @@ def main():
         report_id = r.json()["report_id"]
         print("report_id:", report_id)
 
+        try:
+            with c.stream("GET", f"{BASE}/reports/{report_id}/events", timeout=120) as stream:
+                stream.raise_for_status()
+                event = None
+                for line in stream.iter_lines():
+                    if line.startswith("event:"):
+                        event = line[6:].strip()
+                    elif line.startswith("data:"):
+                        print("event:", event, json.loads(line[5:]))
+                        if event in ("complete", "failed"):
+                            break
+        except httpx.HTTPError as e:
+            print("event stream unavailable, polling:", e)
+
         for _ in range(40):
             rr = c.get(f"{BASE}/reports/{report_id}")
             rr.raise_for_status()
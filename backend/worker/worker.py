@@ -1,23 +1,177 @@
 from __future__ import annotations
 
+import logging
 import os
+import signal
+import threading
+import time
 
 from redis import Redis
-from rq import Worker, Queue, Connection
+from rq import Queue, SimpleWorker, Worker
+from rq.exceptions import StopRequested
+from rq.timeouts import TimerDeathPenalty
 
 from app.config import settings
-from app.services.pipeline import run_pipeline
+
+
+log = logging.getLogger("truecheck.worker")
+
+# Startup cost of this worker process (pipeline imports + models), reported next to per-job time.
+_startup: dict = {}
+
+
+def preload() -> dict:
+    """Import the pipeline and load the transcription/OCR models once, before taking jobs."""
+    timings: dict = {}
+
+    started = time.perf_counter()
+    import app.services.pipeline  # noqa: F401
+
+    timings["pipeline_import_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    from app.services.audio_transcribe import load_whisper_model, whisper_model_info
+
+    try:
+        load_whisper_model()
+        timings["whisper"] = whisper_model_info()
+    except Exception as e:
+        timings["whisper"] = {"error": str(e)}
+
+    from app.services.image_ocr import load_ocr, warm_pool
+
+    try:
+        timings["ocr_load_ms"] = round(load_ocr(), 1)
+        started = time.perf_counter()
+        warm_pool()
+        timings["ocr_pool_start_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    except Exception as e:
+        timings["ocr"] = {"error": str(e)}
+
+    return timings
 
 
 def process_report(report_id: str) -> None:
+    from app.services.audit import audit, flush_audit_quietly
+    from app.services.pipeline import run_pipeline
+
+    started = time.perf_counter()
     run_pipeline(report_id)
+    job_ms = round((time.perf_counter() - started) * 1000, 1)
+    audit(
+        report_id,
+        "worker_job",
+        {"job_ms": job_ms, "warm": bool(settings.truecheck_worker_warm), "pid": os.getpid(), "startup": _startup},
+    )
+    flush_audit_quietly()
+    log.info("report %s done in %.1f ms", report_id, job_ms)
+
+
+def process_batch(batch_id: str, report_ids: list[str]) -> None:
+    from app.services.audit import audit, flush_audit_quietly
+    from app.services.pipeline import run_batch_pipeline
+
+    started = time.perf_counter()
+    run_batch_pipeline(batch_id, report_ids)
+    job_ms = round((time.perf_counter() - started) * 1000, 1)
+    audit(
+        batch_id,
+        "worker_job",
+        {"job_ms": job_ms, "reports": len(report_ids), "warm": bool(settings.truecheck_worker_warm), "pid": os.getpid()},
+    )
+    flush_audit_quietly()
+    log.info("batch %s (%d reports) done in %.1f ms", batch_id, len(report_ids), job_ms)
+
+
+class SlotWorker(SimpleWorker):
+    """SimpleWorker that can run in a non-main thread.
+
+    Signals are handled once by `run_concurrent`, and job timeouts use a timer instead of
+    SIGALRM (which only works in the main thread).
+    """
+
+    death_penalty_class = TimerDeathPenalty
+
+    def _install_signal_handlers(self) -> None:
+        pass
+
+    def dequeue_job_and_maintain_ttl(self, timeout, max_idle_time=None):
+        # RQ only checks the stop flag between jobs; wait in short windows so an idle slot
+        # notices a drain request.
+        poll = max(1, int(settings.truecheck_worker_idle_poll_seconds))
+        while True:
+            result = super().dequeue_job_and_maintain_ttl(timeout, max_idle_time=poll)
+            if result is not None:
+                return result
+            if self._stop_requested:
+                raise StopRequested()
+
+
+def run_concurrent(redis_conn: Redis, queue: Queue, slots: int) -> None:
+    """Run `slots` jobs at once in this process, one SlotWorker per thread.
+
+    Each slot is a full RQ worker (own registration, started/failed registries), so a job
+    failing or timing out only affects its own slot; a slot whose loop dies is replaced.
+    SIGTERM/SIGINT drains: running jobs finish, idle slots exit at their next poll
+    (`truecheck_worker_idle_poll_seconds`). A second signal exits immediately.
+    """
+    stopping = threading.Event()
+
+    def start_slot(i: int) -> tuple[SlotWorker, threading.Thread]:
+        worker = SlotWorker([queue], connection=redis_conn)
+        thread = threading.Thread(target=worker.work, kwargs={"with_scheduler": False}, name=f"slot-{i}", daemon=True)
+        thread.start()
+        return worker, thread
+
+    def drain(signum, frame) -> None:
+        if stopping.is_set():
+            log.warning("second signal, exiting without waiting for running jobs")
+            raise SystemExit(1)
+        stopping.set()
+        log.info("draining %d slots", len(running))
+        for worker, _ in running:
+            worker._stop_requested = True
+
+    signal.signal(signal.SIGINT, drain)
+    signal.signal(signal.SIGTERM, drain)
+
+    running = [start_slot(i) for i in range(slots)]
+    log.info("running %d concurrent slots", slots)
+    while True:
+        alive = 0
+        for i, (worker, thread) in enumerate(running):
+            thread.join(timeout=0.5)
+            if thread.is_alive():
+                alive += 1
+            elif not stopping.is_set():
+                log.warning("slot %d exited unexpectedly; restarting", i)
+                running[i] = start_slot(i)
+                alive += 1
+        if not alive:
+            break
+    log.info("all slots drained")
 
 
 def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    if settings.truecheck_worker_preload:
+        _startup.update(preload())
+        log.info("preloaded: %s", _startup)
+
     redis_conn = Redis.from_url(settings.truecheck_redis_url)
-    with Connection(redis_conn):
-        worker = Worker([Queue(settings.truecheck_queue_name)])
-        worker.work(with_scheduler=False)
+    queue = Queue(settings.truecheck_queue_name, connection=redis_conn)
+
+    slots = int(settings.truecheck_worker_concurrency)
+    if slots > 1:
+        # Reports mostly wait on search/Gemini I/O, so one warm process can overlap many.
+        run_concurrent(redis_conn, queue, slots)
+        return
+
+    # SimpleWorker runs jobs in this process, so loaded models, HTTP pools and caches are reused.
+    # The forking Worker still benefits from preload: children inherit the models copy-on-write.
+    worker_cls = SimpleWorker if settings.truecheck_worker_warm else Worker
+    worker = worker_cls([queue], connection=redis_conn)
+    worker.work(with_scheduler=False)
 
 
 if __name__ == "__main__":
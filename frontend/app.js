@@ -44,6 +44,14 @@ function setVerdictBadge(verdict) {
   badge.textContent = verdict || "—";
 }
 
+async function uploadError(resp) {
+  const retry = resp.headers.get("Retry-After");
+  if ((resp.status === 429 || resp.status === 503) && retry) {
+    return new Error(`Server busy (${resp.status}). Please try again in ${retry}s.`);
+  }
+  return new Error(await resp.text());
+}
+
 async function uploadText() {
   const text = $("#textInput").value.trim();
   if (!text) return setStatus("Please paste some text.");
@@ -54,12 +62,12 @@ async function uploadText() {
   form.append("payload_text", text);
 
   const resp = await fetch(`${API_BASE}/upload/text`, { method: "POST", body: form });
-  if (!resp.ok) throw new Error(await resp.text());
+  if (!resp.ok) throw await uploadError(resp);
   const data = await resp.json();
   currentReportId = data.report_id;
 
-  setStatus(`Queued report ${currentReportId}. Polling...`);
-  await pollReport(currentReportId);
+  setStatus(`Queued report ${currentReportId}. Waiting for progress...`);
+  await followReport(currentReportId);
 }
 
 async function uploadFile(inputType, fileInputId) {
@@ -73,20 +81,72 @@ async function uploadFile(inputType, fileInputId) {
   form.append("file", file);
 
   const resp = await fetch(`${API_BASE}/upload/file`, { method: "POST", body: form });
-  if (!resp.ok) throw new Error(await resp.text());
+  if (!resp.ok) throw await uploadError(resp);
   const data = await resp.json();
   currentReportId = data.report_id;
 
-  setStatus(`Queued report ${currentReportId}. Polling...`);
-  await pollReport(currentReportId);
+  setStatus(`Queued report ${currentReportId}. Waiting for progress...`);
+  await followReport(currentReportId);
+}
+
+async function fetchReport(reportId) {
+  const r = await fetch(`${API_BASE}/reports/${reportId}`);
+  if (!r.ok) throw new Error(await r.text());
+  return r.json();
+}
+
+// Progress comes from the SSE stream; the full report is fetched once at the end.
+// Falls back to polling when EventSource is unavailable or the stream errors out.
+function followReport(reportId) {
+  if (typeof EventSource === "undefined") return pollReport(reportId);
+
+  return new Promise((resolve, reject) => {
+    const start = Date.now();
+    const source = new EventSource(`${API_BASE}/reports/${reportId}/events`);
+    let total = 0;
+    let gathered = 0;
+    let rated = 0;
+    let done = false;
+
+    const elapsed = () => Math.floor((Date.now() - start) / 1000);
+    const finish = (promise) => {
+      done = true;
+      source.close();
+      promise.then(resolve, reject);
+    };
+    const on = (type, handler) => source.addEventListener(type, (ev) => handler(JSON.parse(ev.data || "{}")));
+
+    on("running", () => setStatus(`Status: running (${elapsed()}s)`));
+    on("claims_extracted", (d) => {
+      total = (d.claims || []).length;
+      setStatus(`Extracted ${total} claim(s). Gathering evidence... (${elapsed()}s)`);
+    });
+    on("evidence_ready", () => {
+      gathered += 1;
+      setStatus(`Evidence gathered for ${gathered}/${total} claim(s) (${elapsed()}s)`);
+    });
+    on("claim_verdict", (d) => {
+      rated += 1;
+      setStatus(`Rated ${rated}/${total} claim(s) — latest: ${d.status} (${elapsed()}s)`);
+    });
+    const onTerminal = (label) => () => finish(fetchReport(reportId).then((report) => {
+      setStatus(label);
+      renderReport(report);
+    }));
+    on("complete", onTerminal("Analysis complete."));
+    on("failed", onTerminal("Analysis failed."));
+
+    source.onerror = () => {
+      if (done) return;
+      finish(pollReport(reportId));
+    };
+  });
 }
 
 async function pollReport(reportId) {
   const start = Date.now();
   while (true) {
-    const r = await fetch(`${API_BASE}/reports/${reportId}`);
-    if (!r.ok) throw new Error(await r.text());
-    const report = await r.json();
+    const report = await fetchReport(reportId);
 
     if (report.status === "complete") {
       setStatus("Analysis complete.");